@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark do modelo aproximado (Nyström + LinearSVC calibrado, ver
+src/model/train.py --approximate N) x SVC exato: latência de uma linha e de
+um lote no CompiledModel, para alguns números de componentes.
+
+O CSV do Kaggle não acompanha o repositório, então os modelos aproximados são
+ajustados sobre os vetores de suporte do SVC em produção (convertidos de volta
+para o formato de entrada), com os rótulos do próprio SVC. A concordância
+medida é com o SVC exato, nos vetores de suporte que ficaram fora do ajuste;
+a perda de acurácia/recall no teste do notebook é o que o treinamento mede.
+
+Uso (a partir de student-depression-api/):
+    python benchmarks/bench_approximation.py [--components 100 300 1000] [--repeat 50]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import joblib
+from sklearn.model_selection import train_test_split
+
+from src.model.compiled_model import REQUEST_FIELDS, CompiledModel
+from src.model.distillation import support_vector_frame
+from src.model.model import MODEL_PATH
+from src.model.train import build_approximate_pipeline
+
+BATCH_ROWS = 1000
+
+
+def measure(fn, repeat):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--components", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    exact = joblib.load(MODEL_PATH)
+    X = support_vector_frame(exact)
+    X_fit, X_check = train_test_split(X, test_size=0.3, random_state=42)
+    y_fit, y_check = exact.predict(X_fit), exact.predict(X_check)
+    requests = [SimpleNamespace(**row) for row in X_check.rename(columns=REQUEST_FIELDS).to_dict(orient="records")]
+    batch = [requests[i % len(requests)] for i in range(BATCH_ROWS)]
+    gamma = exact.named_steps['classifier']._gamma
+
+    print(f"{'modelo':<22}{'linhas do kernel':>17}{'1 linha (ms)':>14}{f'lote {BATCH_ROWS} (ms)':>16}{'concordância':>14}")
+    models = [("SVC exato", CompiledModel.from_pipeline(exact))]
+    for components in args.components:
+        approximate = build_approximate_pipeline(components, gamma).fit(X_fit, y_fit)
+        models.append((f"Nyström {components}", CompiledModel.from_pipeline(approximate)))
+
+    for name, compiled in models:
+        single = measure(lambda: compiled.predict_with_proba(requests[:1]), args.repeat)
+        batched = measure(lambda: compiled.predict_with_proba(batch), max(3, args.repeat // 10))
+        agreement = (compiled.predict_with_proba(requests)[0] == y_check).mean()
+        print(f"{name:<22}{compiled.n_kernel_rows:>17}{single:>14.3f}{batched:>16.1f}{agreement:>13.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos backends de inferência (src/model/backends.py): latência de uma
+linha e de lotes, por backend, sobre os perfis de aquecimento.
+
+O backend onnx usa MODEL_ONNX_PATH; se o arquivo não existir, o pipeline é
+exportado para um diretório temporário (precisa de skl2onnx e onnxruntime).
+
+Uso (a partir de student-depression-api/):
+    python benchmarks/bench_backends.py [--batch-sizes 1 64 1000] [--repeat 50]
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import joblib
+import numpy as np
+
+from src.model import scoring
+from src.model.backends import NumpyBackend, OnnxBackend, SklearnBackend
+from src.model.compiled_model import CompiledModel
+from src.model.model import MODEL_ONNX_PATH, MODEL_PATH, WARMUP_PROFILES
+from src.model.prediction_request import PredictionRequest
+
+
+def measure(fn, repeat):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def onnx_backend(pipeline, directory):
+    path = MODEL_ONNX_PATH
+    if not path.exists():
+        from src.model.onnx_export import export_onnx
+
+        path = export_onnx(pipeline, Path(directory) / "svm.onnx")
+    return OnnxBackend.load(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    pipeline = joblib.load(MODEL_PATH)
+    profiles = [PredictionRequest(**profile) for profile in WARMUP_PROFILES]
+    with tempfile.TemporaryDirectory() as directory:
+        backends = [
+            ("numpy", None, NumpyBackend(CompiledModel.from_pipeline(pipeline))),
+            ("sklearn", "single_pass", SklearnBackend(pipeline)),
+            ("sklearn", "pipeline", SklearnBackend(pipeline)),
+        ]
+        try:
+            backends.append(("onnx", None, onnx_backend(pipeline, directory)))
+        except RuntimeError as e:
+            print(f"onnx ignorado: {e}")
+
+        reference = None
+        print(f"{'backend':<22}{'lote':>6}{'total (ms)':>12}{'por linha (ms)':>16}{'max |dif|':>12}")
+        for size in args.batch_sizes:
+            requests = [profiles[i % len(profiles)] for i in range(size)]
+            for name, mode, backend in backends:
+                label = f"{name} ({mode})" if mode else name
+                if mode:
+                    scoring.SCORING_MODE = mode
+                _, probabilities = backend.predict(requests)
+                if name == "numpy":
+                    reference = probabilities
+                # Menos repetições para os lotes grandes
+                elapsed = measure(lambda: backend.predict(requests), max(3, args.repeat // max(1, size // 16)))
+                difference = np.abs(probabilities - reference).max()
+                print(f"{label:<22}{size:>6}{elapsed:>12.3f}{elapsed / size:>16.4f}{difference:>12.1e}")
+
+
+if __name__ == "__main__":
+    main()
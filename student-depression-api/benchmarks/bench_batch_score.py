@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escala do CLI de pontuação offline (src/model/batch_score.py):
+gera um CSV sintético com os perfis do aquecimento e mede a vazão (linhas/s)
+para cada número de processos.
+
+O ganho com mais processos depende de haver núcleos livres: numa máquina
+com N núcleos, rode com --workers 1 2 4 ... N.
+
+Uso (a partir de student-depression-api/):
+    python benchmarks/bench_batch_score.py [--rows 100000] [--workers 1 2 4 8] [--feedback] [--model-format mmap]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.model.batch_score import score_file  # noqa: E402
+from src.model.model import WARMUP_PROFILES  # noqa: E402
+
+
+def write_survey(path: Path, rows: int):
+    with open(path, "w", newline="") as output:
+        writer = csv.DictWriter(output, fieldnames=["student_id", *WARMUP_PROFILES[0]])
+        writer.writeheader()
+        for index in range(rows):
+            writer.writerow({"student_id": index, **WARMUP_PROFILES[index % len(WARMUP_PROFILES)]})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--feedback", action="store_true")
+    parser.add_argument("--model-format", choices=("joblib", "mmap"), default="mmap")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        survey = Path(directory) / "survey.csv"
+        write_survey(survey, args.rows)
+        print(f"{args.rows} linhas  |  {os.cpu_count()} núcleos  |  modelo {args.model_format}  |  feedback {'sim' if args.feedback else 'não'}")
+        print(f"{'processos':>10}{'tempo (s)':>12}{'linhas/s':>12}{'speedup':>10}")
+        baseline = None
+        for workers in args.workers:
+            result = score_file(
+                survey, Path(directory) / "scored.csv",
+                workers=workers, chunk_size=args.chunk_size,
+                with_feedback=args.feedback, model_format=args.model_format,
+            )
+            rate = result.rows / result.elapsed
+            baseline = baseline or rate
+            print(f"{workers:>10}{result.elapsed:>12.2f}{rate:>12.0f}{rate / baseline:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark da pontuação em cascata (SCORING_MODE=cascade) x SVC exato:
+latência de uma linha e de um lote e fração escalada, para algumas faixas de
+incerteza, com o substituto versionado em src/resources.
+
+O CSV do Kaggle não acompanha o repositório, então as linhas avaliadas são os
+vetores de suporte do SVC fora da destilação (a mesma divisão do
+python -m src.model.distillation --support-vectors). São os pontos mais
+próximos da fronteira, então a fração escalada é uma estimativa pessimista; a
+do dataset completo é a do relatório de fidelidade do treinamento.
+
+Uso (a partir de student-depression-api/):
+    python benchmarks/bench_cascade.py [--bands 0.1 0.9 0.2 0.8 0.3 0.7] [--repeat 50]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import joblib
+from sklearn.model_selection import train_test_split
+
+from src.model.cascade import Surrogate, cascade_outputs
+from src.model.compiled_model import REQUEST_FIELDS, CompiledModel
+from src.model.distillation import support_vector_frame
+from src.model.model import MODEL_PATH, MODEL_SURROGATE_PATH
+from src.model.train import RANDOM_STATE, TEST_SIZE
+
+BATCH_ROWS = 1000
+
+
+def measure(fn, repeat):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bands", type=float, nargs="+", default=[0.1, 0.9, 0.2, 0.8, 0.3, 0.7, 0.4, 0.6])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    pipeline = joblib.load(MODEL_PATH)
+    compiled = CompiledModel.from_pipeline(pipeline)
+    surrogate = Surrogate.load(MODEL_SURROGATE_PATH)
+    _, X_check = train_test_split(support_vector_frame(pipeline), test_size=TEST_SIZE, random_state=RANDOM_STATE)
+    requests = [SimpleNamespace(**row) for row in X_check.rename(columns=REQUEST_FIELDS).to_dict(orient="records")]
+    batch = [requests[i % len(requests)] for i in range(BATCH_ROWS)]
+    exact_labels, _ = compiled.predict_with_proba(requests)
+
+    def run(bounds, rows):
+        encoded, sq_norms = compiled.encode_requests(rows)
+        if bounds is None:
+            return compiled.predict_encoded(encoded, sq_norms)
+        return cascade_outputs(surrogate, compiled, encoded, sq_norms, *bounds)
+
+    print(f"{'modelo':<22}{'1 linha (ms)':>14}{f'lote {BATCH_ROWS} (ms)':>16}{'escaladas':>11}{'concordância':>14}")
+    bands = [None] + list(zip(args.bands[::2], args.bands[1::2]))
+    for bounds in bands:
+        single = measure(lambda: run(bounds, requests[:1]), args.repeat)
+        batched = measure(lambda: run(bounds, batch), max(3, args.repeat // 10))
+        outputs = run(bounds, requests)
+        escalated = 1.0 if bounds is None else outputs[2].mean()
+        agreement = (outputs[0] == exact_labels).mean()
+        name = "SVC exato" if bounds is None else f"cascata [{bounds[0]:.1f}, {bounds[1]:.1f}]"
+        print(f"{name:<22}{single:>14.3f}{batched:>16.1f}{escalated:>10.1%}{agreement:>13.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark de latência por requisição: pipeline scikit-learn x passada única x CompiledModel.
+
+Uso (a partir de student-depression-api/):
+    python benchmarks/bench_compiled_model.py [--repeat 200]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import joblib
+
+from src.model.compiled_model import CompiledModel
+from src.model.model import MODEL_PATH, build_model_input
+from src.model.prediction_request import PredictionRequest
+from src.model.scoring import supports_single_pass
+from src.model.libsvm_probability import svc_outputs
+
+SAMPLE_REQUEST = PredictionRequest(
+    gender="Masculino",
+    age=22,
+    academic_pressure=4,
+    cgpa=7.5,
+    study_satisfaction=3,
+    sleep_duration="7-8 horas",
+    dietary_habits="Moderadamente saudáveis",
+    suicidal_thoughts="Não",
+    work_study_hours=8,
+    financial_stress=3,
+    family_history="Não",
+)
+
+
+def measure(fn, repeat):
+    # Aquecimento
+    for _ in range(5):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    pipeline = joblib.load(MODEL_PATH)
+    assert supports_single_pass(pipeline)
+    compiled = CompiledModel.from_pipeline(pipeline)
+    svc = pipeline.steps[-1][1]
+
+    def run_pipeline():
+        frame = build_model_input([SAMPLE_REQUEST])
+        pipeline.predict(frame)
+        pipeline.predict_proba(frame)
+
+    def run_single_pass():
+        frame = build_model_input([SAMPLE_REQUEST])
+        decision = svc.decision_function(pipeline[:-1].transform(frame))
+        svc_outputs(decision, svc.classes_, svc.probA_[0], svc.probB_[0])
+
+    def run_compiled():
+        compiled.predict_with_proba([SAMPLE_REQUEST])
+
+    print(f"Vetores de suporte: {svc.support_vectors_.shape[0]}  |  repetições: {args.repeat}")
+    print(f"{'modo':<14}{'p50 (ms)':>10}{'p95 (ms)':>10}{'speedup':>10}")
+    baseline = None
+    for name, fn in (("pipeline", run_pipeline), ("single_pass", run_single_pass), ("compiled", run_compiled)):
+        p50, p95 = measure(fn, args.repeat)
+        baseline = baseline or p50
+        print(f"{name:<14}{p50:>10.3f}{p95:>10.3f}{baseline / p50:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
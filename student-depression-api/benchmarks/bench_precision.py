@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark do CompiledModel em float32 x float64: latência de uma linha e de
+lotes e memória (RSS) de um processo que carrega o artefato de serving e
+pontua um lote.
+
+A memória de cada precisão é medida num interpretador novo: o quanto o RSS
+cresce ao carregar o artefato (sem mmap, para contar os arrays) e o pico de
+memória alocada durante um lote (tracemalloc, que enxerga os arrays do
+NumPy), dominado pela matriz do kernel (linhas x vetores de suporte). O pico
+de RSS do processo não serve para isso: ele é dominado pelos imports.
+
+Uso (a partir de student-depression-api/, somente Linux):
+    python benchmarks/bench_precision.py [--batch-sizes 1 64 1000] [--repeat 50]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from src.model.compiled_model import PRECISIONS, CompiledModel
+from src.model.model import MODEL_PATH, WARMUP_PROFILES
+from src.model.model_export import export_compiled_model, load_compiled_model
+from src.model.prediction_request import PredictionRequest
+
+MEMORY_BATCH = 1000
+
+
+def rss_kb() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    raise RuntimeError("VmRSS não encontrado")
+
+
+def measure(fn, repeat):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def requests_for(size):
+    profiles = [PredictionRequest(**profile) for profile in WARMUP_PROFILES]
+    return [profiles[i % len(profiles)] for i in range(size)]
+
+
+def run_memory(directory: str):
+    """
+    Processo filho: carrega o artefato e pontua um lote, imprimindo a memória em JSON
+    """
+    requests = requests_for(MEMORY_BATCH)
+    before = rss_kb()
+    compiled = load_compiled_model(Path(directory), mmap=False)
+    loaded = rss_kb()
+    tracemalloc.start()
+    compiled.predict_with_proba(requests)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(json.dumps({"model_kb": loaded - before, "batch_peak_kb": peak / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--memory-child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.memory_child:
+        return run_memory(args.memory_child)
+
+    import joblib
+
+    reference = CompiledModel.from_pipeline(joblib.load(MODEL_PATH))
+    models = {precision: reference.with_precision(precision) for precision in PRECISIONS}
+
+    print(f"{'precisão':<10}{'lote':>6}{'ms':>10}{'max |dif| prob':>16}")
+    for size in args.batch_sizes:
+        requests = requests_for(size)
+        _, expected = reference.predict_with_proba(requests)
+        for precision, compiled in models.items():
+            elapsed = measure(lambda: compiled.predict_with_proba(requests), max(3, args.repeat // max(1, size // 16)))
+            difference = np.abs(compiled.predict_with_proba(requests)[1] - expected).max()
+            print(f"{precision:<10}{size:>6}{elapsed:>10.3f}{difference:>16.1e}")
+
+    print(f"\n{'precisão':<10}{'arrays (MB)':>12}{'RSS do modelo (MB)':>20}{f'pico do lote {MEMORY_BATCH} (MB)':>24}")
+    with tempfile.TemporaryDirectory() as temporary:
+        for precision, compiled in models.items():
+            directory = export_compiled_model(compiled, Path(temporary) / precision)
+            output = subprocess.run(
+                [sys.executable, __file__, "--memory-child", str(directory)],
+                check=True, capture_output=True, text=True, cwd=ROOT,
+            ).stdout
+            memory = json.loads(output.strip().splitlines()[-1])
+            arrays = sum(path.stat().st_size for path in directory.glob("*.npy")) / 2 ** 20
+            print(f"{precision:<10}{arrays:>12.1f}{memory['model_kb'] / 1024:>20.1f}{memory['batch_peak_kb'] / 1024:>24.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark de codificação de uma resposta de /model/predict.
+
+Compara o caminho antigo (feature_feedback como List[Dict[str, Any]],
+jsonable_encoder + json stdlib) com o atual (FeatureFeedback tipado +
+orjson) e a validação do corpo da requisição a partir dos bytes.
+
+Uso (a partir de student-depression-api/):
+    python benchmarks/bench_serialization.py [--number 20000]
+"""
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from src.model.feedback import generate_feature_feedback
+from src.model.prediction_request import PredictionRequest
+from src.model.prediction_response import PredictionResponse
+
+USER_DATA = {
+    "gender": "Masculino",
+    "age": 22,
+    "academic_pressure": 4,
+    "cgpa": 7.5,
+    "study_satisfaction": 3,
+    "sleep_duration": "7-8 horas",
+    "dietary_habits": "Moderadamente saudáveis",
+    "suicidal_thoughts": "Não",
+    "work_study_hours": 8,
+    "financial_stress": 3,
+    "family_history": "Não",
+}
+RAW_BODY = json.dumps(USER_DATA).encode("utf-8")
+
+
+class LegacyPredictionResponse(BaseModel):
+    prediction: int
+    probability: List[float]
+    depression_risk: str
+    feature_feedback: List[Dict[str, Any]]
+
+
+def legacy_encode():
+    response = LegacyPredictionResponse(
+        prediction=0,
+        probability=[0.85, 0.15],
+        depression_risk="Não depressivo",
+        feature_feedback=generate_feature_feedback(USER_DATA),
+    )
+    return json.dumps(jsonable_encoder(response), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def typed_encode():
+    response = PredictionResponse(
+        prediction=0,
+        probability=[0.85, 0.15],
+        depression_risk="Não depressivo",
+        feature_feedback=generate_feature_feedback(USER_DATA),
+    )
+    return orjson.dumps(response.model_dump(mode="json"))
+
+
+def legacy_parse():
+    return PredictionRequest(**json.loads(RAW_BODY))
+
+
+def raw_parse():
+    return PredictionRequest.model_validate_json(RAW_BODY)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    assert json.loads(legacy_encode()) == json.loads(typed_encode())
+
+    print(f"{'etapa':<42}{'µs/op':>10}")
+    for name, fn in (
+        ("resposta: dict + jsonable_encoder/json", legacy_encode),
+        ("resposta: tipada + orjson", typed_encode),
+        ("requisição: json.loads + validação", legacy_parse),
+        ("requisição: model_validate_json", raw_parse),
+    ):
+        seconds = min(timeit.repeat(fn, number=args.number, repeat=3))
+        print(f"{name:<42}{seconds / args.number * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
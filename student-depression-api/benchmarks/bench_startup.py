@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark de partida a frio: tempo de import de main.py e tempo até a primeira
+resposta de /model/predict, com o pipeline .joblib e no modo enxuto (MODEL_FORMAT=mmap).
+
+Cada medição usa um interpretador novo. O tempo até a primeira resposta é
+contado do início do processo do uvicorn até a primeira predição respondida
+com 200 (o que inclui imports, lifespan, carregamento e aquecimento).
+Sai com status 1 se o modo enxuto estourar algum dos orçamentos.
+
+Uso (a partir de student-depression-api/):
+    python benchmarks/bench_startup.py [--repeat 5] [--import-budget-ms 1000] [--first-response-budget-ms 2000]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODES = ("joblib", "mmap")
+HEAVY_MODULES = ("pandas", "sklearn", "scipy", "joblib")
+
+SAMPLE_REQUEST = {
+    "gender": "Masculino",
+    "age": 22,
+    "academic_pressure": 4,
+    "cgpa": 7.5,
+    "study_satisfaction": 3,
+    "sleep_duration": "7-8 horas",
+    "dietary_habits": "Moderadamente saudáveis",
+    "suicidal_thoughts": "Não",
+    "work_study_hours": 8,
+    "financial_stress": 3,
+    "family_history": "Não",
+}
+
+IMPORT_SNIPPET = f"""
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{"import_ms": elapsed, "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def environment(model_format: str) -> dict:
+    return {**os.environ, "MODEL_FORMAT": model_format}
+
+
+def measure_import(model_format: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=ROOT, env=environment(model_format), capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(model_format: str, timeout: float = 60.0) -> float:
+    port = free_port()
+    body = json.dumps(SAMPLE_REQUEST).encode()
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/model/predict", data=body, headers={"Content-Type": "application/json"}
+    )
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=environment(model_format), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(request, timeout=5) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        raise TimeoutError(f"Servidor ({model_format}) não respondeu em {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=1000.0)
+    parser.add_argument("--first-response-budget-ms", type=float, default=2000.0)
+    args = parser.parse_args()
+
+    print(f"Repetições: {args.repeat}  |  medianas em ms")
+    print(f"{'formato':<10}{'import':>10}{'1ª resposta':>14}  módulos pesados")
+    results = {}
+    for model_format in MODES:
+        imports = [measure_import(model_format) for _ in range(args.repeat)]
+        first_responses = [measure_first_response(model_format) for _ in range(args.repeat)]
+        import_ms = statistics.median(i["import_ms"] for i in imports)
+        first_response_ms = statistics.median(first_responses)
+        heavy = ", ".join(imports[-1]["heavy"]) or "-"
+        results[model_format] = (import_ms, first_response_ms)
+        print(f"{model_format:<10}{import_ms:>10.0f}{first_response_ms:>14.0f}  {heavy}")
+
+    import_ms, first_response_ms = results["mmap"]
+    over_budget = []
+    if import_ms > args.import_budget_ms:
+        over_budget.append(f"import {import_ms:.0f} ms > {args.import_budget_ms:.0f} ms")
+    if first_response_ms > args.first_response_budget_ms:
+        over_budget.append(f"primeira resposta {first_response_ms:.0f} ms > {args.first_response_budget_ms:.0f} ms")
+    if over_budget:
+        print("Orçamento do modo enxuto estourado: " + "; ".join(over_budget))
+        sys.exit(1)
+    print("Modo enxuto dentro do orçamento")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória de /model/predict/stream: envia uploads NDJSON (ou CSV)
+cada vez maiores, com Transfer-Encoding: chunked e gerados sob demanda, para
+um uvicorn real, lendo a resposta ao mesmo tempo, e lê o pico de RSS do
+servidor (VmHWM) depois de cada um.
+
+Como o pico só cresce, uploads em ordem crescente com VmHWM estável mostram
+que a memória não depende do tamanho do upload. Só funciona no Linux (/proc).
+
+Uso (a partir de student-depression-api/):
+    python benchmarks/bench_stream_memory.py [--rows 10000 50000 200000] [--format ndjson|csv]
+"""
+import argparse
+import csv
+import http.client
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SAMPLE_REQUEST = {
+    "gender": "Masculino",
+    "age": 22,
+    "academic_pressure": 4,
+    "cgpa": 7.5,
+    "study_satisfaction": 3,
+    "sleep_duration": "7-8 horas",
+    "dietary_habits": "Moderadamente saudáveis",
+    "suicidal_thoughts": "Não",
+    "work_study_hours": 8,
+    "financial_stress": 3,
+    "family_history": "Não",
+}
+
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def peak_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmHWM indisponível")
+
+
+def upload_chunks(rows: int, upload: str, rows_per_chunk: int = 1000):
+    if upload == "csv":
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(SAMPLE_REQUEST.keys())
+        header = output.getvalue().encode()
+        output = io.StringIO()
+        csv.writer(output, lineterminator="\n").writerow(SAMPLE_REQUEST.values())
+        line = output.getvalue().encode()
+        yield header
+    else:
+        line = (json.dumps(SAMPLE_REQUEST) + "\n").encode()
+    sent = 0
+    while sent < rows:
+        count = min(rows_per_chunk, rows - sent)
+        yield line * count
+        sent += count
+
+
+def wait_until_ready(port: int, timeout: float = 60.0):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            connection.request("GET", "/health/ready")
+            if connection.getresponse().status == 200:
+                return
+        except (ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"Servidor não ficou pronto em {timeout}s")
+
+
+def send_upload(sock: socket.socket, port: int, rows: int, upload: str):
+    head = (
+        f"POST /model/predict/stream HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+        f"Content-Type: {CONTENT_TYPES[upload]}\r\nTransfer-Encoding: chunked\r\n\r\n"
+    )
+    sock.sendall(head.encode())
+    for chunk in upload_chunks(rows, upload):
+        sock.sendall(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+    sock.sendall(b"0\r\n\r\n")
+
+
+def stream_upload(port: int, rows: int, upload: str) -> tuple:
+    """
+    Envia o upload numa thread enquanto lê a resposta, como um cliente de
+    streaming deve fazer: o servidor responde durante o upload, e um cliente
+    que só lê no fim trava quando os buffers do socket enchem.
+    """
+    sock = socket.create_connection(("127.0.0.1", port))
+    started = time.perf_counter()
+    sender = threading.Thread(target=send_upload, args=(sock, port, rows, upload), daemon=True)
+    sender.start()
+    response = http.client.HTTPResponse(sock)
+    response.begin()
+    if response.status != 200:
+        raise RuntimeError(f"Status {response.status}: {response.read()[:200]!r}")
+    results = errors = 0
+    pending = b""
+    while chunk := response.read1(65536):
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        results += len(lines)
+        errors += sum(1 for line in lines if b'"error":null' not in line)
+    sender.join()
+    sock.close()
+    return results, errors, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--format", choices=sorted(CONTENT_TYPES), default="ndjson")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env={**os.environ, "PREDICTION_CACHE_ENABLED": "false"},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(port)
+        print(f"Formato: {args.format}  |  pico de RSS do servidor após cada upload")
+        print(f"{'linhas':>10}{'tempo (s)':>12}{'linhas/s':>12}{'erros':>8}{'VmHWM (MB)':>13}")
+        print(f"{'pronto':>10}{'':>12}{'':>12}{'':>8}{peak_rss_mb(server.pid):>13.1f}")
+        for rows in sorted(args.rows):
+            results, errors, elapsed = stream_upload(port, rows, args.format)
+            if results != rows:
+                raise RuntimeError(f"{results} resultados para {rows} linhas")
+            print(f"{rows:>10}{elapsed:>12.2f}{rows / elapsed:>12.0f}{errors:>8}{peak_rss_mb(server.pid):>13.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
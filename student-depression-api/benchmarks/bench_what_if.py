@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos cenários "e se": a grade fatorada de src/model/what_if.py x uma
+linha por candidato no CompiledModel (em blocos), para grades de tamanhos
+diferentes.
+
+Uso (a partir de student-depression-api/):
+    python benchmarks/bench_what_if.py [--repeat 20]
+"""
+import argparse
+import itertools
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import joblib
+import numpy as np
+
+from src.model.compiled_model import CompiledModel
+from src.model.model import MODEL_PATH, WARMUP_PROFILES
+from src.model.prediction_request import PredictionRequest
+from src.model.questions import QUESTIONS_PATH
+from src.model.what_if import MODIFIABLE_FEATURES, candidate_values, score_grid
+
+GRIDS = (
+    ("sleep_duration", "academic_pressure", "financial_stress"),
+    ("sleep_duration", "academic_pressure", "dietary_habits", "financial_stress"),
+    ("sleep_duration", "academic_pressure", "work_study_hours", "financial_stress"),
+    MODIFIABLE_FEATURES,
+)
+ROW_CHUNK = 1024
+
+
+def measure(fn, repeat):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    compiled = CompiledModel.from_pipeline(joblib.load(MODEL_PATH))
+    questions = json.loads(QUESTIONS_PATH.read_text(encoding="utf-8"))
+    request = PredictionRequest(**WARMUP_PROFILES[2])
+
+    print(f"{'candidatos':>10}{'grade (ms)':>12}{'linhas (ms)':>13}{'speedup':>10}{'max |dif|':>12}")
+    for fields in GRIDS:
+        values = candidate_values(questions, compiled, request, fields)
+        rows = [request.model_copy(update=dict(zip(fields, combination))) for combination in itertools.product(*values.values())]
+
+        def run_rows():
+            return np.concatenate([
+                compiled.predict_with_proba(rows[start:start + ROW_CHUNK])[1][:, 1]
+                for start in range(0, len(rows), ROW_CHUNK)
+            ])
+
+        difference = np.abs(score_grid(compiled, request, values)[1].ravel() - run_rows()).max()
+        grid_ms = measure(lambda: score_grid(compiled, request, values), args.repeat)
+        rows_ms = measure(run_rows, max(1, args.repeat // 5))
+        print(f"{len(rows):>10}{grid_ms:>12.1f}{rows_ms:>13.1f}{rows_ms / grid_ms:>9.1f}x{difference:>12.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória por worker: artefato .joblib x artefato mapeado em memória (mmap),
+com e sem preload antes do fork.
+
+Cada configuração roda num interpretador novo, que faz o fork de N workers
+como o gunicorn. Cada worker carrega (ou herda, com preload) o modelo, roda o
+aquecimento e mede /proc/self/smaps_rollup enquanto todos estão vivos:
+  - RSS: páginas residentes, contando as compartilhadas
+  - PSS: páginas compartilhadas divididas entre os processos que as usam
+  - USS: páginas privadas do worker (o que cada worker a mais custa de fato)
+
+Uso (a partir de student-depression-api/, somente Linux):
+    python benchmarks/bench_worker_memory.py [--workers 4]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+CONFIGURATIONS = (
+    ("joblib", False),
+    ("mmap", False),
+    ("joblib", True),
+    ("mmap", True),
+)
+
+
+def memory_kb() -> dict:
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def run_master(model_format: str, preload: bool, workers: int):
+    """
+    Processo mestre de uma configuração: importa a aplicação, opcionalmente
+    carrega o modelo e faz o fork dos workers. Imprime um JSON por worker.
+    """
+    from src.model import model as model_module
+
+    if preload:
+        assert model_module.load_model(model_format=model_format)
+
+    # Sincronização com os workers: "pronto" -> medir -> sair
+    results_read, results_write = os.pipe()
+    measure_read, measure_write = os.pipe()
+    exit_read, exit_write = os.pipe()
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(results_read)
+            os.close(measure_write)
+            os.close(exit_write)
+            if not preload:
+                assert model_module.load_model(model_format=model_format)
+            model_module.warm_up()
+            # Espera todos os workers estarem vivos antes de medir o PSS
+            os.write(results_write, b"r")
+            os.read(measure_read, 1)
+            os.write(results_write, (json.dumps(memory_kb()) + "\n").encode())
+            os.read(exit_read, 1)
+            os._exit(0)
+        children.append(pid)
+
+    os.close(results_write)
+    os.close(measure_read)
+    os.close(exit_read)
+    with os.fdopen(results_read, "rb") as results:
+        results.read(workers)
+        os.write(measure_write, b"m" * workers)
+        measurements = [results.readline().decode() for _ in range(workers)]
+        os.write(exit_write, b"x" * workers)
+    for pid in children:
+        os.waitpid(pid, 0)
+    for line in measurements:
+        print(line.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--master", nargs=2, metavar=("FORMAT", "PRELOAD"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.master:
+        run_master(args.master[0], args.master[1] == "preload", args.workers)
+        return
+
+    env = {**os.environ, "OPENBLAS_NUM_THREADS": "1", "OMP_NUM_THREADS": "1"}
+    print(f"Workers por configuração: {args.workers}  |  médias por worker em MB")
+    print(f"{'formato':<10}{'preload':>9}{'RSS':>9}{'PSS':>9}{'USS':>9}")
+    for model_format, preload in CONFIGURATIONS:
+        output = subprocess.run(
+            [sys.executable, __file__, "--workers", str(args.workers),
+             "--master", model_format, "preload" if preload else "fork"],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        samples = [json.loads(line) for line in output.splitlines() if line.startswith("{")]
+        mean = {key: sum(s[key] for s in samples) / len(samples) / 1024 for key in ("rss", "pss", "uss")}
+        print(f"{model_format:<10}{'sim' if preload else 'não':>9}{mean['rss']:>9.1f}{mean['pss']:>9.1f}{mean['uss']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,40 @@
-from typing import List, Dict, Any
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-import joblib
-from pathlib import Path
-import pandas as pd
-from src.model.model import router as model_router
-from src.model.questions import router as questions_router
+from fastapi.responses import ORJSONResponse
+from src.model.model import router as model_router, startup as model_startup, startup_state
+from src.model.health import router as health_router
+from src.model.metrics import MetricsMiddleware, router as metrics_router
+from src.model.profiling import ProfilingMiddleware
+from src.model.questions import router as questions_router, questions_store
 
 origins = [
         "http://localhost:3000",
         "https://projengsoftware-o465.onrender.com"
     ]
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Carrega questions.json em memória e passa a observar alterações no arquivo
+    try:
+        questions_store.load()
+        questions_store.start_watching()
+    except Exception as e:
+        print(f"Erro ao carregar questions.json: {e}")
+    # Carrega e aquece o modelo antes de receber tráfego (ver /health/ready)
+    await model_startup()
+    yield
+    # Deixa de se anunciar como pronta enquanto desliga
+    startup_state["warmed_up"] = False
+    questions_store.stop_watching()
+
+# Respostas serializadas com orjson
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.include_router(model_router, prefix="/model", tags=["Model"])
 app.include_router(questions_router, prefix="/questions", tags=["Questions"])
+app.include_router(health_router, prefix="/health", tags=["Health"])
+app.include_router(metrics_router, prefix="/metrics", tags=["Metrics"])
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,6 +44,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Latência e status por rota, expostos em /metrics
+app.add_middleware(MetricsMiddleware)
+# Perfil de uma amostra das requisições (PROFILING_ENABLED)
+app.add_middleware(ProfilingMiddleware)
+
 @app.get("/")
 async def root():
     return {}
@@ -0,0 +1,184 @@
+"""
+Backends de inferência: a mesma interface, predict(requests) -> (predições,
+probabilidades), sobre três implementações do modelo:
+
+- "numpy": o CompiledModel (NumPy puro, sem pandas nem scikit-learn por requisição)
+- "sklearn": o Pipeline salvo (DataFrame + passada única do pré-processador e
+  do kernel, ou predict/predict_proba com SCORING_MODE=pipeline)
+- "onnx": o mesmo pipeline exportado para ONNX (src/model/onnx_export.py) e
+  executado pelo ONNX Runtime na CPU
+- "cascade": o substituto destilado do SVC em todas as linhas e o
+  CompiledModel só nas que caem na faixa de incerteza (src/model/cascade.py)
+
+O backend em uso é escolhido por SCORING_MODE (ver SCORING_BACKENDS).
+"""
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import numpy as np
+from src.model import cascade, scoring
+from src.model.compiled_model import REQUEST_FIELDS, CompiledModel
+from src.model.metrics import stage
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# SCORING_MODE -> backend
+SCORING_BACKENDS = {
+    "compiled": "numpy",
+    "single_pass": "sklearn",
+    "pipeline": "sklearn",
+    "onnx": "onnx",
+    "cascade": "cascade",
+}
+
+
+def build_model_input(requests: List) -> "pd.DataFrame":
+    """
+    Monta um único DataFrame (uma linha por estudante) no formato esperado pelo pipeline
+    """
+    import pandas as pd
+
+    return pd.DataFrame({
+        "Gender": [r.gender for r in requests],
+        "Age": [r.age for r in requests],
+        "Academic Pressure": [r.academic_pressure for r in requests],
+        "Study Satisfaction": [r.study_satisfaction for r in requests],
+        "CGPA": [r.cgpa for r in requests],
+        "Sleep Duration": [r.sleep_duration for r in requests],
+        "Dietary Habits": [r.dietary_habits for r in requests],
+        "Have you ever had suicidal thoughts ?": [r.suicidal_thoughts for r in requests],
+        "Work/Study Hours": [r.work_study_hours for r in requests],
+        "Financial Stress": [r.financial_stress for r in requests],
+        "Family History of Mental Illness": [r.family_history for r in requests]
+    })
+
+
+class InferenceBackend(ABC):
+    """
+    Interface comum dos backends. Um backend sem predict falha ao ser
+    instanciado, e não na primeira requisição.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def predict(self, requests: List) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna (predições, probabilidades) para uma lista de PredictionRequest
+        """
+
+
+class NumpyBackend(InferenceBackend):
+    name = "numpy"
+
+    def __init__(self, compiled: CompiledModel):
+        self.compiled = compiled
+
+    def predict(self, requests: List) -> Tuple[np.ndarray, np.ndarray]:
+        with stage("model_input"):
+            encoded, sq_norms = self.compiled.encode_requests(requests)
+        with stage("model"):
+            return self.compiled.predict_encoded(encoded, sq_norms)
+
+
+class SklearnBackend(InferenceBackend):
+    name = "sklearn"
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def predict(self, requests: List) -> Tuple[np.ndarray, np.ndarray]:
+        with stage("model_input"):
+            model_input = build_model_input(requests)
+        with stage("model"):
+            return scoring.predict_with_proba(self.pipeline, model_input)
+
+
+def import_onnxruntime():
+    try:
+        import onnxruntime
+    except ImportError:
+        raise RuntimeError("O backend onnx precisa do ONNX Runtime: pip install onnxruntime") from None
+    return onnxruntime
+
+
+class OnnxBackend(InferenceBackend):
+    """
+    Pipeline exportado para ONNX. Cada coluna do pipeline é uma entrada do
+    grafo (double para as numéricas, string para as categóricas), na ordem
+    gravada nos metadados do arquivo.
+    """
+
+    name = "onnx"
+
+    def __init__(self, session):
+        self.session = session
+        metadata = session.get_modelmeta().custom_metadata_map
+        columns = json.loads(metadata["columns"])
+        self.source_fingerprint = metadata.get("source_fingerprint") or None
+        self.inputs = [
+            (model_input.name, REQUEST_FIELDS[column], model_input.type == "tensor(string)")
+            for model_input, column in zip(session.get_inputs(), columns)
+        ]
+
+    @classmethod
+    def load(cls, path: Path, threads: Optional[int] = None) -> "OnnxBackend":
+        onnxruntime = import_onnxruntime()
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        return cls(onnxruntime.InferenceSession(str(path), options, providers=["CPUExecutionProvider"]))
+
+    def predict(self, requests: List) -> Tuple[np.ndarray, np.ndarray]:
+        with stage("model_input"):
+            feed = {
+                name: np.array([[getattr(r, field)] for r in requests], dtype=object if is_text else np.float64)
+                for name, field, is_text in self.inputs
+            }
+        with stage("model"):
+            labels, probabilities = self.session.run(None, feed)
+        return labels, probabilities
+
+
+class CascadeBackend(InferenceBackend):
+    """
+    Substituto em todas as linhas; o CompiledModel só nas linhas da faixa de
+    incerteza, reaproveitando a entrada já codificada. Com
+    record_escalations=False (aquecimento) as linhas não entram nas
+    contagens de /model/cascade/stats.
+    """
+
+    name = "cascade"
+
+    def __init__(self, surrogate: cascade.Surrogate, compiled: CompiledModel, record_escalations: bool = True):
+        self.surrogate = surrogate
+        self.compiled = compiled
+        self.record_escalations = record_escalations
+
+    def predict(self, requests: List) -> Tuple[np.ndarray, np.ndarray]:
+        with stage("model_input"):
+            encoded, sq_norms = self.compiled.encode_requests(requests)
+        with stage("model"):
+            labels, probabilities, escalated = cascade.cascade_outputs(
+                self.surrogate, self.compiled, encoded, sq_norms, cascade.CASCADE_BAND_LOW, cascade.CASCADE_BAND_HIGH
+            )
+        if self.record_escalations:
+            cascade.record_escalation(len(requests), int(escalated.sum()))
+        return labels, probabilities
+
+    def predict_block(self, requests: List) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pontua a requisição (primeira linha) e as suas perturbações com um
+        único modelo (ver cascade.block_outputs); conta como uma linha
+        """
+        with stage("model_input"):
+            encoded, sq_norms = self.compiled.encode_requests(requests)
+        with stage("model"):
+            labels, probabilities, escalated = cascade.block_outputs(
+                self.surrogate, self.compiled, encoded, sq_norms, cascade.CASCADE_BAND_LOW, cascade.CASCADE_BAND_HIGH
+            )
+        if self.record_escalations:
+            cascade.record_escalation(1, int(escalated))
+        return labels, probabilities
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from src.model.prediction_response import PredictionResponse
+
+class BatchPredictionItem(BaseModel):
+    index: int
+    result: Optional[PredictionResponse] = None
+    error: Optional[str] = None
+
+class BatchPredictionResponse(BaseModel):
+    results: List[BatchPredictionItem]
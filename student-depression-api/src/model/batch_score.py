@@ -0,0 +1,325 @@
+"""
+Pontuação offline de arquivos do questionário (CSV ou Parquet), fora da API.
+
+Usa o mesmo artefato, a mesma codificação das features e o mesmo
+generate_feature_feedback da API. O arquivo é lido em blocos, que são
+distribuídos entre processos (cada processo carrega o modelo uma única vez
+no initializer do pool) e gravados na ordem de entrada. A memória fica
+limitada a alguns blocos por processo, independente do tamanho do arquivo.
+
+As colunas de entrada usam os nomes dos campos do PredictionRequest (como no
+/model/predict/stream); colunas extras (ex.: um identificador do estudante)
+são copiadas para a saída, seguidas de prediction, probability_0,
+probability_1, depression_risk, feature_feedback (JSON, com --feedback) e error.
+
+Parquet precisa do pacote pyarrow, que não é dependência da API.
+
+Uso (a partir de student-depression-api/):
+    python -m src.model.batch_score entrada.csv saida.parquet [--workers 4] [--feedback]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import orjson
+import pandas as pd
+from pydantic import ValidationError
+from src.model import metrics
+from src.model import model as model_module
+from src.model.prediction_request import PredictionRequest
+
+DEFAULT_CHUNK_SIZE = 5000
+FILE_FORMATS = ("csv", "parquet")
+FIELDS = list(PredictionRequest.model_fields)
+
+# Colunas acrescentadas à saída, com o dtype usado para que blocos sem
+# nenhum valor (ex.: nenhum erro) tenham o mesmo tipo dos demais
+RESULT_DTYPES = {
+    "prediction": "Int64",
+    "probability_0": "float64",
+    "probability_1": "float64",
+    "depression_risk": "string",
+    "feature_feedback": "string",
+    "error": "string",
+}
+
+
+def file_format(path: Path, explicit: Optional[str] = None) -> str:
+    """
+    Formato do arquivo: o informado ou, na falta dele, o da extensão
+    """
+    if explicit:
+        return explicit
+    suffix = Path(path).suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    if suffix in (".csv", ".txt"):
+        return "csv"
+    raise ValueError(f"Formato de {path} desconhecido; use --input-format/--output-format ({', '.join(FILE_FORMATS)})")
+
+
+def import_parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("Arquivos Parquet precisam do pacote pyarrow: pip install pyarrow") from e
+    return pyarrow, pyarrow.parquet
+
+
+def read_chunks(path: Path, fmt: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if fmt == "parquet":
+        _, parquet = import_parquet()
+        for batch in parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        # Tudo como texto: a validação do PredictionRequest converte os tipos,
+        # como no /model/predict/stream
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+
+
+class ResultWriter:
+    """Grava os blocos de resultado, na ordem, num único CSV ou Parquet."""
+
+    def __init__(self, path: Path, fmt: str):
+        self.path = Path(path)
+        self.fmt = fmt
+        self._parquet_writer = None
+        self._started = False
+
+    def write(self, frame: pd.DataFrame):
+        if self.fmt == "parquet":
+            pyarrow, parquet = import_parquet()
+            if self._parquet_writer is None:
+                table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+                self._parquet_writer = parquet.ParquetWriter(self.path, table.schema)
+            else:
+                table = pyarrow.Table.from_pandas(frame, schema=self._parquet_writer.schema, preserve_index=False)
+            self._parquet_writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="a" if self._started else "w", header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        elif not self._started and self.fmt == "csv":
+            # Arquivo de entrada vazio: saída só com o cabeçalho
+            pd.DataFrame(columns=list(RESULT_DTYPES)).to_csv(self.path, index=False)
+
+
+def init_worker(model_format: str, model_path: Optional[Path], single_thread: bool):
+    """
+    Initializer dos processos do pool: carrega o modelo uma única vez por processo
+    """
+    # Sem /metrics no CLI; o modelo roda sem instrumentação
+    metrics.METRICS_ENABLED = False
+    if single_thread:
+        # Um processo por núcleo: o BLAS de cada processo não deve abrir mais threads
+        try:
+            from threadpoolctl import threadpool_limits
+            threadpool_limits(1)
+        except ImportError:
+            pass
+    model_module.load_model(model_path, model_format)
+
+
+def score_chunk(records: List[dict], with_feedback: bool) -> Dict[str, list]:
+    """
+    Valida e pontua um bloco de linhas numa única chamada vetorizada.
+    Retorna as colunas de resultado, na ordem das linhas.
+    """
+    if not model_module.model_available():
+        raise RuntimeError(model_module.startup_state["error"] or "Modelo não carregado")
+
+    columns = {name: [None] * len(records) for name in RESULT_DTYPES}
+    positions = []
+    requests = []
+    for position, record in enumerate(records):
+        try:
+            requests.append(PredictionRequest.model_validate(record))
+            positions.append(position)
+        except ValidationError as e:
+            columns["error"][position] = f"Dados inválidos: {e.errors(include_url=False)}"
+
+    scored = model_module.score_batch(requests) if requests else []
+    for position, request, outcome in zip(positions, requests, scored):
+        try:
+            if isinstance(outcome, Exception):
+                raise outcome
+            prediction, prediction_proba = outcome
+            response = model_module.build_prediction_response(request, prediction, prediction_proba) if with_feedback else None
+        except Exception as e:
+            columns["error"][position] = f"Erro ao processar predição: {str(e)}"
+            continue
+        columns["prediction"][position] = int(prediction)
+        columns["probability_0"][position] = float(prediction_proba[0])
+        columns["probability_1"][position] = float(prediction_proba[1])
+        columns["depression_risk"][position] = "Depressivo" if prediction == 1 else "Não depressivo"
+        if response is not None:
+            columns["feature_feedback"][position] = orjson.dumps(
+                [feedback.model_dump() for feedback in response.feature_feedback]
+            ).decode()
+    return columns
+
+
+class InlineExecutor:
+    """Roda os blocos no próprio processo (--workers 1), sem pool."""
+
+    def __init__(self, initializer, initargs):
+        initializer(*initargs)
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class Progress:
+    """Linhas processadas, vazão e erros, atualizados em stderr."""
+
+    def __init__(self, enabled: bool = True, stream=None):
+        self.enabled = enabled
+        self.stream = stream or sys.stderr
+        self.started = time.perf_counter()
+        self.rows = 0
+        self.errors = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def update(self, rows: int, errors: int):
+        self.rows += rows
+        self.errors += errors
+        if self.enabled:
+            rate = self.rows / self.elapsed if self.elapsed > 0 else 0.0
+            self.stream.write(f"\r{self.rows} linhas | {rate:.0f} linhas/s | {self.errors} erros")
+            self.stream.flush()
+
+    def finish(self):
+        if self.enabled:
+            self.stream.write("\n")
+            self.stream.flush()
+
+
+def result_frame(chunk: pd.DataFrame, columns: Dict[str, list], with_feedback: bool) -> pd.DataFrame:
+    results = pd.DataFrame(
+        {name: pd.array(values, dtype=RESULT_DTYPES[name]) for name, values in columns.items()
+         if with_feedback or name != "feature_feedback"},
+        index=chunk.index,
+    )
+    return pd.concat([chunk.drop(columns=[c for c in results.columns if c in chunk.columns]), results], axis=1)
+
+
+def score_file(
+    input_path: Path,
+    output_path: Path,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    with_feedback: bool = False,
+    model_format: Optional[str] = None,
+    model_path: Optional[Path] = None,
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+    progress: Optional[Progress] = None,
+) -> Progress:
+    """
+    Pontua input_path e grava output_path. Retorna o progresso final (linhas, erros, tempo).
+    """
+    input_format = file_format(input_path, input_format)
+    output_format = file_format(output_path, output_format)
+    model_format = model_format or model_module.MODEL_FORMAT
+    if "parquet" in (input_format, output_format):
+        import_parquet()
+    progress = progress or Progress(enabled=False)
+    initargs = (model_format, model_path, workers > 1)
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=initargs)
+    else:
+        executor = InlineExecutor(init_worker, initargs)
+
+    # Blocos em andamento: o suficiente para manter todos os processos ocupados
+    max_pending = 2 * workers
+    writer = ResultWriter(output_path, output_format)
+    pending = deque()
+
+    def write_next():
+        chunk, future = pending.popleft()
+        columns = future.result()
+        writer.write(result_frame(chunk, columns, with_feedback))
+        progress.update(len(chunk), sum(error is not None for error in columns["error"]))
+
+    try:
+        with executor:
+            for chunk in read_chunks(input_path, input_format, chunk_size):
+                missing = [field for field in FIELDS if field not in chunk.columns]
+                if missing:
+                    raise ValueError(f"Colunas ausentes em {input_path}: {missing}")
+                records = chunk[FIELDS].to_dict("records")
+                pending.append((chunk, executor.submit(score_chunk, records, with_feedback)))
+                while len(pending) >= max_pending:
+                    write_next()
+            while pending:
+                write_next()
+    finally:
+        for _, future in pending:
+            future.cancel()
+        writer.close()
+        progress.finish()
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", type=Path, help="arquivo CSV ou Parquet com as respostas")
+    parser.add_argument("output", type=Path, help="arquivo CSV ou Parquet de saída")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processos de pontuação (padrão: núcleos da máquina)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="linhas por bloco")
+    parser.add_argument("--feedback", action="store_true", help="inclui o feedback por feature (JSON) na saída")
+    parser.add_argument("--model-format", choices=("joblib", "mmap"), default=model_module.MODEL_FORMAT)
+    parser.add_argument("--model", type=Path, default=None, help="artefato do modelo (padrão: o mesmo da API)")
+    parser.add_argument("--input-format", choices=FILE_FORMATS, default=None)
+    parser.add_argument("--output-format", choices=FILE_FORMATS, default=None)
+    parser.add_argument("--quiet", action="store_true", help="não mostra o progresso")
+    args = parser.parse_args()
+
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers e --chunk-size devem ser maiores que zero")
+
+    try:
+        result = score_file(
+            args.input, args.output,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            with_feedback=args.feedback,
+            model_format=args.model_format,
+            model_path=args.model,
+            input_format=args.input_format,
+            output_format=args.output_format,
+            progress=Progress(enabled=not args.quiet),
+        )
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(
+        f"{result.rows} linhas pontuadas em {result.elapsed:.1f} s "
+        f"({result.rows / max(result.elapsed, 1e-9):.0f} linhas/s, {result.errors} com erro) -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Pontuação em cascata (SCORING_MODE=cascade): um substituto barato, uma
+regressão logística destilada das probabilidades do SVC (ver
+src/model/distillation.py), pontua todas as linhas, e só as que caem na faixa
+de incerteza [CASCADE_BAND_LOW, CASCADE_BAND_HIGH] vão para o SVC
+(CompiledModel). Fora da faixa, o rótulo e as probabilidades são os do
+substituto.
+
+O substituto é gravado em JSON ao lado do .joblib
+(student-depression-svm.surrogate.json), com o fingerprint do modelo de onde
+foi destilado. Só usa NumPy e a biblioteca padrão, para funcionar também no
+modo enxuto.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+import numpy as np
+from src.model import metrics
+from src.model.compiled_model import CompiledModel
+from src.model.model_metadata import write_metadata
+
+# Faixa de incerteza: probabilidades do substituto (da classe positiva) que vão para o SVC
+CASCADE_BAND_LOW = float(os.getenv("CASCADE_BAND_LOW", "0.2"))
+CASCADE_BAND_HIGH = float(os.getenv("CASCADE_BAND_HIGH", "0.8"))
+
+SURROGATE_FORMAT_VERSION = 1
+
+# Linhas pontuadas por camada: "surrogate" (resolvidas pelo substituto) ou "exact" (escaladas para o SVC)
+CASCADE_ROWS = metrics.registry.counter(
+    "cascade_rows_total", "Linhas pontuadas com SCORING_MODE=cascade, por camada", ("tier",)
+)
+
+
+def surrogate_path(model_path: Path) -> Path:
+    """
+    Arquivo do substituto que acompanha o .joblib (ou o diretório do artefato de serving)
+    """
+    return Path(model_path).with_suffix(".surrogate.json")
+
+
+def validate_band(lower: float, upper: float):
+    if not 0.0 <= lower <= upper <= 1.0:
+        raise ValueError(f"Faixa de incerteza inválida: [{lower}, {upper}] (use 0 <= baixo <= alto <= 1)")
+
+
+class Surrogate:
+    """
+    Regressão logística sobre a entrada codificada do CompiledModel
+    (numéricos crus + one-hot). O StandardScaler é dobrado nos pesos, como nos
+    vetores de suporte:
+
+        w · z + b = (w_num / scale) · x_num + w_cat · onehot + (b - w_num · mean/scale)
+
+    então a probabilidade de uma linha é um produto escalar e um exp.
+    """
+
+    def __init__(self, weights: np.ndarray, intercept: float, classes: np.ndarray, source_fingerprint: Optional[str] = None):
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.classes = np.asarray(classes)
+        self.source_fingerprint = source_fingerprint
+
+    @classmethod
+    def from_scaled(cls, compiled: CompiledModel, coef: np.ndarray, intercept: float, source_fingerprint: Optional[str] = None) -> "Surrogate":
+        """
+        Dobra o StandardScaler do CompiledModel nos coeficientes ajustados na entrada escalada
+        """
+        weights = np.asarray(coef, dtype=np.float64).copy()
+        numeric = weights[:compiled.n_numeric] / compiled.scale
+        weights[:compiled.n_numeric] = numeric
+        return cls(weights, intercept - numeric @ compiled.mean, compiled.classes, source_fingerprint)
+
+    def probability(self, encoded: np.ndarray) -> np.ndarray:
+        """
+        P(classes[1]) de cada linha da entrada codificada
+        """
+        with np.errstate(over='ignore'):
+            return 1.0 / (1.0 + np.exp(-(encoded @ self.weights + self.intercept)))
+
+    def save(self, path: Path) -> Path:
+        write_metadata(path, {
+            "format_version": SURROGATE_FORMAT_VERSION,
+            "method": "logistic_regression",
+            "source_fingerprint": self.source_fingerprint,
+            "weights": self.weights.tolist(),
+            "intercept": self.intercept,
+            "classes": self.classes.tolist(),
+        })
+        return Path(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "Surrogate":
+        with open(path, encoding="utf-8") as source:
+            data = json.load(source)
+        if data.get("format_version") != SURROGATE_FORMAT_VERSION:
+            raise ValueError(f"Versão do substituto não suportada: {data.get('format_version')}")
+        return cls(np.array(data["weights"]), data["intercept"], np.array(data["classes"]), data.get("source_fingerprint"))
+
+
+def surrogate_outputs(surrogate: Surrogate, encoded: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (predições, probabilidades) do substituto sozinho
+    """
+    positive = surrogate.probability(encoded)
+    return surrogate.classes[(positive > 0.5).astype(int)], np.column_stack([1.0 - positive, positive])
+
+
+def check_compatible(surrogate: Surrogate, compiled: CompiledModel):
+    if len(surrogate.weights) != compiled.n_transformed:
+        raise ValueError("Substituto incompatível com o modelo carregado")
+
+
+def cascade_outputs(
+    surrogate: Surrogate,
+    compiled: CompiledModel,
+    encoded: np.ndarray,
+    sq_norms: np.ndarray,
+    lower: float,
+    upper: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (predições, probabilidades, linhas escaladas) da cascata: o SVC só é
+    avaliado nas linhas em que a probabilidade do substituto está em [lower, upper]
+    """
+    check_compatible(surrogate, compiled)
+    labels, probabilities = surrogate_outputs(surrogate, encoded)
+    positive = probabilities[:, 1]
+    escalated = (positive >= lower) & (positive <= upper)
+    if escalated.any():
+        exact_labels, exact_probabilities = compiled.predict_encoded(encoded[escalated], sq_norms[escalated])
+        labels[escalated] = exact_labels
+        probabilities[escalated] = exact_probabilities
+    return labels, probabilities, escalated
+
+
+def block_outputs(
+    surrogate: Surrogate,
+    compiled: CompiledModel,
+    encoded: np.ndarray,
+    sq_norms: np.ndarray,
+    lower: float,
+    upper: float,
+) -> Tuple[np.ndarray, np.ndarray, bool]:
+    """
+    (predições, probabilidades, escalado) de um bloco pontuado por um único
+    modelo: o SVC se a primeira linha cai na faixa, senão o substituto. Usado
+    pelas explicações, em que a primeira linha é a requisição e as demais são
+    as suas perturbações; misturar os dois modelos no bloco faria cada
+    contribuição comparar probabilidades de modelos diferentes.
+    """
+    check_compatible(surrogate, compiled)
+    positive = surrogate.probability(encoded[:1])[0]
+    if lower <= positive <= upper:
+        return (*compiled.predict_encoded(encoded, sq_norms), True)
+    return (*surrogate_outputs(surrogate, encoded), False)
+
+
+def record_escalation(rows: int, escalated: int):
+    CASCADE_ROWS.inc("surrogate", amount=rows - escalated)
+    CASCADE_ROWS.inc("exact", amount=escalated)
+
+
+def escalation_rate() -> Optional[float]:
+    """
+    Fração das linhas pontuadas pela cascata que foram para o SVC (None antes da primeira)
+    """
+    exact = CASCADE_ROWS.value("exact")
+    rows = exact + CASCADE_ROWS.value("surrogate")
+    return exact / rows if rows else None
+
+
+def cascade_stats() -> dict:
+    exact = int(CASCADE_ROWS.value("exact"))
+    return {
+        "band": [CASCADE_BAND_LOW, CASCADE_BAND_HIGH],
+        "rows": exact + int(CASCADE_ROWS.value("surrogate")),
+        "escalated": exact,
+        "escalation_rate": escalation_rate(),
+    }
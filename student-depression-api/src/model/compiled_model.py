@@ -0,0 +1,280 @@
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from src.model.libsvm_probability import svc_outputs
+
+# Calibração das probabilidades: "platt" é a do SVC(probability=True) (libsvm);
+# "sigmoid" é a do CalibratedClassifierCV(method='sigmoid') do modelo aproximado
+CALIBRATIONS = ("platt", "sigmoid")
+
+# Tipo dos vetores de suporte, normas, coeficientes e da entrada codificada.
+# Em float32 a matriz do kernel usa metade da banda de memória e o dobro de
+# lanes SIMD; a calibração continua em float64 (ver src/model/precision.py)
+PRECISIONS = ("float64", "float32")
+
+# Coluna do pipeline -> campo do PredictionRequest
+REQUEST_FIELDS = {
+    "Gender": "gender",
+    "Age": "age",
+    "Academic Pressure": "academic_pressure",
+    "Study Satisfaction": "study_satisfaction",
+    "CGPA": "cgpa",
+    "Sleep Duration": "sleep_duration",
+    "Dietary Habits": "dietary_habits",
+    "Have you ever had suicidal thoughts ?": "suicidal_thoughts",
+    "Work/Study Hours": "work_study_hours",
+    "Financial Stress": "financial_stress",
+    "Family History of Mental Illness": "family_history",
+}
+
+
+class CompiledModel:
+    """
+    Versão "compilada" do pipeline StandardScaler + OneHotEncoder + SVC(rbf).
+
+    Os parâmetros são extraídos uma única vez do pipeline e guardados como
+    arrays contíguos. O StandardScaler é dobrado nos vetores de suporte:
+
+        ||z - sv||² = ||z||² - 2 (x_num · sv_num/scale + onehot · sv_cat) + (||sv||² + 2 mean/scale · sv_num)
+
+    onde z é a entrada escalada e x_num a entrada numérica crua, então a
+    predição de uma requisição é um produto matriz-vetor, um exp e a
+    calibração de Platt, sem pandas nem scikit-learn.
+
+    O modelo aproximado (Nyström + classificador linear, treinado com
+    python -m src.model.train --approximate N) tem a mesma forma: os
+    componentes do Nyström fazem o papel dos vetores de suporte e os
+    coeficientes lineares, levados de volta pela normalização do Nyström, o
+    dos coeficientes duais.
+    """
+
+    def __init__(
+        self,
+        numeric_features: Sequence[str],
+        categorical_features: Sequence[str],
+        mean: np.ndarray,
+        scale: np.ndarray,
+        category_index: Dict[str, Dict[str, int]],
+        folded_support_vectors: np.ndarray,
+        support_sq_norms: np.ndarray,
+        dual_coef: np.ndarray,
+        intercept: float,
+        gamma: float,
+        prob_a: float,
+        prob_b: float,
+        classes: np.ndarray,
+        calibration: str = "platt",
+        precision: str = "float64",
+    ):
+        if calibration not in CALIBRATIONS:
+            raise ValueError(f"Calibração desconhecida: {calibration}")
+        if precision not in PRECISIONS:
+            raise ValueError(f"Precisão desconhecida: {precision}")
+        self.precision = precision
+        self.dtype = np.dtype(precision)
+        self.numeric_features = list(numeric_features)
+        self.categorical_features = list(categorical_features)
+        self.mean = np.ascontiguousarray(mean, dtype=np.float64)
+        self.scale = np.ascontiguousarray(scale, dtype=np.float64)
+        self.category_index = category_index
+        # (n_features_transformados, n_vetores_de_suporte)
+        self.folded_support_vectors = np.ascontiguousarray(folded_support_vectors, dtype=self.dtype)
+        self.support_sq_norms = np.ascontiguousarray(support_sq_norms, dtype=self.dtype)
+        self.dual_coef = np.ascontiguousarray(dual_coef, dtype=self.dtype)
+        self.intercept = float(intercept)
+        self.gamma = float(gamma)
+        self.prob_a = float(prob_a)
+        self.prob_b = float(prob_b)
+        self.classes = np.asarray(classes)
+        self.calibration = calibration
+        self.n_numeric = len(self.numeric_features)
+        # Linhas da matriz do kernel por predição: vetores de suporte ou componentes do Nyström
+        self.n_transformed, self.n_kernel_rows = self.folded_support_vectors.shape
+        self.numeric_fields = [REQUEST_FIELDS[f] for f in self.numeric_features]
+        self.categorical_fields = [REQUEST_FIELDS[f] for f in self.categorical_features]
+
+    @classmethod
+    def from_pipeline(cls, pipeline) -> "CompiledModel":
+        """
+        Extrai os parâmetros do pipeline salvo pelo notebook (ou do pipeline
+        aproximado, com o passo 'feature_map')
+        """
+        preprocessor = pipeline.named_steps['preprocessor']
+
+        numeric_features, categorical_features = [], []
+        category_index = {}
+        scaler = encoder = None
+        offset = 0
+        for name, transformer, features in preprocessor.transformers_:
+            if name == 'num':
+                scaler = transformer
+                numeric_features = list(features)
+                offset += len(features)
+            elif name == 'cat':
+                encoder = transformer
+                categorical_features = list(features)
+                for feature, categories in zip(features, transformer.categories_):
+                    category_index[feature] = {str(c): offset + i for i, c in enumerate(categories)}
+                    offset += len(categories)
+
+        if scaler is None or encoder is None:
+            raise ValueError("Pipeline sem os transformadores 'num' e 'cat' esperados")
+
+        if 'feature_map' in pipeline.named_steps:
+            expansion = approximate_expansion(pipeline)
+        else:
+            svc = pipeline.steps[-1][1]
+            expansion = dict(
+                support_vectors=svc.support_vectors_,
+                dual_coef=svc.dual_coef_[0],
+                intercept=svc.intercept_[0],
+                gamma=svc._gamma,
+                prob_a=svc.probA_[0],
+                prob_b=svc.probB_[0],
+                classes=svc.classes_,
+            )
+
+        support_vectors = expansion.pop('support_vectors')
+        mean = scaler.mean_
+        scale = scaler.scale_
+        n_numeric = len(numeric_features)
+
+        folded = support_vectors.copy()
+        folded[:, :n_numeric] /= scale
+        sq_norms = (support_vectors ** 2).sum(axis=1) + 2 * folded[:, :n_numeric] @ mean
+
+        return cls(
+            numeric_features=numeric_features,
+            categorical_features=categorical_features,
+            mean=mean,
+            scale=scale,
+            category_index=category_index,
+            folded_support_vectors=folded.T,
+            support_sq_norms=sq_norms,
+            **expansion,
+        )
+
+    def with_precision(self, precision: str) -> "CompiledModel":
+        """
+        Cópia do modelo com os arrays do kernel em outra precisão
+        """
+        if precision == self.precision:
+            return self
+        return CompiledModel(
+            numeric_features=self.numeric_features,
+            categorical_features=self.categorical_features,
+            mean=self.mean,
+            scale=self.scale,
+            category_index=self.category_index,
+            folded_support_vectors=self.folded_support_vectors,
+            support_sq_norms=self.support_sq_norms,
+            dual_coef=self.dual_coef,
+            intercept=self.intercept,
+            gamma=self.gamma,
+            prob_a=self.prob_a,
+            prob_b=self.prob_b,
+            classes=self.classes,
+            calibration=self.calibration,
+            precision=precision,
+        )
+
+    def encode_rows(self, numeric: np.ndarray, categorical: Sequence[Sequence[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Monta a matriz de entrada (numéricos crus + one-hot) e ||z||² de cada linha.
+        Categorias desconhecidas ficam zeradas, como no OneHotEncoder(handle_unknown='ignore').
+        Valores numéricos NaN ou infinitos são rejeitados, como no pipeline do scikit-learn.
+        """
+        numeric = np.asarray(numeric, dtype=np.float64).reshape(-1, self.n_numeric)
+        if not np.isfinite(numeric).all():
+            raise ValueError("A entrada contém valores numéricos NaN ou infinitos")
+        n_rows = numeric.shape[0]
+        encoded = np.zeros((n_rows, self.n_transformed), dtype=self.dtype)
+        encoded[:, :self.n_numeric] = numeric
+
+        active = np.zeros(n_rows, dtype=np.float64)
+        for row, values in enumerate(categorical):
+            for feature, value in zip(self.categorical_features, values):
+                column = self.category_index[feature].get(value)
+                if column is not None:
+                    encoded[row, column] = 1.0
+                    active[row] += 1.0
+
+        scaled = (numeric - self.mean) / self.scale
+        return encoded, ((scaled ** 2).sum(axis=1) + active).astype(self.dtype, copy=False)
+
+    def encode_requests(self, requests: List) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Converte PredictionRequest (ou qualquer objeto com os mesmos atributos) em entrada do modelo
+        """
+        numeric = [[getattr(r, field) for field in self.numeric_fields] for r in requests]
+        categorical = [[getattr(r, field) for field in self.categorical_fields] for r in requests]
+        return self.encode_rows(numeric, categorical)
+
+    def squared_distances(self, encoded: np.ndarray, sq_norms: np.ndarray) -> np.ndarray:
+        """
+        ||z - sv||² de cada linha para cada vetor de suporte, no espaço escalado
+        """
+        return sq_norms[:, None] - 2.0 * (encoded @ self.folded_support_vectors) + self.support_sq_norms
+
+    def decision_function(self, encoded: np.ndarray, sq_norms: np.ndarray) -> np.ndarray:
+        kernel = np.exp(-self.gamma * self.squared_distances(encoded, sq_norms))
+        return kernel @ self.dual_coef + self.intercept
+
+    def outputs(self, decision: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (predições, probabilidades) a partir do decision_function, com a calibração do modelo
+        """
+        # A calibração sempre em float64, mesmo com o kernel em float32
+        decision = np.asarray(decision, dtype=np.float64)
+        if self.calibration == "sigmoid":
+            return sigmoid_outputs(decision, self.classes, self.prob_a, self.prob_b)
+        return svc_outputs(decision, self.classes, self.prob_a, self.prob_b)
+
+    def predict_with_proba(self, requests: List) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna (predições, probabilidades), equivalente a pipeline.predict / predict_proba
+        """
+        return self.predict_encoded(*self.encode_requests(requests))
+
+    def predict_encoded(self, encoded: np.ndarray, sq_norms: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Mesma saída de predict_with_proba, a partir da entrada já codificada
+        """
+        return self.outputs(self.decision_function(encoded, sq_norms))
+
+
+def sigmoid_outputs(decision: np.ndarray, classes: np.ndarray, a: float, b: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rótulos e probabilidades do CalibratedClassifierCV(method='sigmoid') binário:
+    P(classes[1]) = 1 / (1 + exp(a·f + b)) e o rótulo é o argmax das probabilidades
+    """
+    with np.errstate(over='ignore'):
+        positive = 1.0 / (1.0 + np.exp(a * decision + b))
+    probabilities = np.column_stack([1.0 - positive, positive])
+    return classes[(positive > 0.5).astype(int)], probabilities
+
+
+def approximate_expansion(pipeline) -> dict:
+    """
+    Expansão em kernel do pipeline aproximado (preprocessor, feature_map =
+    Nystroem rbf, classifier = CalibratedClassifierCV sigmoide sem ensemble).
+
+    O Nystroem calcula K(x, componentes) @ normalization_.T, então a margem
+    linear w · φ(x) + b é Σ_j K(x, c_j) · (normalization_.T @ w)_j + b.
+    """
+    feature_map = pipeline.named_steps['feature_map']
+    classifier = pipeline.named_steps['classifier']
+    if feature_map.kernel != 'rbf' or classifier.method != 'sigmoid' or len(classifier.calibrated_classifiers_) != 1:
+        raise ValueError("Pipeline aproximado fora do formato esperado (Nystroem rbf + uma calibração sigmoide)")
+    calibrated = classifier.calibrated_classifiers_[0]
+    linear = calibrated.estimator
+    calibrator = calibrated.calibrators[0]
+    return dict(
+        support_vectors=feature_map.components_,
+        dual_coef=feature_map.normalization_.T @ linear.coef_[0],
+        intercept=linear.intercept_[0],
+        gamma=feature_map.gamma,
+        prob_a=calibrator.a_,
+        prob_b=calibrator.b_,
+        classes=classifier.classes_,
+        calibration="sigmoid",
+    )
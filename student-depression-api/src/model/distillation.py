@@ -0,0 +1,159 @@
+"""
+Destilação do substituto da pontuação em cascata (src/model/cascade.py) e
+relatório de fidelidade.
+
+O substituto é uma regressão logística na entrada escalada do pipeline,
+ajustada nas probabilidades do SVC e não nos rótulos do dataset: cada linha
+entra duas vezes, com rótulo 1 e peso P(depressivo) e com rótulo 0 e peso
+1 - P(depressivo), o que minimiza a entropia cruzada contra as
+probabilidades do SVC.
+
+O relatório de fidelidade compara a cascata com o SVC em dados separados:
+concordância dos rótulos (do substituto sozinho e da cascata), fração das
+linhas escaladas para o SVC e desvio das probabilidades nas linhas que o
+substituto resolve.
+
+Uso (a partir de student-depression-api/):
+    python -m src.model.distillation --data student_depression_dataset.csv [--model PIPELINE.joblib] [--band 0.2 0.8]
+    python -m src.model.distillation --support-vectors
+"""
+import argparse
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from src.model.cascade import CASCADE_BAND_HIGH, CASCADE_BAND_LOW, Surrogate, surrogate_path, validate_band
+from src.model.compiled_model import CompiledModel
+from src.model.feature_importance import encode_frame
+from src.model.precision import chunked_outputs
+
+# Regularização da regressão logística (entrada escalada)
+SURROGATE_C = 1.0
+
+# Faixas avaliadas no relatório, para escolher CASCADE_BAND_LOW/HIGH
+REPORT_BANDS = ((0.1, 0.9), (0.2, 0.8), (0.3, 0.7), (0.4, 0.6))
+
+
+def scaled_inputs(compiled: CompiledModel, encoded: np.ndarray) -> np.ndarray:
+    """
+    Entrada codificada com os numéricos escalados: a saída do pré-processador do pipeline
+    """
+    scaled = np.array(encoded, dtype=np.float64)
+    scaled[:, :compiled.n_numeric] = (scaled[:, :compiled.n_numeric] - compiled.mean) / compiled.scale
+    return scaled
+
+
+def distill_surrogate(compiled: CompiledModel, X: pd.DataFrame, source_fingerprint: Optional[str] = None, C: float = SURROGATE_C) -> Surrogate:
+    """
+    Ajusta o substituto nas probabilidades do SVC em X
+    """
+    from sklearn.linear_model import LogisticRegression
+
+    _, _, probabilities = chunked_outputs(compiled, X)
+    positive = probabilities[:, 1]
+    scaled = scaled_inputs(compiled, encode_frame(compiled, X)[0])
+    regression = LogisticRegression(C=C, max_iter=1000)
+    regression.fit(
+        np.vstack([scaled, scaled]),
+        np.concatenate([np.zeros(len(scaled)), np.ones(len(scaled))]),
+        sample_weight=np.concatenate([1.0 - positive, positive]),
+    )
+    return Surrogate.from_scaled(compiled, regression.coef_[0], regression.intercept_[0], source_fingerprint)
+
+
+def fidelity_report(
+    compiled: CompiledModel,
+    surrogate: Surrogate,
+    X: pd.DataFrame,
+    band: Tuple[float, float] = (CASCADE_BAND_LOW, CASCADE_BAND_HIGH),
+    bands: Sequence[Tuple[float, float]] = REPORT_BANDS,
+) -> dict:
+    """
+    Concordância com o SVC e fração escalada da cascata em X, na faixa band
+    (e, em "bands", nas faixas alternativas)
+    """
+    validate_band(*band)
+    _, exact_labels, exact_probabilities = chunked_outputs(compiled, X)
+    positive = surrogate.probability(encode_frame(compiled, X)[0])
+    surrogate_labels = surrogate.classes[(positive > 0.5).astype(int)]
+    deviation = np.abs(positive - exact_probabilities[:, 1])
+
+    def band_report(lower: float, upper: float) -> dict:
+        escalated = (positive >= lower) & (positive <= upper)
+        labels = np.where(escalated, exact_labels, surrogate_labels)
+        resolved = deviation[~escalated]
+        return {
+            "band": [lower, upper],
+            "agreement": float((labels == exact_labels).mean()) if len(X) else 1.0,
+            "escalated_fraction": float(escalated.mean()) if len(X) else 0.0,
+            "max_probability_deviation": float(resolved.max(initial=0.0)),
+            "mean_probability_deviation": float(resolved.mean()) if len(resolved) else 0.0,
+        }
+
+    return {
+        "rows": int(len(X)),
+        "surrogate_agreement": float((surrogate_labels == exact_labels).mean()) if len(X) else 1.0,
+        **band_report(*band),
+        "bands": [band_report(*alternative) for alternative in bands],
+    }
+
+
+def support_vector_frame(pipeline) -> pd.DataFrame:
+    """
+    Vetores de suporte do SVC no formato de entrada do pipeline: linhas de
+    treino que acompanham o .joblib, quando o CSV não está disponível
+    """
+    preprocessor = pipeline.named_steps['preprocessor']
+    support_vectors = pipeline.named_steps['classifier'].support_vectors_
+    columns, offset = {}, 0
+    for name, transformer, features in preprocessor.transformers_:
+        width = len(features) if name == 'num' else sum(len(c) for c in transformer.categories_)
+        values = transformer.inverse_transform(support_vectors[:, offset:offset + width])
+        for index, feature in enumerate(features):
+            columns[feature] = np.round(values[:, index], 2) if name == 'num' else values[:, index]
+        offset += width
+    return pd.DataFrame(columns)[list(pipeline.feature_names_in_)]
+
+
+def print_report(report: dict):
+    print(f"Concordância do substituto sozinho com o SVC: {report['surrogate_agreement']:.2%} ({report['rows']} linhas)")
+    for band in report["bands"]:
+        print(
+            f"  faixa [{band['band'][0]:.2f}, {band['band'][1]:.2f}]: {band['escalated_fraction']:.1%} escaladas, "
+            f"concordância {band['agreement']:.2%}, maior desvio da probabilidade {band['max_probability_deviation']:.3f}"
+        )
+    print(
+        f"Faixa configurada [{report['band'][0]:.2f}, {report['band'][1]:.2f}]: "
+        f"{report['escalated_fraction']:.1%} escaladas, concordância {report['agreement']:.2%}"
+    )
+
+
+def main():
+    import joblib
+    from sklearn.model_selection import train_test_split
+    from src.model.model import MODEL_PATH
+    from src.model.prediction_cache import artifact_fingerprint
+    from src.model.train import RANDOM_STATE, TEST_SIZE, prepare_dataset
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--data", type=Path, help="CSV do Student Depression Dataset (mesma divisão do treinamento)")
+    source.add_argument("--support-vectors", action="store_true", help="usa os vetores de suporte do SVC no lugar do CSV")
+    parser.add_argument("--model", type=Path, default=MODEL_PATH, help="pipeline .joblib destilado")
+    parser.add_argument("--output", type=Path, default=None, help="arquivo do substituto (padrão: ao lado do .joblib)")
+    parser.add_argument("--band", type=float, nargs=2, default=[CASCADE_BAND_LOW, CASCADE_BAND_HIGH], metavar=("BAIXO", "ALTO"))
+    args = parser.parse_args()
+
+    pipeline = joblib.load(args.model)
+    compiled = CompiledModel.from_pipeline(pipeline)
+    X = support_vector_frame(pipeline) if args.support_vectors else prepare_dataset(pd.read_csv(args.data))[0]
+    X_train, X_test = train_test_split(X, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+
+    surrogate = distill_surrogate(compiled, X_train, artifact_fingerprint(args.model))
+    print_report(fidelity_report(compiled, surrogate, X_test, tuple(args.band)))
+    output = surrogate.save(args.output or surrogate_path(args.model))
+    print(f"Substituto gravado em {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Explicação local de uma predição: para cada feature, quanto a probabilidade
+de depressão do estudante muda quando a sua resposta é trocada por um valor
+de referência.
+
+As referências vêm do próprio modelo, então valem também no modo enxuto:
+- numéricas: a média do treinamento (média do StandardScaler)
+- categóricas: a média sobre todas as categorias vistas no treinamento
+  (uma linha perturbada por categoria do OneHotEncoder)
+
+A requisição original e todas as linhas perturbadas são pontuadas juntas,
+numa única chamada vetorizada ao modelo.
+"""
+from typing import Dict, List, Tuple
+import numpy as np
+from src.model.compiled_model import REQUEST_FIELDS, CompiledModel
+from src.model.feedback import FEEDBACK_RULES
+
+# Coluna do modelo -> nome exibido no feedback
+FEATURE_LABELS = {rule['model_feature']: rule['feature'] for rule in FEEDBACK_RULES}
+
+
+def reference_values(compiled: CompiledModel) -> Dict[str, list]:
+    """
+    Valores de referência de cada coluna do modelo
+    """
+    references = {feature: [float(mean)] for feature, mean in zip(compiled.numeric_features, compiled.mean)}
+    for feature in compiled.categorical_features:
+        references[feature] = list(compiled.category_index[feature])
+    return references
+
+
+def perturbed_requests(request, references: Dict[str, list]) -> Tuple[list, List[str]]:
+    """
+    A requisição original seguida das perturbadas, e a coluna trocada em cada
+    linha perturbada
+    """
+    rows = [request]
+    features = []
+    for feature, values in references.items():
+        field = REQUEST_FIELDS[feature]
+        for value in values:
+            # Sem validação: a média de uma feature inteira não é inteira
+            rows.append(request.model_copy(update={field: value}))
+            features.append(feature)
+    return rows, features
+
+
+def local_contributions(probabilities: np.ndarray, features: List[str]) -> List[dict]:
+    """
+    Contribuição de cada feature (probabilidade da requisição menos a média
+    das linhas de referência), da maior para a menor em valor absoluto
+    """
+    positive = probabilities[:, 1]
+    references = positive[1:]
+    features = np.asarray(features)
+    contributions = []
+    for feature in dict.fromkeys(features.tolist()):
+        reference = float(references[features == feature].mean())
+        contributions.append({
+            'feature': FEATURE_LABELS.get(feature, feature),
+            'model_feature': feature,
+            'contribution': float(positive[0]) - reference,
+            'reference_probability': reference,
+        })
+    contributions.sort(key=lambda item: -abs(item['contribution']))
+    return contributions
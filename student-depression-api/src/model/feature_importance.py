@@ -0,0 +1,186 @@
+"""
+Importância das features por permutação para o artefato em uso, calculada
+offline num conjunto separado (por padrão, a mesma parte de teste da divisão
+do treinamento) e gravada nos metadados do modelo, de onde a API a lê junto
+com o modelo. Substitui os valores copiados à mão da célula
+analyze_svm_nonlinear_features do notebook.
+
+O conjunto é codificado uma única vez na entrada do CompiledModel (o mesmo
+cálculo servido pela API). Permutar uma feature é permutar as suas colunas
+dessa matriz (a coluna numérica ou o bloco one-hot) e ajustar ||z||² de cada
+linha, sem pandas nem pré-processador a cada repetição. As combinações
+feature × repetição rodam em paralelo (joblib), compartilhando a matriz.
+
+Uso (a partir de student-depression-api/):
+    python -m src.model.feature_importance --data student_depression_dataset.csv [--repeats 10] [--jobs -1]
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Tuple
+import joblib
+import numpy as np
+import pandas as pd
+from src.model.compiled_model import CompiledModel
+
+DEFAULT_REPEATS = 10
+RANDOM_STATE = 42
+# Linhas avaliadas por vez: limita a matriz do kernel (linhas x vetores de suporte)
+SCORE_CHUNK_ROWS = 1024
+
+
+def encode_frame(compiled: CompiledModel, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    numeric = X[compiled.numeric_features].to_numpy(dtype=np.float64)
+    categorical = X[compiled.categorical_features].astype(str).to_numpy()
+    return compiled.encode_rows(numeric, categorical)
+
+
+def feature_columns(compiled: CompiledModel) -> Dict[str, np.ndarray]:
+    """
+    Colunas da matriz codificada que pertencem a cada feature do modelo
+    """
+    columns = {feature: np.array([index]) for index, feature in enumerate(compiled.numeric_features)}
+    for feature in compiled.categorical_features:
+        columns[feature] = np.array(sorted(compiled.category_index[feature].values()))
+    return columns
+
+
+def norm_contributions(compiled: CompiledModel, encoded: np.ndarray, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Parcela de cada feature em ||z||²: o quadrado do valor escalado (numéricas)
+    ou 1 se a categoria é conhecida (one-hot)
+    """
+    scaled = (encoded[:, :compiled.n_numeric] - compiled.mean) / compiled.scale
+    contributions = {feature: scaled[:, index] ** 2 for index, feature in enumerate(compiled.numeric_features)}
+    for feature in compiled.categorical_features:
+        contributions[feature] = encoded[:, columns[feature]].sum(axis=1)
+    return contributions
+
+
+def accuracy(compiled: CompiledModel, encoded: np.ndarray, sq_norms: np.ndarray, y: np.ndarray) -> float:
+    correct = 0
+    for start in range(0, len(y), SCORE_CHUNK_ROWS):
+        stop = start + SCORE_CHUNK_ROWS
+        predictions, _ = compiled.predict_encoded(encoded[start:stop], sq_norms[start:stop])
+        correct += int((predictions == y[start:stop]).sum())
+    return correct / len(y)
+
+
+def permuted_accuracy(
+    compiled: CompiledModel,
+    encoded: np.ndarray,
+    sq_norms: np.ndarray,
+    y: np.ndarray,
+    columns: np.ndarray,
+    contribution: np.ndarray,
+    seed: int,
+) -> float:
+    """
+    Acurácia com as colunas de uma feature embaralhadas entre as linhas
+    """
+    permutation = np.random.default_rng(seed).permutation(len(y))
+    permuted = encoded.copy()
+    permuted[:, columns] = encoded[permutation[:, None], columns]
+    return accuracy(compiled, permuted, sq_norms - contribution + contribution[permutation], y)
+
+
+def permutation_importance(
+    compiled: CompiledModel,
+    X: pd.DataFrame,
+    y,
+    repeats: int = DEFAULT_REPEATS,
+    jobs: int = -1,
+    random_state: int = RANDOM_STATE,
+) -> dict:
+    """
+    Queda média de acurácia ao embaralhar cada feature, em valor absoluto e
+    em percentual da soma (o mesmo critério da célula do notebook)
+    """
+    started = time.perf_counter()
+    encoded, sq_norms = encode_frame(compiled, X)
+    y = np.asarray(y)
+    baseline = accuracy(compiled, encoded, sq_norms, y)
+
+    columns = feature_columns(compiled)
+    contributions = norm_contributions(compiled, encoded, columns)
+    features = list(columns)
+    seeds = np.random.SeedSequence(random_state).generate_state(len(features) * repeats)
+    scores = joblib.Parallel(n_jobs=jobs)(
+        joblib.delayed(permuted_accuracy)(
+            compiled, encoded, sq_norms, y, columns[feature], contributions[feature], int(seeds[index * repeats + repeat])
+        )
+        for index, feature in enumerate(features)
+        for repeat in range(repeats)
+    )
+    drops = baseline - np.array(scores).reshape(len(features), repeats)
+    means = drops.mean(axis=1)
+    total = means.sum()
+
+    importances = {
+        feature: {
+            "mean": float(mean),
+            "std": float(std),
+            "percent": round(float(mean / total * 100), 1) if total > 0 else 0.0,
+        }
+        for feature, mean, std in sorted(zip(features, means, drops.std(axis=1)), key=lambda item: -item[1])
+    }
+    return {
+        "method": "permutation",
+        "scoring": "accuracy",
+        "repeats": repeats,
+        "random_state": random_state,
+        "rows": int(len(y)),
+        "baseline_score": baseline,
+        "computed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seconds": time.perf_counter() - started,
+        "importances": importances,
+    }
+
+
+def load_holdout(data_path: Path, all_rows: bool = False) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Parte de teste da divisão usada no treinamento (ou o arquivo inteiro, se
+    ele já for um conjunto separado)
+    """
+    from sklearn.model_selection import train_test_split
+    from src.model.train import RANDOM_STATE as SPLIT_RANDOM_STATE, TEST_SIZE, prepare_dataset
+
+    X, y = prepare_dataset(pd.read_csv(data_path))
+    if all_rows:
+        return X, y
+    _, X_test, _, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=SPLIT_RANDOM_STATE)
+    return X_test, y_test
+
+
+def main():
+    from src.model.model import MODEL_PATH
+    from src.model.model_metadata import metadata_path, read_metadata, write_metadata
+    from src.model.prediction_cache import artifact_fingerprint
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", type=Path, required=True, help="CSV do Student Depression Dataset")
+    parser.add_argument("--model", type=Path, default=MODEL_PATH, help="pipeline .joblib avaliado")
+    parser.add_argument("--all-rows", action="store_true", help="usa o arquivo inteiro como conjunto separado")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--jobs", type=int, default=-1, help="processos (-1 = todos os núcleos)")
+    args = parser.parse_args()
+
+    compiled = CompiledModel.from_pipeline(joblib.load(args.model))
+    X, y = load_holdout(args.data, args.all_rows)
+    section = permutation_importance(compiled, X, y, repeats=args.repeats, jobs=args.jobs)
+    section["model_fingerprint"] = artifact_fingerprint(args.model)
+
+    path = metadata_path(args.model)
+    metadata = read_metadata(path)
+    metadata["feature_importance"] = section
+    write_metadata(path, metadata)
+
+    print(f"Acurácia sem permutação: {section['baseline_score']:.4f} ({section['rows']} linhas, {section['repeats']} repetições)")
+    for feature, values in section["importances"].items():
+        print(f"{feature:<40}{values['percent']:>7.1f}%  {values['mean']:.4f} ± {values['std']:.4f}")
+    print(f"Calculado em {section['seconds']:.1f} s; gravado em {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional
+
+# Importância das features baseada na análise real do modelo SVM não linear (Obtidas por script executado no notebook).
+# Usada quando os metadados do modelo não trazem a importância calculada para o artefato em uso
+# (ver src/model/feature_importance.py)
+FEATURE_IMPORTANCE = {
+    'Have you ever had suicidal thoughts ?': 48.5,
+    'Academic Pressure': 26.1,
+    'Financial Stress': 11.4,
+    'Age': 5.9,
+    'Work/Study Hours': 2.4,
+    'Dietary Habits': 2.4,
+    'Study Satisfaction': 2.3,
+    'Sleep Duration': 0.6,
+    'Gender': 0.4,
+    'Family History of Mental Illness': 0.1,
+    'CGPA': -0.1,
+}
+
+# Tabela declarativa do feedback de cada feature, na ordem da resposta.
+#
+# Cada regra descreve:
+# - field / model_feature: campo do usuário e coluna do modelo (para a importância)
+# - value_format: formatação do valor do usuário (como em format(valor, value_format))
+# - user_value: (antes, depois) do valor formatado no campo user_value
+# - message: (antes, depois) do valor formatado no início da mensagem
+# - buckets: como escolher a faixa do valor e o texto de cada faixa:
+#     "constant": uma única faixa
+#     "category": valor exato -> texto, com "default" para os demais valores
+#     "at_most": primeira faixa com valor <= limite, senão "default"
+#     "at_least": primeira faixa com valor >= limite, senão "default"
+# - domain: faixa de inteiros pré-computada em tabela de consulta direta
+# - context: texto de contexto; {importance} é preenchido na compilação
+FEEDBACK_RULES = [
+    {
+        'feature': 'Gênero',
+        'field': 'gender',
+        'model_feature': 'Gender',
+        'impact_level': 'BAIXO',
+        'value_format': '',
+        'user_value': ('', ''),
+        'message': ("Com base em sua resposta, o gênero '", "' "),
+        'buckets': {
+            'kind': 'constant',
+            'text': "tem impacto mínimo na predição de depressão. Estudos mostram pequenas diferenças entre gêneros, mas fatores individuais são mais determinantes.",
+        },
+        'context': "O gênero representa apenas {importance}% da importância no modelo, indicando que não é um fator determinante.",
+    },
+    {
+        'feature': 'Idade',
+        'field': 'age',
+        'model_feature': 'Age',
+        'impact_level': 'MODERADO',
+        'value_format': '',
+        'user_value': ('', ' anos'),
+        'message': ("Com base na sua idade de ", " anos, "),
+        'buckets': {
+            'kind': 'at_most',
+            'rules': [
+                (20, "você está em uma faixa etária onde episódios depressivos podem estar relacionados à adaptação universitária e independência. A idade tem um impacto moderado no modelo."),
+                (25, "você está em uma idade de transições importantes (formatura, primeiro emprego), que podem ser fatores de estresse significativos."),
+            ],
+            'default': "você está em uma faixa etária com maior estabilidade emocional, o que pode ser um fator protetor importante.",
+        },
+        'domain': (0, 120),
+        'context': "A idade tem importância moderada ({importance}%) no modelo, sendo o quarto fator mais relevante.",
+    },
+    {
+        'feature': 'Coeficiente de Rendimento (CR)',
+        'field': 'cgpa',
+        'model_feature': 'CGPA',
+        'impact_level': 'BAIXO',
+        'value_format': '.1f',
+        'user_value': ('', ''),
+        'message': ("Seu CR de ", " "),
+        'buckets': {
+            'kind': 'at_least',
+            'rules': [
+                (8.0, "indica excelente desempenho acadêmico, o que geralmente está associado a maior autoestima e senso de competência."),
+                (7.0, "mostra bom desempenho acadêmico, equilibrando expectativas e resultados adequadamente."),
+                (6.0, "sugere desempenho mediano, que pode gerar algumas preocupações mas não é necessariamente problemático."),
+            ],
+            'default': "pode estar gerando estresse acadêmico e impactando sua autoestima. Considere buscar apoio pedagógico.",
+        },
+        'context': "O CR tem baixa importância ({importance}%) no modelo, mas pode afetar autoestima e perspectivas futuras.",
+    },
+    {
+        'feature': 'Duração do Sono',
+        'field': 'sleep_duration',
+        'model_feature': 'Sleep Duration',
+        'impact_level': 'BAIXO',
+        'value_format': '',
+        'user_value': ('', ''),
+        'message': ("Sua duração de sono '", "' "),
+        'buckets': {
+            'kind': 'category',
+            'rules': [
+                ('Menos de 5 horas', "é insuficiente e pode estar impactando seu humor, concentração e bem-estar geral. Embora tenha baixo peso no modelo, é fundamental para saúde mental."),
+                ('5-6 horas', "está abaixo do recomendado para a maioria dos adultos. Pode estar afetando sua capacidade de lidar com estresse."),
+                ('7-8 horas', "está dentro da faixa ideal para a maioria dos adultos, contribuindo positivamente para sua saúde mental."),
+                ('Mais de 8 horas', "pode indicar boa recuperação, mas se for excessivo (>9h) pode sinalizar possível escape ou alterações do humor."),
+            ],
+            'default': "com padrões irregulares pode estar impactando sua regulação emocional e energia.",
+        },
+        'context': "A duração do sono tem baixa importância ({importance}%) no modelo, mas permanece crucial para bem-estar geral.",
+    },
+    {
+        'feature': 'Hábitos Alimentares',
+        'field': 'dietary_habits',
+        'model_feature': 'Dietary Habits',
+        'impact_level': 'BAIXO',
+        'value_format': '',
+        'user_value': ('', ''),
+        'message': ("Seus hábitos alimentares '", "' "),
+        'buckets': {
+            'kind': 'category',
+            'rules': [
+                ('Muito saudáveis', "são excelentes e contribuem positivamente para sua energia, humor e bem-estar geral. Embora tenham baixo peso no modelo, são importantes para qualidade de vida."),
+                ('Moderadamente saudáveis', "mostram boa consciência nutricional, com espaço para pequenos ajustes que podem melhorar seu bem-estar."),
+                ('Pouco saudáveis', "podem estar impactando sua energia e humor. Mudanças na alimentação podem ter benefícios para bem-estar geral."),
+            ],
+            'default': "podem estar afetando negativamente sua energia, concentração e estabilidade emocional.",
+        },
+        'context': "Os hábitos alimentares têm baixa importância ({importance}%) no modelo, mas contribuem para o bem-estar geral.",
+    },
+    {
+        'feature': 'Pensamentos Suicidas',
+        'field': 'suicidal_thoughts',
+        'model_feature': 'Have you ever had suicidal thoughts ?',
+        'impact_level': 'CRÍTICO',
+        'value_format': '',
+        'user_value': ('', ''),
+        'message': ("Sua resposta '", "' sobre pensamentos suicidas "),
+        'buckets': {
+            'kind': 'category',
+            'rules': [
+                ('Sim', "é o fator de MAIOR RISCO identificado pelo modelo, representando quase metade da importância total. É FUNDAMENTAL buscar ajuda profissional imediatamente. Existem tratamentos eficazes e você não está sozinho(a)."),
+            ],
+            'default': "é extremamente protetiva e representa o fator mais importante para reduzir o risco de depressão no modelo, com quase metade do peso total da predição.",
+        },
+        'context': "Esta é a feature MAIS IMPORTANTE ({importance}%) no modelo, representando quase metade de toda a predição. É o fator mais determinante.",
+    },
+    {
+        'feature': 'Horas de Estudo/Trabalho',
+        'field': 'work_study_hours',
+        'model_feature': 'Work/Study Hours',
+        'impact_level': 'BAIXO',
+        'value_format': '',
+        'user_value': ('', ' horas/dia'),
+        'message': ("Suas ", " horas de estudo/trabalho por dia "),
+        'buckets': {
+            'kind': 'at_most',
+            'rules': [
+                (4, "indicam carga leve, o que pode ser protetor contra sobrecarga. Embora tenha baixo peso no modelo, ainda influencia o bem-estar."),
+                (8, "representam uma carga equilibrada, adequada para a maioria das pessoas."),
+                (12, "indicam carga intensa que pode gerar estresse, mas ainda manejável com boa organização."),
+            ],
+            'default': "representam sobrecarga significativa que pode estar impactando seu bem-estar e eficiência.",
+        },
+        'domain': (0, 24),
+        'context': "As horas de estudo/trabalho têm baixa importância ({importance}%) no modelo, mas ainda podem afetar o bem-estar.",
+    },
+    {
+        'feature': 'Estresse Financeiro',
+        'field': 'financial_stress',
+        'model_feature': 'Financial Stress',
+        'impact_level': 'ALTO',
+        'value_format': '',
+        'user_value': ('', '/5'),
+        'message': ("Seu nível de estresse financeiro ", "/5 "),
+        'buckets': {
+            'kind': 'at_most',
+            'rules': [
+                (2, "é baixo, o que contribui positivamente para sua estabilidade emocional e foco nos estudos."),
+                (3, "é moderado, mas ainda manejável. Considere estratégias de planejamento financeiro."),
+            ],
+            'default': "é alto e pode estar impactando significativamente seu bem-estar e capacidade de concentração.",
+        },
+        'domain': (0, 10),
+        'context': "O estresse financeiro é o terceiro fator mais importante ({importance}%) no modelo - mudanças aqui têm impacto significativo.",
+    },
+    {
+        'feature': 'Histórico Familiar',
+        'field': 'family_history',
+        'model_feature': 'Family History of Mental Illness',
+        'impact_level': 'BAIXO',
+        'value_format': '',
+        'user_value': ('', ''),
+        'message': ("Seu histórico familiar '", "' "),
+        'buckets': {
+            'kind': 'category',
+            'rules': [
+                ('Sim', "indica predisposição genética, mas não determina seu destino. Estar ciente pode ajudar na prevenção e cuidado preventivo."),
+            ],
+            'default': "não indica predisposição familiar conhecida, o que pode ser um fator protetor.",
+        },
+        'context': "O histórico familiar tem baixa importância ({importance}%) no modelo.",
+    },
+    {
+        'feature': 'Satisfação com Estudos',
+        'field': 'study_satisfaction',
+        'model_feature': 'Study Satisfaction',
+        'impact_level': 'BAIXO',
+        'value_format': '',
+        'user_value': ('', '/5'),
+        'message': ("Sua satisfação com os estudos de ", "/5 "),
+        'buckets': {
+            'kind': 'at_least',
+            'rules': [
+                (4, "é alta, indicando boa realização pessoal com suas atividades atuais. Embora tenha baixo peso no modelo, é um fator protetor importante para qualidade de vida."),
+                (3, "é moderada, mostrando alguma satisfação mas com espaço para melhorias na qualidade de vida."),
+                (2, "é baixa e pode estar contribuindo para sentimentos de desmotivação e insatisfação geral."),
+            ],
+            'default': "é muito baixa, indicando possível necessidade de mudanças significativas em suas atividades ou perspectivas.",
+        },
+        'domain': (0, 10),
+        'context': "A satisfação com os estudos tem baixa importância ({importance}%) no modelo, mas é relevante para qualidade de vida geral.",
+    },
+    {
+        'feature': 'Pressão Acadêmica',
+        'field': 'academic_pressure',
+        'model_feature': 'Academic Pressure',
+        'impact_level': 'MUITO ALTO',
+        'value_format': '',
+        'user_value': ('', '/5'),
+        'message': ("Sua pressão acadêmica de ", "/5 "),
+        'buckets': {
+            'kind': 'at_most',
+            'rules': [
+                (1, "é muito baixa, o que é extremamente protetor contra desenvolvimento de sintomas depressivos."),
+                (2, "é baixa, o que é altamente protetor contra desenvolvimento de sintomas depressivos."),
+                (3, "é moderada e ainda manejável, mas requer atenção para não aumentar, dado seu alto peso no modelo."),
+                (4, "é alta e representa um fator de risco MUITO SIGNIFICATIVO. É importante desenvolver estratégias de manejo de estresse urgentemente."),
+            ],
+            'default': "é extremamente alta e representa o SEGUNDO MAIOR FATOR DE RISCO no modelo. É CRUCIAL buscar formas de reduzir essa pressão imediatamente.",
+        },
+        'domain': (0, 10),
+        'context': "A pressão acadêmica é o SEGUNDO FATOR MAIS IMPORTANTE ({importance}%) no modelo de predição, com peso muito significativo.",
+    },
+]
+
+
+class CompiledFeedbackRule:
+    """
+    Regra de feedback pronta para uso: textos de cada faixa já renderizados
+    e a escolha da faixa reduzida a uma consulta em dicionário (ou bisect
+    fora do domínio pré-computado).
+    """
+
+    def __init__(self, rule: Dict[str, Any], importance: float):
+        self.feature = rule['feature']
+        self.field = rule['field']
+        self.impact_level = rule['impact_level']
+        self.importance = importance
+        self.value_format = rule['value_format']
+        self.user_value_head, self.user_value_tail = rule['user_value']
+        self.message_head = rule['message'][0]
+        self.context = rule['context'].format(importance=importance)
+
+        buckets = rule['buckets']
+        self.kind = buckets['kind']
+        message_tail = rule['message'][1]
+        self.lookup: Dict[Any, str] = {}
+        self.thresholds: List[Any] = []
+
+        if self.kind == 'constant':
+            self.default = message_tail + buckets['text']
+            return
+
+        self.default = message_tail + buckets['default']
+        if self.kind == 'category':
+            self.lookup = {value: message_tail + text for value, text in buckets['rules']}
+            return
+
+        # Faixas numéricas, ordenadas de forma crescente pelo limite
+        ordered = sorted(buckets['rules'], key=lambda r: r[0])
+        self.thresholds = [limit for limit, _ in ordered]
+        if self.kind == 'at_most':
+            self.texts = [message_tail + text for _, text in ordered] + [self.default]
+        elif self.kind == 'at_least':
+            self.texts = [self.default] + [message_tail + text for _, text in ordered]
+        else:
+            raise ValueError(f"Tipo de faixa desconhecido: {self.kind}")
+
+        if 'domain' in rule:
+            low, high = rule['domain']
+            self.lookup = {value: self._bucket_text(value) for value in range(low, high + 1)}
+
+    def _bucket_text(self, value) -> str:
+        if value != value:
+            # NaN não satisfaz nenhuma comparação
+            return self.default
+        if self.kind == 'at_most':
+            return self.texts[bisect_left(self.thresholds, value)]
+        return self.texts[bisect_right(self.thresholds, value)]
+
+    def bucket_text(self, value) -> str:
+        text = self.lookup.get(value)
+        if text is not None:
+            return text
+        if self.kind in ('constant', 'category'):
+            return self.default
+        return self._bucket_text(value)
+
+    def render(self, value) -> Dict[str, Any]:
+        formatted = format(value, self.value_format)
+        return {
+            'feature': self.feature,
+            'user_value': self.user_value_head + formatted + self.user_value_tail,
+            'importance': self.importance,
+            'impact_level': self.impact_level,
+            'message': self.message_head + formatted + self.bucket_text(value),
+            'context': self.context,
+        }
+
+
+def compile_feedback_rules(rules: List[Dict[str, Any]], importance: Dict[str, float]) -> List[CompiledFeedbackRule]:
+    return [CompiledFeedbackRule(rule, importance[rule['model_feature']]) for rule in rules]
+
+
+_compiled_rules = compile_feedback_rules(FEEDBACK_RULES, FEATURE_IMPORTANCE)
+
+
+def install_feature_importance(importance: Dict[str, float]):
+    """
+    Recompila as regras de feedback com outra importância por coluna do
+    modelo (ex.: a dos metadados do artefato carregado)
+    """
+    global _compiled_rules
+    missing = [rule['model_feature'] for rule in FEEDBACK_RULES if rule['model_feature'] not in importance]
+    if missing:
+        raise ValueError(f"Importância ausente para: {missing}")
+    _compiled_rules = compile_feedback_rules(FEEDBACK_RULES, importance)
+
+
+def generate_feature_feedback(user_data: dict, rules: Optional[List[CompiledFeedbackRule]] = None) -> List[Dict[str, Any]]:
+    """
+    Gera feedback detalhado para cada feature baseado na resposta do usuário
+    """
+    return [rule.render(user_data[rule.field]) for rule in rules or _compiled_rules]
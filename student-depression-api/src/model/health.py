@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+from src.model import model as model_module
+
+router = APIRouter()
+
+
+@router.get("/ready")
+async def readiness():
+    """
+    Prontidão para receber tráfego: só responde 200 depois que o modelo foi
+    carregado e aquecido. A raiz / continua sendo a verificação de vida (liveness).
+    """
+    ready = model_module.is_ready()
+    return ORJSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", **model_module.startup_state},
+    )
@@ -0,0 +1,131 @@
+"""
+Pontuação incremental para a sessão ao vivo (WebSocket) do questionário.
+
+A distância de uma entrada a cada vetor de suporte, no espaço escalado, é a
+soma das parcelas de cada feature:
+
+    ||z - sv||² = Σ_f d_f(z_f, sv)
+
+A sessão guarda as onze parcelas e a soma. Uma resposta nova só troca a
+parcela da sua feature (O(vetores de suporte)), e a estimativa sai do kernel
+sobre a soma, sem codificar a entrada inteira de novo.
+
+Features ainda sem resposta são imputadas com estatísticas do treinamento
+guardadas no próprio modelo: a média do StandardScaler para as numéricas e,
+para as categóricas, a mistura uniforme das categorias vistas pelo
+OneHotEncoder (o artefato não guarda a frequência de cada categoria).
+"""
+from typing import Any, Dict, List, Tuple
+import numpy as np
+from pydantic import TypeAdapter, ValidationError
+from src.model.compiled_model import REQUEST_FIELDS, CompiledModel
+from src.model.prediction_request import PredictionRequest
+
+# Campo do PredictionRequest -> coluna do modelo
+MODEL_COLUMNS = {field: column for column, field in REQUEST_FIELDS.items()}
+
+# Validação de uma resposta isolada, com as mesmas regras do PredictionRequest
+FIELD_ADAPTERS = {
+    name: TypeAdapter(field.annotation, config=PredictionRequest.model_config)
+    for name, field in PredictionRequest.model_fields.items()
+}
+
+
+def validate_answer(field: str, value: Any) -> Any:
+    if field not in FIELD_ADAPTERS:
+        raise ValueError(f"Campo desconhecido: {field}")
+    try:
+        return FIELD_ADAPTERS[field].validate_python(value)
+    except ValidationError as e:
+        raise ValueError(f"{field}: {e.errors(include_url=False)[0]['msg']}") from None
+
+
+class IncrementalModel:
+    """
+    Parcelas de ||z - sv||² por feature, extraídas uma vez do CompiledModel
+    """
+
+    def __init__(self, compiled: CompiledModel):
+        self.compiled = compiled
+        support = compiled.folded_support_vectors
+        n_numeric = compiled.n_numeric
+        # Parte numérica dos vetores de suporte de volta ao espaço escalado (n_numéricas, n_vetores)
+        self.numeric_support = support[:n_numeric] * compiled.scale[:, None]
+        self.numeric_position = {feature: index for index, feature in enumerate(compiled.numeric_features)}
+        # ||sv||² do bloco one-hot de cada categórica
+        self.block_sq_norms = {
+            feature: (support[list(compiled.category_index[feature].values())] ** 2).sum(axis=0)
+            for feature in compiled.categorical_features
+        }
+        self.features = [*compiled.numeric_features, *compiled.categorical_features]
+
+    def contribution(self, feature: str, value) -> np.ndarray:
+        """
+        Parcela da feature em ||z - sv||² para a resposta value
+        """
+        compiled = self.compiled
+        if feature in self.numeric_position:
+            index = self.numeric_position[feature]
+            scaled = (float(value) - compiled.mean[index]) / compiled.scale[index]
+            return (scaled - self.numeric_support[index]) ** 2
+        column = compiled.category_index[feature].get(value)
+        if column is None:
+            # Categoria desconhecida fica zerada, como no OneHotEncoder(handle_unknown='ignore')
+            return self.block_sq_norms[feature].copy()
+        return self.block_sq_norms[feature] - 2.0 * compiled.folded_support_vectors[column] + 1.0
+
+    def imputed(self, feature: str) -> np.ndarray:
+        """
+        Parcela da feature sem resposta: a média do treinamento (numéricas) ou
+        a mistura uniforme das categorias (categóricas)
+        """
+        if feature in self.numeric_position:
+            return self.numeric_support[self.numeric_position[feature]] ** 2
+        columns = list(self.compiled.category_index[feature].values())
+        share = 1.0 / len(columns)
+        return self.block_sq_norms[feature] - 2.0 * share * self.compiled.folded_support_vectors[columns].sum(axis=0) + share
+
+    def outputs(self, distances: np.ndarray) -> Tuple[int, np.ndarray]:
+        """
+        (predição, probabilidades) a partir das distâncias a cada vetor de suporte
+        """
+        compiled = self.compiled
+        decision = np.exp(-compiled.gamma * distances) @ compiled.dual_coef + compiled.intercept
+        predictions, probabilities = compiled.outputs(np.array([decision]))
+        return predictions[0], probabilities[0]
+
+
+class IncrementalSession:
+    """
+    Estado parcial de um questionário em andamento
+    """
+
+    def __init__(self, model: IncrementalModel):
+        self.model = model
+        self.answers: Dict[str, Any] = {}
+        self.contributions = {feature: model.imputed(feature) for feature in model.features}
+        self.distances = np.sum(list(self.contributions.values()), axis=0)
+
+    def answer(self, field: str, value: Any):
+        """
+        Registra (ou troca) a resposta de um campo, atualizando só a sua parcela
+        """
+        value = validate_answer(field, value)
+        feature = MODEL_COLUMNS[field]
+        contribution = self.model.contribution(feature, value)
+        self.distances += contribution - self.contributions[feature]
+        self.contributions[feature] = contribution
+        self.answers[field] = value
+
+    @property
+    def missing(self) -> List[str]:
+        return [field for field in PredictionRequest.model_fields if field not in self.answers]
+
+    def estimate(self) -> Tuple[int, np.ndarray]:
+        return self.model.outputs(self.distances)
+
+    def request(self) -> PredictionRequest:
+        """
+        PredictionRequest com todas as respostas (só quando não falta nenhuma)
+        """
+        return PredictionRequest.model_validate(self.answers)
@@ -0,0 +1,128 @@
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from src.model import profiling
+from src.model.metrics import observe_stage
+
+# Número de threads dedicadas à inferência e quantas requisições podem esperar na fila
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "2"))
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", "64"))
+# Valor (em segundos) enviado no header Retry-After quando a fila está cheia
+INFERENCE_RETRY_AFTER = int(os.getenv("INFERENCE_RETRY_AFTER", "1"))
+
+
+class ExecutorSaturatedError(Exception):
+    """Fila de inferência cheia; a requisição deve ser rejeitada com 503."""
+
+
+class InferenceExecutor:
+    """
+    Pool de threads de tamanho fixo com fila limitada para rodar a inferência
+    fora do event loop. Quando há mais de max_workers + max_queue_size
+    requisições pendentes, novas chamadas falham imediatamente com
+    ExecutorSaturatedError em vez de aumentar a latência sem limite.
+    """
+
+    def __init__(self, max_workers: int = INFERENCE_WORKERS, max_queue_size: int = INFERENCE_QUEUE_SIZE):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._started = 0
+        self._completed = 0
+        self._cancelled = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._wait_last = 0.0
+
+    async def run(self, fn: Callable, *args) -> Any:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue_size:
+                self._rejected += 1
+                raise ExecutorSaturatedError(
+                    f"Fila de inferência cheia ({self._pending} requisições pendentes)"
+                )
+            self._pending += 1
+
+        submitted = time.perf_counter()
+        session = profiling.active_session()
+        # Leva o contexto da requisição (Server-Timing, perfil) para a thread de inferência
+        context = contextvars.copy_context()
+
+        def task():
+            wait = time.perf_counter() - submitted
+            with self._lock:
+                self._running += 1
+                self._started += 1
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+                self._wait_last = wait
+            observe_stage("queue_wait", wait)
+            try:
+                if session is not None:
+                    return session.run(fn, *args)
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        # A vaga só é liberada quando o trabalho termina (ou sai da fila sem
+        # rodar), e não quando quem aguarda é cancelado: a thread continua
+        # ocupada até a função retornar
+        future = self._pool.submit(context.run, task)
+        abandoned = False
+        counted_completed = False
+
+        def release(done):
+            nonlocal counted_completed
+            with self._lock:
+                self._pending -= 1
+                if done.cancelled() or abandoned:
+                    self._cancelled += 1
+                else:
+                    self._completed += 1
+                    counted_completed = True
+
+        future.add_done_callback(release)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            with self._lock:
+                abandoned = True
+                if counted_completed:
+                    # A função terminou, mas quem aguardava foi cancelado antes de receber o resultado
+                    self._completed -= 1
+                    self._cancelled += 1
+            raise
+
+    @property
+    def queue_depth(self) -> int:
+        with self._lock:
+            return self._pending - self._running
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "queue_depth": self._pending - self._running,
+                "in_flight": self._running,
+                "started": self._started,
+                "completed": self._completed,
+                "cancelled": self._cancelled,
+                "rejected": self._rejected,
+                # Média sobre todas as chamadas que chegaram a rodar, inclusive as canceladas
+                "wait_ms_avg": (self._wait_total / self._started * 1000) if self._started else 0.0,
+                "wait_ms_max": self._wait_max * 1000,
+                "wait_ms_last": self._wait_last * 1000,
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
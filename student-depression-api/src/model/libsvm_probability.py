@@ -0,0 +1,68 @@
+from typing import Tuple
+import numpy as np
+
+# Constantes do libsvm usadas pelo SVC(probability=True) do scikit-learn
+LIBSVM_MIN_PROB = 1e-7
+LIBSVM_MAX_ITER = 100
+
+
+def platt_pairwise_probability(decision: np.ndarray, prob_a: float, prob_b: float) -> np.ndarray:
+    """
+    Probabilidade (Platt) da classe classes_[0] a partir do decision_function,
+    com o mesmo recorte em [1e-7, 1 - 1e-7] feito pelo libsvm
+    """
+    # O decision_function do sklearn tem o sinal invertido em relação ao libsvm
+    fApB = -decision * prob_a + prob_b
+    with np.errstate(over='ignore'):
+        r = np.where(
+            fApB >= 0,
+            np.exp(-fApB) / (1.0 + np.exp(-fApB)),
+            1.0 / (1.0 + np.exp(fApB)),
+        )
+    return np.clip(r, LIBSVM_MIN_PROB, 1 - LIBSVM_MIN_PROB)
+
+
+def couple_binary_probabilities(r: np.ndarray) -> np.ndarray:
+    """
+    Replica vetorizada do multiclass_probability do libsvm para duas classes.
+
+    O libsvm embutido no scikit-learn resolve o acoplamento par-a-par de forma
+    iterativa mesmo com duas classes, então o resultado difere de [r, 1 - r]
+    em até ~0.005. Repetimos as mesmas iterações para obter paridade exata
+    com model.predict_proba.
+    """
+    k = 2
+    eps = 0.005 / k
+    q00 = (1 - r) ** 2
+    q11 = r ** 2
+    q01 = -r * (1 - r)
+    Q = np.stack([np.stack([q00, q01], axis=1), np.stack([q01, q11], axis=1)], axis=1)
+
+    p = np.full((len(r), k), 1.0 / k)
+    active = np.ones(len(r), dtype=bool)
+    for _ in range(LIBSVM_MAX_ITER):
+        Qp = np.einsum('nij,nj->ni', Q, p)
+        pQp = (p * Qp).sum(axis=1)
+        active &= np.abs(Qp - pQp[:, None]).max(axis=1) >= eps
+        if not active.any():
+            break
+        for t in range(k):
+            diff = np.where(active, (-Qp[:, t] + pQp) / Q[:, t, t], 0.0)
+            p[:, t] += diff
+            pQp = (pQp + diff * (diff * Q[:, t, t] + 2 * Qp[:, t])) / (1 + diff) / (1 + diff)
+            Qp = (Qp + diff[:, None] * Q[:, t, :]) / (1 + diff)[:, None]
+            p /= (1 + diff)[:, None]
+    return p
+
+
+def svc_outputs(decision: np.ndarray, classes: np.ndarray, prob_a: float, prob_b: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rótulos e probabilidades de um SVC binário a partir do decision_function.
+
+    O rótulo segue o sinal da margem, exatamente como SVC.predict, e não o
+    argmax das probabilidades de Platt (as duas coisas podem discordar perto
+    da fronteira de decisão, comportamento documentado do scikit-learn).
+    """
+    labels = classes[(decision >= 0).astype(int)]
+    probabilities = couple_binary_probabilities(platt_pairwise_probability(decision, prob_a, prob_b))
+    return labels, probabilities
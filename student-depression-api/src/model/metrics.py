@@ -0,0 +1,266 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from fastapi import APIRouter, Response
+from src.model import server_timing
+
+router = APIRouter()
+
+# Instrumentação do caminho de predição, exposta em /metrics no formato texto do Prometheus
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Limites superiores (em segundos) dos buckets; as etapas ficam na casa dos microssegundos
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Etapas cronometradas em /model/predict, na ordem em que acontecem
+PREDICTION_STAGES = (
+    "parse",        # validação do corpo (model_validate_json)
+    "queue_wait",   # espera por uma thread de inferência
+    "model_input",  # codificação da entrada (CompiledModel) ou DataFrame (pipeline)
+    "model",        # kernel RBF + calibração (ou predict/predict_proba do pipeline)
+    "user_data",    # dicionário usado pelo feedback
+    "feedback",     # generate_feature_feedback
+    "response",     # construção do PredictionResponse
+    "serialize",    # codificação JSON da resposta
+)
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{escape_label(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Contador monotônico com labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+
+
+class Histogram:
+    """
+    Histograma de buckets fixos. Cada observação custa um bisect e um lock,
+    o que permite deixá-lo ligado em produção.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [contagem por bucket (não cumulativa) + overflow, soma]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[0]) if series else 0
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + format_value(bound) + '"'
+                yield f"{self.name}_bucket{format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{format_labels(self.labelnames, labels)} {format_value(total)}"
+            yield f"{self.name}_count{format_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Gauge:
+    """Valor lido na hora da coleta, a partir de uma função."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], Optional[float]]):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def samples(self) -> Iterable[str]:
+        value = self.read()
+        if value is not None:
+            yield f"{self.name} {format_value(value)}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: str, documentation: str, read: Callable[[], Optional[float]]) -> Gauge:
+        return self.register(Gauge(name, documentation, read))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Duração das requisições HTTP por rota", ("route", "method")
+)
+REQUESTS = registry.counter(
+    "http_requests_total", "Requisições HTTP por rota e status", ("route", "method", "status")
+)
+STAGE_DURATION = registry.histogram(
+    "prediction_stage_duration_seconds", "Duração de cada etapa do caminho de predição", ("stage",)
+)
+PREDICTION_ERRORS = registry.counter(
+    "prediction_errors_total", "Erros de predição por rota e tipo de exceção", ("route", "exception")
+)
+MODEL_NOT_LOADED = registry.counter(
+    "model_not_loaded_total", "Requisições recusadas porque o modelo não estava carregado", ("route",)
+)
+
+
+class stage:
+    """
+    Cronometra uma etapa da predição:
+
+        with stage("feedback"):
+            ...
+    """
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe_stage(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def observe_stage(name: str, seconds: float):
+    if METRICS_ENABLED:
+        STAGE_DURATION.observe(seconds, name)
+    if server_timing.SERVER_TIMING_ENABLED:
+        server_timing.record(name, seconds)
+
+
+def record_error(route: str, error: BaseException):
+    if METRICS_ENABLED:
+        PREDICTION_ERRORS.inc(route, type(error).__name__)
+
+
+def record_model_not_loaded(route: str):
+    if METRICS_ENABLED:
+        MODEL_NOT_LOADED.inc(route)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede duração e status de cada requisição, agrupando
+    pelo template da rota (ex.: /model/predict) para não explodir a
+    cardinalidade com caminhos desconhecidos.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            record_error(route_template(scope), e)
+            raise
+        finally:
+            route = route_template(scope)
+            REQUEST_DURATION.observe(time.perf_counter() - started, route, scope["method"])
+            REQUESTS.inc(route, scope["method"], str(status))
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+@router.get("")
+async def get_metrics():
+    """Métricas no formato texto do Prometheus"""
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,137 @@
+import asyncio
+import copy
+import os
+from typing import Any, Callable, Dict, List
+from src.model import server_timing
+from src.model.inference_executor import InferenceExecutor
+
+# Agrupa chamadas concorrentes de /model/predict em uma única chamada vetorizada
+MICRO_BATCH_ENABLED = os.getenv("MICRO_BATCH_ENABLED", "true").lower() == "true"
+# Tempo máximo que a primeira requisição do lote espera por companhia (ms)
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "2"))
+# Tamanho máximo do lote; ao atingir, o lote é disparado na hora
+MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", "64"))
+
+# Limites superiores dos buckets do histograma de tamanho de lote
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+def own_exception(error: Exception) -> Exception:
+    """
+    Cópia da exceção para uma única requisição, com a original em __cause__.
+    Compartilhar a mesma instância entre os futures faria cada await acrescentar
+    frames ao mesmo __traceback__; a cópia mantém o tipo, para os handlers
+    (ex.: ExecutorSaturatedError -> 503) continuarem valendo.
+    """
+    try:
+        own = copy.copy(error)
+    except Exception:
+        own = RuntimeError(str(error))
+    own.__cause__ = error
+    own.__traceback__ = None
+    return own
+
+
+class MicroBatcher:
+    """
+    Junta requisições individuais que chegam quase ao mesmo tempo.
+
+    A primeira requisição de um lote abre uma janela de max_wait_ms; tudo que
+    chegar nesse intervalo (até max_batch_size itens) é pontuado com uma única
+    chamada de score_fn no executor de inferência, e cada resultado volta para
+    a requisição que o pediu. score_fn recebe a lista de itens e devolve, na
+    mesma ordem, o resultado ou a exceção de cada item.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[List[Any]], List[Any]],
+        executor: InferenceExecutor,
+        max_wait_ms: float = MICRO_BATCH_MAX_WAIT_MS,
+        max_batch_size: int = MICRO_BATCH_MAX_SIZE,
+    ):
+        self.score_fn = score_fn
+        self.executor = executor
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+        self._batches = 0
+        self._items = 0
+        self._max_size = 0
+        self._flushes = {"size": 0, "timeout": 0}
+        self._histogram = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS}
+        self._histogram_overflow = 0
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, server_timing.current()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush("size")
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush, "timeout")
+
+        return await future
+
+    def _flush(self, reason: str):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self._record(len(batch), reason)
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list):
+        # As etapas do lote valem para todas as requisições que estão nele
+        batch_timings = server_timing.begin()
+        try:
+            outcomes = await self.executor.run(self.score_fn, [item for item, _, _ in batch])
+        except Exception as e:
+            outcomes = [own_exception(e) for _ in batch]
+
+        for (_, future, timings), outcome in zip(batch, outcomes):
+            if timings is not None and batch_timings is not None:
+                timings.merge(batch_timings)
+            if future.done():
+                continue
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def _record(self, size: int, reason: str):
+        self._batches += 1
+        self._items += size
+        self._max_size = max(self._max_size, size)
+        self._flushes[reason] += 1
+        for bucket in BATCH_SIZE_BUCKETS:
+            if size <= bucket:
+                self._histogram[bucket] += 1
+                break
+        else:
+            self._histogram_overflow += 1
+
+    def stats(self) -> Dict[str, Any]:
+        histogram = {f"le_{bucket}": count for bucket, count in self._histogram.items()}
+        histogram["le_inf"] = self._histogram_overflow
+        return {
+            "enabled": MICRO_BATCH_ENABLED,
+            "max_wait_ms": self.max_wait_ms,
+            "max_batch_size": self.max_batch_size,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": self._items / self._batches if self._batches else 0.0,
+            "max_observed_batch_size": self._max_size,
+            "flushes_by_size": self._flushes["size"],
+            "flushes_by_timeout": self._flushes["timeout"],
+            "batch_size_histogram": histogram,
+        }
@@ -1,30 +1,73 @@
-import joblib
+import csv
+import logging
+import math
+import os
+import time
 from pathlib import Path
-from fastapi import APIRouter, HTTPException
-import pandas as pd
+import orjson
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
 from src.model.prediction_request import PredictionRequest
-from src.model.prediction_response import PredictionResponse
-from typing import List, Dict, Any
+from src.model.prediction_response import ExplainedPredictionResponse, PredictionResponse
+from src.model.batch_prediction_response import BatchPredictionItem, BatchPredictionResponse
+from src.model.what_if_request import WhatIfRequest
+from src.model.what_if_response import WhatIfChange, WhatIfResponse, WhatIfScenario
+from src.model import scoring
+from src.model.feedback import FEATURE_IMPORTANCE, generate_feature_feedback, install_feature_importance
+from src.model.compiled_model import CompiledModel
+from src.model.backends import SCORING_BACKENDS, CascadeBackend, InferenceBackend, NumpyBackend, OnnxBackend, SklearnBackend, build_model_input
+from src.model import cascade
+from src.model.cascade import Surrogate, surrogate_path
+from src.model.explanations import local_contributions, perturbed_requests, reference_values
+from src.model.what_if import MODIFIABLE_FEATURES, best_changes, candidate_values, score_grid
+from src.model.questions import questions_store
+from src.model.incremental import IncrementalModel, IncrementalSession
+from src.model.model_export import load_compiled_model, read_export_metadata
+from src.model.model_metadata import feature_importance_for, metadata_path, read_metadata
+from src.model.inference_executor import INFERENCE_RETRY_AFTER, ExecutorSaturatedError, InferenceExecutor
+from src.model import micro_batcher as batching
+from src.model.micro_batcher import MicroBatcher
+from src.model import prediction_cache as caching
+from src.model.prediction_cache import PredictionCache, artifact_fingerprint, request_cache_key
+from src.model import metrics
+from src.model import profiling
+from src.model import server_timing
+from src.model.metrics import record_error, record_model_not_loaded, stage
+from src.model.streaming import (
+    NDJSON_MEDIA_TYPE,
+    STREAM_CHUNK_SIZE,
+    STREAM_MAX_LINE_BYTES,
+    LineReader,
+    LineTooLong,
+    UploadStreamingResponse,
+    parse_csv_line,
+    upload_format,
+)
+from typing import List, Dict, Any, Optional, Union
+
 router = APIRouter()
 
 
 RESOURCES_PATH = Path(__file__).parent.parent / "resources"
-MODEL_PATH = RESOURCES_PATH / "student-depression-svm.joblib"
-
-# Importância das features baseada na análise real do modelo SVM não linear (Obtidas por script executado no notebook)
-FEATURE_IMPORTANCE = {
-    'Have you ever had suicidal thoughts ?': 48.5,
-    'Academic Pressure': 26.1,
-    'Financial Stress': 11.4,
-    'Age': 5.9,
-    'Work/Study Hours': 2.4,
-    'Dietary Habits': 2.4,
-    'Study Satisfaction': 2.3,
-    'Sleep Duration': 0.6,
-    'Gender': 0.4,
-    'Family History of Mental Illness': 0.1,
-    'CGPA': -0.1,
-}
+# SVC exato ou modelo aproximado (python -m src.model.train --approximate N)
+MODEL_PATH = Path(os.getenv("MODEL_PATH", str(RESOURCES_PATH / "student-depression-svm.joblib")))
+# Artefato de serving (arrays .npy mapeados em memória), gerado com python -m src.model.model_export
+MODEL_EXPORT_PATH = Path(os.getenv("MODEL_EXPORT_PATH", str(RESOURCES_PATH / "student-depression-svm")))
+# Pipeline exportado para ONNX (python -m src.model.onnx_export), usado com SCORING_MODE=onnx
+MODEL_ONNX_PATH = Path(os.getenv("MODEL_ONNX_PATH", str(RESOURCES_PATH / "student-depression-svm.onnx")))
+# Substituto da pontuação em cascata (python -m src.model.distillation), usado com SCORING_MODE=cascade
+MODEL_SURROGATE_PATH = Path(os.getenv("MODEL_SURROGATE_PATH", str(surrogate_path(MODEL_PATH))))
+# "joblib" carrega o pipeline completo; "mmap" carrega só o artefato de serving
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "joblib")
+# Precisão dos arrays do kernel em uso ("float64" ou "float32", ver src/model/precision.py).
+# Vazio mantém a do artefato (o .joblib é float64). Com MODEL_FORMAT=mmap, converter
+# gera uma cópia privada: exporte o artefato já na precisão desejada
+MODEL_PRECISION = os.getenv("MODEL_PRECISION", "")
+# Metadados do modelo (importância das features calculada por src/model/feature_importance.py)
+MODEL_METADATA_PATH = Path(os.getenv("MODEL_METADATA_PATH", str(metadata_path(MODEL_PATH))))
+# Carrega o modelo já no import do módulo, antes do fork dos workers (gunicorn --preload)
+MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "false").lower() == "true"
 
 # Mapeamento para português
 FEATURE_MAPPING = {
@@ -41,287 +84,851 @@ FEATURE_MAPPING = {
     'Academic Pressure': 'Academic Total'
 }
 
-def generate_feature_feedback(user_data: dict) -> List[Dict[str, Any]]:
-    """
-    Gera feedback detalhado para cada feature baseado na resposta do usuário
-    """
-    feedback_list = []
-    
-    # 1. Gênero
-    feedback_list.append({
-        'feature': 'Gênero',
-        'user_value': user_data['gender'],
-        'importance': FEATURE_IMPORTANCE['Gender'],
-        'impact_level': 'BAIXO',
-        'message': f"Com base em sua resposta, o gênero '{user_data['gender']}' tem impacto mínimo na predição de depressão. Estudos mostram pequenas diferenças entre gêneros, mas fatores individuais são mais determinantes.",
-        'context': f"O gênero representa apenas {FEATURE_IMPORTANCE['Gender']}% da importância no modelo, indicando que não é um fator determinante."
-    })
-    
-    # 2. Idade - MODERADO (5.9%)
-    age_feedback = f"Com base na sua idade de {user_data['age']} anos, "
-    if user_data['age'] <= 20:
-        age_feedback += "você está em uma faixa etária onde episódios depressivos podem estar relacionados à adaptação universitária e independência. A idade tem um impacto moderado no modelo."
-    elif user_data['age'] <= 25:
-        age_feedback += "você está em uma idade de transições importantes (formatura, primeiro emprego), que podem ser fatores de estresse significativos."
-    else:
-        age_feedback += "você está em uma faixa etária com maior estabilidade emocional, o que pode ser um fator protetor importante."
-    
-    feedback_list.append({
-        'feature': 'Idade',
-        'user_value': f"{user_data['age']} anos",
-        'importance': FEATURE_IMPORTANCE['Age'],
-        'impact_level': 'MODERADO',
-        'message': age_feedback,
-        'context': f"A idade tem importância moderada ({FEATURE_IMPORTANCE['Age']}%) no modelo, sendo o quarto fator mais relevante."
-    })
-    
-    # 4. Coeficiente de Rendimento (CR)
-    cgpa_feedback = f"Seu CR de {user_data['cgpa']:.1f} "
-    if user_data['cgpa'] >= 8.0:
-        cgpa_feedback += "indica excelente desempenho acadêmico, o que geralmente está associado a maior autoestima e senso de competência."
-    elif user_data['cgpa'] >= 7.0:
-        cgpa_feedback += "mostra bom desempenho acadêmico, equilibrando expectativas e resultados adequadamente."
-    elif user_data['cgpa'] >= 6.0:
-        cgpa_feedback += "sugere desempenho mediano, que pode gerar algumas preocupações mas não é necessariamente problemático."
-    else:
-        cgpa_feedback += "pode estar gerando estresse acadêmico e impactando sua autoestima. Considere buscar apoio pedagógico."
-    
-    feedback_list.append({
-        'feature': 'Coeficiente de Rendimento (CR)',
-        'user_value': f"{user_data['cgpa']:.1f}",
-        'importance': FEATURE_IMPORTANCE['CGPA'],
-        'impact_level': 'BAIXO',
-        'message': cgpa_feedback,
-        'context': f"O CR tem baixa importância ({FEATURE_IMPORTANCE['CGPA']}%) no modelo, mas pode afetar autoestima e perspectivas futuras."
-    })
-    
-    # 5. Duração do Sono - BAIXO (0.6%)
-    sleep_feedback = f"Sua duração de sono '{user_data['sleep_duration']}' "
-    if user_data['sleep_duration'] == 'Menos de 5 horas':
-        sleep_feedback += "é insuficiente e pode estar impactando seu humor, concentração e bem-estar geral. Embora tenha baixo peso no modelo, é fundamental para saúde mental."
-    elif user_data['sleep_duration'] == '5-6 horas':
-        sleep_feedback += "está abaixo do recomendado para a maioria dos adultos. Pode estar afetando sua capacidade de lidar com estresse."
-    elif user_data['sleep_duration'] == '7-8 horas':
-        sleep_feedback += "está dentro da faixa ideal para a maioria dos adultos, contribuindo positivamente para sua saúde mental."
-    elif user_data['sleep_duration'] == 'Mais de 8 horas':
-        sleep_feedback += "pode indicar boa recuperação, mas se for excessivo (>9h) pode sinalizar possível escape ou alterações do humor."
-    else:
-        sleep_feedback += "com padrões irregulares pode estar impactando sua regulação emocional e energia."
-    
-    feedback_list.append({
-        'feature': 'Duração do Sono',
-        'user_value': user_data['sleep_duration'],
-        'importance': FEATURE_IMPORTANCE['Sleep Duration'],
-        'impact_level': 'BAIXO',
-        'message': sleep_feedback,
-        'context': f"A duração do sono tem baixa importância ({FEATURE_IMPORTANCE['Sleep Duration']}%) no modelo, mas permanece crucial para bem-estar geral."
-    })
-    
-    # 6. Hábitos Alimentares - BAIXO (2.3%)
-    diet_feedback = f"Seus hábitos alimentares '{user_data['dietary_habits']}' "
-    if user_data['dietary_habits'] == 'Muito saudáveis':
-        diet_feedback += "são excelentes e contribuem positivamente para sua energia, humor e bem-estar geral. Embora tenham baixo peso no modelo, são importantes para qualidade de vida."
-    elif user_data['dietary_habits'] == 'Moderadamente saudáveis':
-        diet_feedback += "mostram boa consciência nutricional, com espaço para pequenos ajustes que podem melhorar seu bem-estar."
-    elif user_data['dietary_habits'] == 'Pouco saudáveis':
-        diet_feedback += "podem estar impactando sua energia e humor. Mudanças na alimentação podem ter benefícios para bem-estar geral."
-    else:
-        diet_feedback += "podem estar afetando negativamente sua energia, concentração e estabilidade emocional."
-    
-    feedback_list.append({
-        'feature': 'Hábitos Alimentares',
-        'user_value': user_data['dietary_habits'],
-        'importance': FEATURE_IMPORTANCE['Dietary Habits'],
-        'impact_level': 'BAIXO',
-        'message': diet_feedback,
-        'context': f"Os hábitos alimentares têm baixa importância ({FEATURE_IMPORTANCE['Dietary Habits']}%) no modelo, mas contribuem para o bem-estar geral."
-    })
-    
-    # 7. Pensamentos Suicidas (CRÍTICO - 48.5%)
-    suicidal_feedback = f"Sua resposta '{user_data['suicidal_thoughts']}' sobre pensamentos suicidas "
-    if user_data['suicidal_thoughts'] == 'Sim':
-        suicidal_feedback += "é o fator de MAIOR RISCO identificado pelo modelo, representando quase metade da importância total. É FUNDAMENTAL buscar ajuda profissional imediatamente. Existem tratamentos eficazes e você não está sozinho(a)."
-    else:
-        suicidal_feedback += "é extremamente protetiva e representa o fator mais importante para reduzir o risco de depressão no modelo, com quase metade do peso total da predição."
-    
-    feedback_list.append({
-        'feature': 'Pensamentos Suicidas',
-        'user_value': user_data['suicidal_thoughts'],
-        'importance': FEATURE_IMPORTANCE['Have you ever had suicidal thoughts ?'],
-        'impact_level': 'CRÍTICO',
-        'message': suicidal_feedback,
-        'context': f"Esta é a feature MAIS IMPORTANTE ({FEATURE_IMPORTANCE['Have you ever had suicidal thoughts ?']}%) no modelo, representando quase metade de toda a predição. É o fator mais determinante."
-    })
-    
-    # 8. Horas de Estudo/Trabalho - BAIXO (2.4%)
-    hours_feedback = f"Suas {user_data['work_study_hours']} horas de estudo/trabalho por dia "
-    if user_data['work_study_hours'] <= 4:
-        hours_feedback += "indicam carga leve, o que pode ser protetor contra sobrecarga. Embora tenha baixo peso no modelo, ainda influencia o bem-estar."
-    elif user_data['work_study_hours'] <= 8:
-        hours_feedback += "representam uma carga equilibrada, adequada para a maioria das pessoas."
-    elif user_data['work_study_hours'] <= 12:
-        hours_feedback += "indicam carga intensa que pode gerar estresse, mas ainda manejável com boa organização."
-    else:
-        hours_feedback += "representam sobrecarga significativa que pode estar impactando seu bem-estar e eficiência."
-    
-    feedback_list.append({
-        'feature': 'Horas de Estudo/Trabalho',
-        'user_value': f"{user_data['work_study_hours']} horas/dia",
-        'importance': FEATURE_IMPORTANCE['Work/Study Hours'],
-        'impact_level': 'BAIXO',
-        'message': hours_feedback,
-        'context': f"As horas de estudo/trabalho têm baixa importância ({FEATURE_IMPORTANCE['Work/Study Hours']}%) no modelo, mas ainda podem afetar o bem-estar."
-    })
-    
-    # 9. Estresse Financeiro - ALTO (12.8%)
-    financial_feedback = f"Seu nível de estresse financeiro {user_data['financial_stress']}/5 "
-    if user_data['financial_stress'] <= 2:
-        financial_feedback += "é baixo, o que contribui positivamente para sua estabilidade emocional e foco nos estudos."
-    elif user_data['financial_stress'] == 3:
-        financial_feedback += "é moderado, mas ainda manejável. Considere estratégias de planejamento financeiro."
-    else:
-        financial_feedback += "é alto e pode estar impactando significativamente seu bem-estar e capacidade de concentração."
-    
-    feedback_list.append({
-        'feature': 'Estresse Financeiro',
-        'user_value': f"{user_data['financial_stress']}/5",
-        'importance': FEATURE_IMPORTANCE['Financial Stress'],
-        'impact_level': 'ALTO',
-        'message': financial_feedback,
-        'context': f"O estresse financeiro é o terceiro fator mais importante ({FEATURE_IMPORTANCE['Financial Stress']}%) no modelo - mudanças aqui têm impacto significativo."
-    })
-    
-    # 10. Histórico Familiar
-    family_feedback = f"Seu histórico familiar '{user_data['family_history']}' "
-    if user_data['family_history'] == 'Sim':
-        family_feedback += "indica predisposição genética, mas não determina seu destino. Estar ciente pode ajudar na prevenção e cuidado preventivo."
-    else:
-        family_feedback += "não indica predisposição familiar conhecida, o que pode ser um fator protetor."
-    
-    feedback_list.append({
-        'feature': 'Histórico Familiar',
-        'user_value': user_data['family_history'],
-        'importance': FEATURE_IMPORTANCE['Family History of Mental Illness'],
-        'impact_level': 'BAIXO',
-        'message': family_feedback,
-        'context': f"O histórico familiar tem baixa importância ({FEATURE_IMPORTANCE['Family History of Mental Illness']}%) no modelo."
-    })
-    
-    # 11. Satisfação Com estudos - BAIXO (2.3%)
-    study_satisfaction = user_data['study_satisfaction']
-    satisfaction_feedback = f"Sua satisfação com os estudos de {study_satisfaction}/5 "
-    if study_satisfaction >= 4:
-        satisfaction_feedback += "é alta, indicando boa realização pessoal com suas atividades atuais. Embora tenha baixo peso no modelo, é um fator protetor importante para qualidade de vida."
-    elif study_satisfaction >= 3:
-        satisfaction_feedback += "é moderada, mostrando alguma satisfação mas com espaço para melhorias na qualidade de vida."
-    elif study_satisfaction >= 2:
-        satisfaction_feedback += "é baixa e pode estar contribuindo para sentimentos de desmotivação e insatisfação geral."
-    else:
-        satisfaction_feedback += "é muito baixa, indicando possível necessidade de mudanças significativas em suas atividades ou perspectivas."
-    
-    feedback_list.append({
-        'feature': 'Satisfação com Estudos',
-        'user_value': f"{study_satisfaction}/5",
-        'importance': FEATURE_IMPORTANCE['Study Satisfaction'],
-        'impact_level': 'BAIXO',
-        'message': satisfaction_feedback,
-        'context': f"A satisfação com os estudos tem baixa importância ({FEATURE_IMPORTANCE['Study Satisfaction']}%) no modelo, mas é relevante para qualidade de vida geral."
-    })
-    
-    # 12. Pressão Acadêmica (MUITO ALTO - 26.1%)
-    academic_pressure = user_data['academic_pressure']
-    pressure_feedback = f"Sua pressão acadêmica de {academic_pressure}/5 "
-    if academic_pressure <= 1:
-        pressure_feedback += "é muito baixa, o que é extremamente protetor contra desenvolvimento de sintomas depressivos."
-    elif academic_pressure <= 2:
-        pressure_feedback += "é baixa, o que é altamente protetor contra desenvolvimento de sintomas depressivos."
-    elif academic_pressure == 3:
-        pressure_feedback += "é moderada e ainda manejável, mas requer atenção para não aumentar, dado seu alto peso no modelo."
-    elif academic_pressure == 4:
-        pressure_feedback += "é alta e representa um fator de risco MUITO SIGNIFICATIVO. É importante desenvolver estratégias de manejo de estresse urgentemente."
-    else:
-        pressure_feedback += "é extremamente alta e representa o SEGUNDO MAIOR FATOR DE RISCO no modelo. É CRUCIAL buscar formas de reduzir essa pressão imediatamente."
-    
-    feedback_list.append({
-        'feature': 'Pressão Acadêmica',
-        'user_value': f"{academic_pressure}/5",
-        'importance': FEATURE_IMPORTANCE['Academic Pressure'],
-        'impact_level': 'MUITO ALTO',
-        'message': pressure_feedback,
-        'context': f"A pressão acadêmica é o SEGUNDO FATOR MAIS IMPORTANTE ({FEATURE_IMPORTANCE['Academic Pressure']}%) no modelo de predição, com peso muito significativo."
-    })
-    
-    return feedback_list
-
-# Carregar os modelos
-try:
-    model = joblib.load(MODEL_PATH)
-    print("Modelo carregados com sucesso!")
-except Exception as e:
-    print(f"Erro ao carregar modelo: {e}")
-    model = None
-
-@router.post("/predict", response_model=PredictionResponse)
-async def predict_depression(request: PredictionRequest):
+logger = logging.getLogger(__name__)
+
+# Modelo em uso. O artefato é carregado no lifespan da aplicação (ver startup),
+# não no import do módulo
+model = None
+
+# Versão NumPy do pipeline, extraída uma única vez do artefato
+compiled_model = None
+
+# Backend ONNX Runtime, carregado só com SCORING_MODE=onnx
+onnx_model = None
+
+# Substituto destilado do SVC, carregado só com SCORING_MODE=cascade
+surrogate_model = None
+
+# Identifica o artefato carregado; usado para invalidar o cache de predições
+model_fingerprint = None
+
+# Parcelas por feature do modelo compilado, usadas pelas sessões ao vivo
+live_model = None
+
+# Estado da inicialização, exposto em /health/ready
+startup_state = {
+    "model_loaded": False,
+    "model_format": None,
+    "preloaded": False,
+    "warmed_up": False,
+    "error": None,
+    "feature_importance_source": None,
+    "approximate_model": False,
+    "kernel_rows": None,
+    "precision": None,
+    "load_time_ms": None,
+    "warmup_time_ms": None,
+    "warmup_first_ms": None,
+    "warmup_last_ms": None,
+}
+
+# Perfis representativos (baixo, moderado e alto risco) usados no aquecimento
+WARMUP_PROFILES = [
+    {
+        "gender": "Masculino", "age": 25, "academic_pressure": 1, "cgpa": 9.0,
+        "study_satisfaction": 5, "sleep_duration": "7-8 horas", "dietary_habits": "Muito saudáveis",
+        "suicidal_thoughts": "Não", "work_study_hours": 6, "financial_stress": 1, "family_history": "Não",
+    },
+    {
+        "gender": "Feminino", "age": 22, "academic_pressure": 3, "cgpa": 7.5,
+        "study_satisfaction": 3, "sleep_duration": "5-6 horas", "dietary_habits": "Moderadamente saudáveis",
+        "suicidal_thoughts": "Não", "work_study_hours": 8, "financial_stress": 3, "family_history": "Sim",
+    },
+    {
+        "gender": "Feminino", "age": 20, "academic_pressure": 5, "cgpa": 5.0,
+        "study_satisfaction": 1, "sleep_duration": "Menos de 5 horas", "dietary_habits": "Pouco saudáveis",
+        "suicidal_thoughts": "Sim", "work_study_hours": 14, "financial_stress": 5, "family_history": "Sim",
+    },
+]
+
+# Cache LRU das respostas de /model/predict
+prediction_cache = PredictionCache()
+
+# Pool de threads onde a inferência roda, para não bloquear o event loop
+inference_executor = InferenceExecutor()
+
+# Tamanho máximo aceito pelo endpoint de predição em lote
+MAX_BATCH_SIZE = 10000
+
+
+def build_user_data(request: PredictionRequest) -> dict:
+    """
+    Converte o PredictionRequest no dicionário usado pelo feedback
+    """
+    return {
+        'gender': request.gender,
+        'age': request.age,
+        'academic_pressure': request.academic_pressure,
+        'cgpa': request.cgpa,
+        'study_satisfaction': request.study_satisfaction,
+        'sleep_duration': request.sleep_duration,
+        'dietary_habits': request.dietary_habits,
+        'suicidal_thoughts': request.suicidal_thoughts,
+        'work_study_hours': request.work_study_hours,
+        'financial_stress': request.financial_stress,
+        'family_history': request.family_history
+    }
+
+
+def build_prediction_response(request: PredictionRequest, prediction, prediction_proba, explanation=None) -> PredictionResponse:
+    """
+    Monta a resposta de uma predição a partir da saída do modelo (com a
+    explicação local, se ela foi calculada)
+    """
+    # Determinar o risco de depressão
+    depression_risk = "Depressivo" if prediction == 1 else "Não depressivo"
+
+    with stage("user_data"):
+        user_data = build_user_data(request)
+
+    # Gerar feedback detalhado para todas as features
+    with stage("feedback"):
+        feature_feedback = generate_feature_feedback(user_data)
+
+    with stage("response"):
+        if explanation is not None:
+            return ExplainedPredictionResponse(
+                prediction=int(prediction),
+                probability=prediction_proba.tolist(),
+                depression_risk=depression_risk,
+                feature_feedback=feature_feedback,
+                explanation=explanation,
+            )
+        return PredictionResponse(
+            prediction=int(prediction),
+            probability=prediction_proba.tolist(),
+            depression_risk=depression_risk,
+            feature_feedback=feature_feedback,
+        )
+
+
+def active_backend(record_escalations: bool = True) -> InferenceBackend:
+    """
+    Backend de inferência escolhido por SCORING_MODE (ver backends.SCORING_BACKENDS).
+    record_escalations=False deixa as linhas fora das contagens da cascata.
+    """
+    backend = SCORING_BACKENDS.get(scoring.SCORING_MODE)
+    if backend == "onnx":
+        if onnx_model is None:
+            raise RuntimeError("SCORING_MODE=onnx, mas o modelo ONNX não foi carregado")
+        return onnx_model
+    if backend == "cascade":
+        if surrogate_model is None or compiled_model is None:
+            raise RuntimeError("SCORING_MODE=cascade, mas o substituto ou o modelo compilado não foram carregados")
+        return CascadeBackend(surrogate_model, compiled_model, record_escalations)
+    # Sem o pipeline (MODEL_FORMAT=mmap) só a versão compilada está disponível
+    if compiled_model is not None and (backend == "numpy" or model is None):
+        return NumpyBackend(compiled_model)
+    return SklearnBackend(model)
+
+
+def score_requests(requests: List[PredictionRequest], record_escalations: bool = True, block: bool = False):
+    """
+    Retorna (predições, probabilidades) para uma lista de requisições. Com
+    block=True (explicações) todas as linhas vêm de um único modelo, mesmo
+    com SCORING_MODE=cascade (ver CascadeBackend.predict_block).
+    """
+    backend = active_backend(record_escalations)
+    if block and isinstance(backend, CascadeBackend):
+        return backend.predict_block(requests)
+    return backend.predict(requests)
+
+
+def score_batch(requests: List[PredictionRequest], record_escalations: bool = True) -> list:
+    """
+    Pontua o lote em uma única chamada vetorizada. Retorna, para cada requisição,
+    a tupla (predição, probabilidades) ou a exceção que impediu a predição.
+    """
+    try:
+        predictions, predictions_proba = score_requests(requests, record_escalations)
+        return list(zip(predictions, predictions_proba))
+    except Exception:
+        # Se o lote falhar, pontuar linha a linha para isolar a linha com problema
+        scored = []
+        for request in requests:
+            try:
+                predictions, predictions_proba = score_requests([request], record_escalations)
+                scored.append((predictions[0], predictions_proba[0]))
+            except Exception as e:
+                scored.append(e)
+        return scored
+
+
+def score_with_explanation(request: PredictionRequest):
+    """
+    Pontua a requisição junto com as suas linhas perturbadas, numa única
+    chamada ao modelo. Retorna (predição, probabilidades, explicação).
+
+    Todas as linhas vêm do mesmo modelo: com SCORING_MODE=cascade, o SVC se a
+    requisição cai na faixa de incerteza, senão o substituto (a mesma escolha
+    de /model/predict sem explicação).
+    """
+    # As referências vêm dos parâmetros do pipeline StandardScaler + OneHotEncoder + SVC
+    if compiled_model is None:
+        raise ValueError("explicação indisponível para o modelo carregado")
+    rows, features = perturbed_requests(request, reference_values(compiled_model))
+    predictions, predictions_proba = score_requests(rows, block=True)
+    with stage("explanation"):
+        return predictions[0], predictions_proba[0], local_contributions(predictions_proba, features)
+
+
+# Agrupa requisições concorrentes de /model/predict em uma única chamada ao modelo
+micro_batcher = MicroBatcher(score_batch, inference_executor)
+
+
+def executor_saturated(e: ExecutorSaturatedError) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"Serviço sobrecarregado, tente novamente: {str(e)}",
+        headers={"Retry-After": str(INFERENCE_RETRY_AFTER)}
+    )
+
+
+def check_model_loaded(route: str = "/model/predict"):
     # Verificar se os modelos foram carregados
-    if model is None:
+    if not model_available():
+        record_model_not_loaded(route)
         raise HTTPException(
             status_code=500, 
             detail="Modelo ou scaler não carregados corretamente"
         )
-    
+
+
+def current_model_version():
+    """
+    Versão do modelo em uso: muda quando outro artefato (ou outro objeto de modelo) é carregado
+    """
+    return (model_fingerprint, id(model), id(compiled_model), id(onnx_model), id(surrogate_model))
+
+
+def model_available() -> bool:
+    return model is not None or compiled_model is not None
+
+
+def install_model(
+    pipeline,
+    fingerprint=None,
+    compiled: Optional[CompiledModel] = None,
+    onnx: Optional[OnnxBackend] = None,
+    surrogate: Optional[Surrogate] = None,
+):
+    """
+    Coloca um pipeline (ou só a versão compilada) em uso, com a versão ONNX e
+    o substituto da cascata opcionais. Sem `compiled`, a versão NumPy é
+    extraída do pipeline. O cache de predições é invalidado porque a versão
+    do modelo muda junto.
+    """
+    global model, compiled_model, onnx_model, surrogate_model, model_fingerprint
+    if compiled is None and scoring.supports_compilation(pipeline):
+        compiled = CompiledModel.from_pipeline(pipeline)
+    if compiled is not None and MODEL_PRECISION:
+        compiled = compiled.with_precision(MODEL_PRECISION)
+    model = pipeline
+    compiled_model = compiled
+    onnx_model = onnx
+    surrogate_model = surrogate
+    model_fingerprint = fingerprint
+    startup_state["model_loaded"] = model_available()
+    startup_state["approximate_model"] = compiled is not None and compiled.calibration == "sigmoid"
+    startup_state["kernel_rows"] = None if compiled is None else compiled.n_kernel_rows
+    startup_state["precision"] = None if compiled is None else compiled.precision
+    startup_state["warmed_up"] = False
+
+
+def load_feature_importance(path: Path, fingerprint: Optional[str]):
+    """
+    Usa no feedback a importância das features calculada para o artefato
+    carregado. Sem ela nos metadados (ou se ela for de outro artefato), volta
+    aos valores padrão de FEATURE_IMPORTANCE. Sem a seção nos metadados é o
+    caso normal (o repositório não versiona o metadata.json) e fica no nível
+    info; metadados de outro artefato ou inválidos geram um aviso.
+    """
     try:
-        # Preparar dados do usuário
-        user_data = {
-            'gender': request.gender,
-            'age': request.age,
-            'academic_pressure': request.academic_pressure,
-            'cgpa': request.cgpa,
-            'study_satisfaction': request.study_satisfaction,
-            'sleep_duration': request.sleep_duration,
-            'dietary_habits': request.dietary_habits,
-            'suicidal_thoughts': request.suicidal_thoughts,
-            'work_study_hours': request.work_study_hours,
-            'financial_stress': request.financial_stress,
-            'family_history': request.family_history
-        }
+        metadata = read_metadata(path)
+        importance = feature_importance_for(metadata, fingerprint)
+        if importance is not None:
+            install_feature_importance(importance)
+            startup_state["feature_importance_source"] = "metadata"
+            return
+        if metadata.get("feature_importance"):
+            logger.warning("Importância das features em %s não é do modelo %s; usando os valores padrão", path, fingerprint)
+        else:
+            logger.info("Sem importância das features em %s; usando os valores padrão", path)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning("Metadados do modelo inválidos em %s (%s); usando os valores padrão", path, e)
+    install_feature_importance(FEATURE_IMPORTANCE)
+    startup_state["feature_importance_source"] = "default"
+
+
+def load_onnx_model(fingerprint: Optional[str]) -> Optional[OnnxBackend]:
+    """
+    Carrega a versão ONNX quando SCORING_MODE=onnx, recusando um .onnx
+    exportado de outro artefato
+    """
+    if SCORING_BACKENDS.get(scoring.SCORING_MODE) != "onnx":
+        return None
+    onnx = OnnxBackend.load(MODEL_ONNX_PATH)
+    if onnx.source_fingerprint and fingerprint and onnx.source_fingerprint != fingerprint:
+        raise ValueError(f"{MODEL_ONNX_PATH} foi exportado de outro artefato; gere de novo com python -m src.model.onnx_export")
+    return onnx
+
+
+def load_surrogate(path: Path, fingerprint: Optional[str]) -> Optional[Surrogate]:
+    """
+    Carrega o substituto quando SCORING_MODE=cascade, recusando um substituto
+    destilado de outro artefato ou uma faixa de incerteza inválida
+    """
+    if SCORING_BACKENDS.get(scoring.SCORING_MODE) != "cascade":
+        return None
+    cascade.validate_band(cascade.CASCADE_BAND_LOW, cascade.CASCADE_BAND_HIGH)
+    surrogate = Surrogate.load(path)
+    if surrogate.source_fingerprint and fingerprint and surrogate.source_fingerprint != fingerprint:
+        raise ValueError(f"{path} foi destilado de outro artefato; gere de novo com python -m src.model.distillation")
+    return surrogate
+
+
+def load_model(path: Optional[Path] = None, model_format: Optional[str] = None) -> bool:
+    """
+    Carrega o artefato do disco e registra o tempo de carregamento.
+    Em caso de erro o modelo fica como None e o serviço não fica pronto.
+    """
+    model_format = model_format or MODEL_FORMAT
+    # O .joblib e o diretório do artefato de serving têm o mesmo nome, então os
+    # dois formatos encontram os metadados no mesmo arquivo
+    metadata = MODEL_METADATA_PATH if path is None else metadata_path(path)
+    surrogate = MODEL_SURROGATE_PATH if path is None else surrogate_path(path)
+    started = time.perf_counter()
+    try:
+        if model_format == "mmap":
+            path = path or MODEL_EXPORT_PATH
+            fingerprint = read_export_metadata(path).get("source_fingerprint")
+            compiled = load_compiled_model(path, mmap=True)
+            install_model(
+                None, fingerprint, compiled=compiled,
+                onnx=load_onnx_model(fingerprint), surrogate=load_surrogate(surrogate, fingerprint),
+            )
+        elif model_format == "joblib":
+            import joblib
 
-        # Preparar input para o modelo
-        model_input = {
-            "Gender": [request.gender],
-            "Age": [request.age],
-            "Academic Pressure": [request.academic_pressure],
-            "Study Satisfaction": [request.study_satisfaction],
-            "CGPA": [request.cgpa],
-            "Sleep Duration": [request.sleep_duration],
-            "Dietary Habits": [request.dietary_habits],
-            "Have you ever had suicidal thoughts ?": [request.suicidal_thoughts],
-            "Work/Study Hours": [request.work_study_hours],
-            "Financial Stress": [request.financial_stress],
-            "Family History of Mental Illness": [request.family_history]
+            path = path or MODEL_PATH
+            fingerprint = artifact_fingerprint(path)
+            pipeline = joblib.load(path)
+            install_model(
+                pipeline, fingerprint,
+                onnx=load_onnx_model(fingerprint), surrogate=load_surrogate(surrogate, fingerprint),
+            )
+        else:
+            raise ValueError(f"MODEL_FORMAT inválido: {model_format} (use 'joblib' ou 'mmap')")
+    except Exception as e:
+        logger.exception("Erro ao carregar modelo %s", path)
+        install_model(None)
+        startup_state["error"] = f"Erro ao carregar modelo: {e}"
+        return False
+    load_feature_importance(metadata, model_fingerprint)
+    startup_state["error"] = None
+    startup_state["model_format"] = model_format
+    startup_state["load_time_ms"] = (time.perf_counter() - started) * 1000
+    logger.info("Modelo (%s) carregado em %.1f ms", model_format, startup_state["load_time_ms"])
+    return True
+
+
+def preload():
+    """
+    Carrega o modelo no processo mestre, antes do fork dos workers, para que
+    eles herdem as páginas já carregadas. O lifespan de cada worker só aquece.
+    """
+    startup_state["preloaded"] = load_model()
+
+
+def warm_up():
+    """
+    Roda o caminho completo da predição (pontuação individual e em lote, feedback
+    e montagem da resposta) com os perfis de aquecimento, para que a primeira
+    requisição real não pague a inicialização preguiçosa.
+    """
+    requests = [PredictionRequest.model_validate(profile) for profile in WARMUP_PROFILES]
+    started = time.perf_counter()
+    latencies = []
+    for request in requests:
+        request_started = time.perf_counter()
+        predictions, predictions_proba = score_requests([request], record_escalations=False)
+        build_prediction_response(request, predictions[0], predictions_proba[0])
+        latencies.append((time.perf_counter() - request_started) * 1000)
+    for request, outcome in zip(requests, score_batch(requests, record_escalations=False)):
+        if isinstance(outcome, Exception):
+            raise outcome
+        build_prediction_response(request, *outcome)
+
+    startup_state["warmup_time_ms"] = (time.perf_counter() - started) * 1000
+    startup_state["warmup_first_ms"] = latencies[0]
+    startup_state["warmup_last_ms"] = latencies[-1]
+    startup_state["warmed_up"] = True
+    logger.info(
+        "Aquecimento concluído em %.1f ms (primeira predição %.1f ms, última %.1f ms)",
+        startup_state["warmup_time_ms"], latencies[0], latencies[-1]
+    )
+
+
+async def startup():
+    """
+    Carrega e aquece o modelo; chamado pelo lifespan antes de a aplicação receber tráfego
+    """
+    if not startup_state["preloaded"] and not load_model():
+        return
+    try:
+        await inference_executor.run(warm_up)
+    except Exception as e:
+        logger.exception("Erro no aquecimento do modelo")
+        startup_state["error"] = f"Erro no aquecimento do modelo: {e}"
+
+
+def is_ready() -> bool:
+    return model_available() and startup_state["model_loaded"] and startup_state["warmed_up"]
+
+
+def encode_json(model: BaseModel) -> bytes:
+    """
+    Codifica um modelo Pydantic com orjson (o mesmo encoder do ORJSONResponse)
+    """
+    return orjson.dumps(model.model_dump(mode="json"))
+
+
+def json_safe_input(value):
+    """
+    NaN e infinito não são JSON válido; no detalhe do 422 vão como texto ("nan", "inf")
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        return str(value)
+    return value
+
+
+async def parse_prediction_request(http_request: Request) -> PredictionRequest:
+    """
+    Valida o corpo direto dos bytes recebidos, sem json.loads e dicionário intermediário
+    """
+    server_timing.begin()
+    body = await http_request.body()
+    try:
+        with stage("parse"):
+            return PredictionRequest.model_validate_json(body)
+    except ValidationError as e:
+        record_error("/model/predict", e)
+        raise RequestValidationError(
+            [{**error, 'loc': ('body', *error['loc']), 'input': json_safe_input(error.get('input'))} for error in e.errors(include_url=False)],
+            body=body
+        )
+
+
+@router.post(
+    "/predict",
+    response_model=Union[ExplainedPredictionResponse, PredictionResponse],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": PredictionRequest.model_json_schema()}},
         }
+    },
+)
+async def predict_depression(
+    request: PredictionRequest = Depends(parse_prediction_request),
+    explain: bool = Query(False, description="Inclui a contribuição de cada resposta para a probabilidade de depressão"),
+):
+    check_model_loaded()
 
-        Y_input = pd.DataFrame(model_input)
-        
-        # Fazer a predição
-        prediction = model.predict(Y_input)[0]
-        prediction_proba = model.predict_proba(Y_input)[0]
-        
-        # Determinar o risco de depressão
-        depression_risk = "Depressivo" if prediction == 1 else "Não depressivo"
-        
-        # Gerar feedback detalhado para todas as features
-        feature_feedback = generate_feature_feedback(user_data)
-        
-        return PredictionResponse(
-            prediction=int(prediction),
-            probability=prediction_proba.tolist(),
-            depression_risk=depression_risk,
-            feature_feedback=feature_feedback,
+    if caching.PREDICTION_CACHE_ENABLED:
+        # A resposta com explicação fica no mesmo cache, com chave própria
+        key = request_cache_key(request)
+        response = await prediction_cache.get_or_compute(
+            key + ("explain",) if explain else key,
+            lambda: compute_prediction(request, explain),
+            current_model_version()
         )
+    else:
+        response = await compute_prediction(request, explain)
+
+    # Serializa aqui com orjson, como o ORJSONResponse, para medir a etapa
+    with stage("serialize"):
+        body = encode_json(response)
+
+    timings = server_timing.current()
+    headers = {"Server-Timing": timings.header_value()} if timings is not None else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def compute_prediction(request: PredictionRequest, explain: bool = False) -> PredictionResponse:
+    try:
+        if explain:
+            # A própria requisição é a primeira linha da chamada da explicação
+            prediction, prediction_proba, explanation = await inference_executor.run(score_with_explanation, request)
+            return build_prediction_response(request, prediction, prediction_proba, explanation)
+
+        # Fazer a predição fora do event loop, agrupada com requisições concorrentes.
+        # Requisições perfiladas não entram no lote, para o perfil ser só delas
+        if batching.MICRO_BATCH_ENABLED and profiling.active_session() is None:
+            prediction, prediction_proba = await micro_batcher.submit(request)
+        else:
+            predictions, predictions_proba = await inference_executor.run(score_requests, [request])
+            prediction, prediction_proba = predictions[0], predictions_proba[0]
         
+        return build_prediction_response(request, prediction, prediction_proba)
+        
+    except ExecutorSaturatedError as e:
+        record_error("/model/predict", e)
+        raise executor_saturated(e)
     except Exception as e:
+        record_error("/model/predict", e)
         raise HTTPException(
             status_code=400, 
             detail=f"Erro ao processar predição: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/predict/batch", response_model=BatchPredictionResponse)
+async def predict_depression_batch(items: List[Dict[str, Any]] = Body(...)):
+    """
+    Prediz uma turma inteira em uma única passada pelo pipeline.
+    Cada item é validado individualmente, então uma linha inválida não derruba o lote.
+    """
+    check_model_loaded("/model/predict/batch")
+
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Lote com {len(items)} itens excede o máximo de {MAX_BATCH_SIZE}"
+        )
+
+    results = [BatchPredictionItem(index=index) for index in range(len(items))]
+
+    # Validar cada item separadamente
+    valid_indexes = []
+    valid_requests = []
+    for index, item in enumerate(items):
+        try:
+            valid_requests.append(PredictionRequest.model_validate(item))
+            valid_indexes.append(index)
+        except ValidationError as e:
+            record_error("/model/predict/batch", e)
+            results[index].error = f"Dados inválidos: {e.errors(include_url=False)}"
+
+    if not valid_requests:
+        return BatchPredictionResponse(results=results)
+
+    try:
+        scored = await inference_executor.run(score_batch, valid_requests)
+    except ExecutorSaturatedError as e:
+        record_error("/model/predict/batch", e)
+        raise executor_saturated(e)
+
+    for index, request, outcome in zip(valid_indexes, valid_requests, scored):
+        if isinstance(outcome, Exception):
+            record_error("/model/predict/batch", outcome)
+            results[index].error = f"Erro ao processar predição: {str(outcome)}"
+            continue
+        try:
+            results[index].result = build_prediction_response(request, *outcome)
+        except Exception as e:
+            record_error("/model/predict/batch", e)
+            results[index].error = f"Erro ao processar predição: {str(e)}"
+
+    return BatchPredictionResponse(results=results)
+
+
+def score_stream_chunk(rows: list, upload: str, header: Optional[List[str]]) -> bytes:
+    """
+    Valida, pontua (numa única chamada vetorizada) e serializa um bloco de linhas
+    do upload. Devolve as linhas NDJSON da resposta, na ordem de entrada.
+    """
+    items = []
+    valid_items = []
+    valid_requests = []
+    for index, line in rows:
+        item = BatchPredictionItem(index=index)
+        items.append(item)
+        try:
+            if isinstance(line, LineTooLong):
+                raise ValueError(f"Linha com {line.size} bytes excede o máximo de {STREAM_MAX_LINE_BYTES}")
+            if upload == "ndjson":
+                request = PredictionRequest.model_validate_json(line)
+            else:
+                values = parse_csv_line(line)
+                if len(values) != len(header):
+                    raise ValueError(f"Linha com {len(values)} colunas, o cabeçalho tem {len(header)}")
+                request = PredictionRequest.model_validate(dict(zip(header, values)))
+        except ValidationError as e:
+            record_error("/model/predict/stream", e)
+            item.error = f"Dados inválidos: {e.errors(include_url=False)}"
+            continue
+        except (ValueError, csv.Error) as e:
+            record_error("/model/predict/stream", e)
+            item.error = f"Dados inválidos: {str(e)}"
+            continue
+        valid_items.append(item)
+        valid_requests.append(request)
+
+    if valid_requests:
+        for item, request, outcome in zip(valid_items, valid_requests, score_batch(valid_requests)):
+            try:
+                if isinstance(outcome, Exception):
+                    raise outcome
+                item.result = build_prediction_response(request, *outcome)
+            except Exception as e:
+                record_error("/model/predict/stream", e)
+                item.error = f"Erro ao processar predição: {str(e)}"
+
+    return b"".join(encode_json(item) + b"\n" for item in items)
+
+
+async def score_stream_rows(rows: list, upload: str, header: Optional[List[str]]) -> bytes:
+    try:
+        return await inference_executor.run(score_stream_chunk, rows, upload, header)
+    except ExecutorSaturatedError as e:
+        # Fila cheia: as linhas do bloco voltam com erro e o stream continua
+        record_error("/model/predict/stream", e)
+        error = f"Serviço sobrecarregado, tente novamente: {str(e)}"
+        return b"".join(
+            encode_json(BatchPredictionItem(index=index, error=error)) + b"\n"
+            for index, _ in rows
+        )
+
+
+async def stream_predictions(reader: LineReader, upload: str, header: Optional[List[str]]):
+    """
+    Agrupa as linhas do upload em blocos de STREAM_CHUNK_SIZE e devolve cada
+    bloco pontuado assim que fica pronto; só um bloco fica em memória por vez.
+    """
+    rows = []
+    index = 0
+    async for line in reader:
+        if not isinstance(line, LineTooLong) and not line.strip():
+            continue
+        rows.append((index, line))
+        index += 1
+        if len(rows) >= STREAM_CHUNK_SIZE:
+            yield await score_stream_rows(rows, upload, header)
+            rows = []
+    if rows:
+        yield await score_stream_rows(rows, upload, header)
+
+
+@router.post(
+    "/predict/stream",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string", "format": "binary"}},
+                "text/csv": {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    },
+)
+async def predict_depression_stream(http_request: Request):
+    """
+    Pontua um upload NDJSON ou CSV (colunas com os nomes dos campos do
+    PredictionRequest) em blocos, devolvendo NDJSON à medida que cada bloco
+    fica pronto. Linhas inválidas viram um item com "error", sem interromper o stream.
+    """
+    check_model_loaded("/model/predict/stream")
+
+    upload = upload_format(http_request.headers.get("content-type"))
+    if upload is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Envie o arquivo como application/x-ndjson ou text/csv"
+        )
+
+    reader = LineReader(http_request.stream(), STREAM_MAX_LINE_BYTES)
+    header = None
+    if upload == "csv":
+        line = await reader.readline()
+        if line is None or isinstance(line, LineTooLong):
+            raise HTTPException(status_code=400, detail="CSV sem linha de cabeçalho")
+        header = [column.strip() for column in parse_csv_line(line)]
+        missing = [field for field in PredictionRequest.model_fields if field not in header]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Colunas ausentes no CSV: {missing}")
+
+    return UploadStreamingResponse(stream_predictions(reader, upload, header), media_type=NDJSON_MEDIA_TYPE)
+
+
+def score_what_if(what_if: WhatIfRequest, questions: list) -> WhatIfResponse:
+    """
+    Avalia de uma vez a grade de cenários das features modificáveis e monta a
+    resposta com as melhores combinações. A grade é sempre avaliada pelo SVC
+    (CompiledModel), também com SCORING_MODE=cascade.
+    """
+    # A grade é avaliada a partir dos parâmetros do pipeline StandardScaler + OneHotEncoder + SVC
+    if compiled_model is None:
+        raise ValueError("cenários indisponíveis para o modelo carregado")
+    answers = what_if.answers
+    fields = list(dict.fromkeys(what_if.features or MODIFIABLE_FEATURES))
+    values = candidate_values(questions, compiled_model, answers, fields)
+    with stage("what_if"):
+        predictions, probabilities = score_grid(compiled_model, answers, values)
+
+    current = tuple(values[field].index(getattr(answers, field)) for field in fields)
+    scenarios = [
+        WhatIfScenario(
+            changes=[
+                WhatIfChange(field=field, current=getattr(answers, field), suggested=values[field][index])
+                for field, index, original in zip(fields, position, current) if index != original
+            ],
+            prediction=int(predictions[position]),
+            probability=float(probabilities[position]),
+            reduction=float(probabilities[current] - probabilities[position]),
+        )
+        for position in best_changes(probabilities, current, what_if.max_changes, what_if.top_k)
+    ]
+    return WhatIfResponse(
+        prediction=int(predictions[current]),
+        probability=float(probabilities[current]),
+        candidates_evaluated=int(probabilities.size),
+        scenarios=scenarios,
+    )
+
+
+@router.post("/what-if", response_model=WhatIfResponse)
+async def what_if_scenarios(what_if: WhatIfRequest):
+    """
+    Quais mudanças nas respostas modificáveis (sono, pressão acadêmica, horas
+    de estudo/trabalho, alimentação e estresse financeiro) mais reduzem a
+    probabilidade de depressão, com no máximo max_changes mudanças
+    """
+    check_model_loaded("/model/what-if")
+    try:
+        questions = questions_store.current().questions
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao ler questions.json: {str(e)}")
+
+    try:
+        return await inference_executor.run(score_what_if, what_if, questions)
+    except ExecutorSaturatedError as e:
+        record_error("/model/what-if", e)
+        raise executor_saturated(e)
+    except Exception as e:
+        record_error("/model/what-if", e)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Erro ao avaliar cenários: {str(e)}"
+        )
+
+
+def current_live_model() -> IncrementalModel:
+    """
+    Parcelas por feature do modelo em uso, extraídas na primeira sessão após a carga
+    """
+    global live_model
+    if live_model is None or live_model.compiled is not compiled_model:
+        live_model = IncrementalModel(compiled_model)
+    return live_model
+
+
+def estimate_message(session: IncrementalSession) -> dict:
+    prediction, prediction_proba = session.estimate()
+    return {
+        "type": "estimate",
+        "answered": len(session.answers),
+        "missing": session.missing,
+        "prediction": int(prediction),
+        "probability": prediction_proba.tolist(),
+    }
+
+
+def score_final(request: PredictionRequest) -> PredictionResponse:
+    """
+    Resultado da sessão completa pelo mesmo caminho de /model/predict
+    """
+    predictions, predictions_proba = score_requests([request])
+    return build_prediction_response(request, predictions[0], predictions_proba[0])
+
+
+@router.websocket("/predict/live")
+async def predict_depression_live(websocket: WebSocket):
+    """
+    Sessão do questionário em andamento. Cada mensagem {"field": ..., "value": ...}
+    atualiza só a parcela daquela feature e devolve a estimativa, com as
+    respostas que faltam imputadas; com todas as respostas, devolve o mesmo
+    resultado de /model/predict.
+    """
+    await websocket.accept()
+    if not model_available():
+        record_model_not_loaded("/model/predict/live")
+        await websocket.close(code=1011, reason="Modelo não carregado")
+        return
+    if compiled_model is None:
+        await websocket.close(code=1011, reason="Sessão ao vivo indisponível para o modelo carregado")
+        return
+
+    session = IncrementalSession(current_live_model())
+    try:
+        await websocket.send_json(estimate_message(session))
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message = orjson.loads(text)
+                with stage("live_update"):
+                    session.answer(message["field"], message["value"])
+            except (ValueError, KeyError, TypeError) as e:
+                record_error("/model/predict/live", e)
+                await websocket.send_json({"type": "error", "detail": f"Resposta inválida: {str(e)}"})
+                continue
+
+            if session.missing:
+                await websocket.send_json(estimate_message(session))
+                continue
+            try:
+                response = await inference_executor.run(score_final, session.request())
+            except Exception as e:
+                record_error("/model/predict/live", e)
+                await websocket.send_json({"type": "error", "detail": f"Erro ao processar predição: {str(e)}"})
+                continue
+            await websocket.send_json({"type": "final", **response.model_dump()})
+    except WebSocketDisconnect:
+        pass
+
+
+@router.get("/executor/stats")
+async def get_executor_stats():
+    """Profundidade da fila e tempo de espera do executor de inferência"""
+    return inference_executor.stats()
+
+
+@router.get("/batcher/stats")
+async def get_batcher_stats():
+    """Tamanhos de lote alcançados pelo micro-batching de /model/predict"""
+    return micro_batcher.stats()
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Acertos, faltas e remoções do cache de predições"""
+    return prediction_cache.stats()
+
+
+@router.get("/cascade/stats")
+async def get_cascade_stats():
+    """Fração das linhas escaladas do substituto para o SVC com SCORING_MODE=cascade"""
+    return cascade.cascade_stats()
+
+
+# Estado do modelo e das filas, lido na hora da coleta de /metrics
+metrics.registry.gauge("model_ready", "1 quando o modelo está carregado e aquecido", lambda: int(is_ready()))
+metrics.registry.gauge(
+    "model_load_time_seconds", "Tempo de carregamento do modelo na inicialização",
+    lambda: startup_state["load_time_ms"] / 1000 if startup_state["load_time_ms"] is not None else None
+)
+metrics.registry.gauge(
+    "model_warmup_time_seconds", "Tempo do aquecimento do modelo na inicialização",
+    lambda: startup_state["warmup_time_ms"] / 1000 if startup_state["warmup_time_ms"] is not None else None
+)
+metrics.registry.gauge("inference_queue_depth", "Requisições aguardando uma thread de inferência", lambda: inference_executor.queue_depth)
+metrics.registry.gauge("prediction_cache_size", "Respostas guardadas no cache de predições", lambda: prediction_cache.stats()["size"])
+metrics.registry.gauge("prediction_cache_hit_rate", "Fração de consultas ao cache atendidas sem avaliar o modelo", lambda: prediction_cache.stats()["hit_rate"])
+metrics.registry.gauge(
+    "cascade_escalation_rate", "Fração das linhas da cascata escaladas do substituto para o SVC",
+    cascade.escalation_rate
+)
+
+
+if MODEL_PRELOAD:
+    preload()
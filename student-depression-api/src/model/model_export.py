@@ -0,0 +1,135 @@
+"""
+Artefato de serving do CompiledModel: um diretório com um .npy por array
+grande e um model.json com o restante dos parâmetros.
+
+Os .npy são abertos com np.load(mmap_mode='r'), então vários workers que
+carregam o mesmo diretório compartilham as mesmas páginas físicas (o cache
+de páginas do sistema operacional) em vez de cada um manter uma cópia
+privada. Nada é unpickled: o carregamento usa allow_pickle=False.
+
+Com --precision float32 os vetores de suporte, as normas e os coeficientes
+são gravados em float32 (metade do tamanho); o relatório de paridade contra o
+float64 é gerado por src/model/precision.py.
+
+Uso (a partir de student-depression-api/), para gerar o diretório a partir do .joblib:
+    python -m src.model.model_export [--output DIR] [--precision float32]
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import Optional
+import numpy as np
+from src.model.compiled_model import PRECISIONS, CompiledModel
+
+EXPORT_FORMAT_VERSION = 1
+METADATA_FILE = "model.json"
+
+# Atributo do CompiledModel -> arquivo .npy
+ARRAY_FILES = {
+    "folded_support_vectors": "folded_support_vectors.npy",
+    "support_sq_norms": "support_sq_norms.npy",
+    "dual_coef": "dual_coef.npy",
+    "mean": "mean.npy",
+    "scale": "scale.npy",
+}
+
+
+def export_compiled_model(compiled: CompiledModel, directory: Path, source_fingerprint: Optional[str] = None) -> Path:
+    """
+    Grava o CompiledModel no formato de serving e retorna o diretório
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for attribute, filename in ARRAY_FILES.items():
+        np.save(directory / filename, np.ascontiguousarray(getattr(compiled, attribute)), allow_pickle=False)
+
+    metadata = {
+        "format_version": EXPORT_FORMAT_VERSION,
+        "source_fingerprint": source_fingerprint,
+        "numeric_features": compiled.numeric_features,
+        "categorical_features": compiled.categorical_features,
+        "category_index": compiled.category_index,
+        "intercept": compiled.intercept,
+        "gamma": compiled.gamma,
+        "prob_a": compiled.prob_a,
+        "prob_b": compiled.prob_b,
+        "classes": compiled.classes.tolist(),
+        "calibration": compiled.calibration,
+        "precision": compiled.precision,
+    }
+    with open(directory / METADATA_FILE, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    return directory
+
+
+def read_export_metadata(directory: Path) -> dict:
+    with open(Path(directory) / METADATA_FILE, "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+    if metadata.get("format_version") != EXPORT_FORMAT_VERSION:
+        raise ValueError(
+            f"Versão do artefato {metadata.get('format_version')} não suportada "
+            f"(esperada {EXPORT_FORMAT_VERSION})"
+        )
+    return metadata
+
+
+def load_compiled_model(directory: Path, mmap: bool = True) -> CompiledModel:
+    """
+    Carrega o diretório gerado por export_compiled_model. Com mmap=True os
+    arrays ficam mapeados somente leitura, sem cópia para o heap do processo.
+    """
+    directory = Path(directory)
+    metadata = read_export_metadata(directory)
+    arrays = {
+        attribute: np.load(directory / filename, mmap_mode="r" if mmap else None, allow_pickle=False)
+        for attribute, filename in ARRAY_FILES.items()
+    }
+
+    n_transformed, n_support = arrays["folded_support_vectors"].shape
+    n_numeric = len(metadata["numeric_features"])
+    if arrays["support_sq_norms"].shape != (n_support,) or arrays["dual_coef"].shape != (n_support,):
+        raise ValueError("Artefato inconsistente: número de vetores de suporte diverge entre os arrays")
+    if arrays["mean"].shape != (n_numeric,) or arrays["scale"].shape != (n_numeric,):
+        raise ValueError("Artefato inconsistente: parâmetros do scaler não batem com as features numéricas")
+    if n_numeric + sum(len(c) for c in metadata["category_index"].values()) != n_transformed:
+        raise ValueError("Artefato inconsistente: colunas transformadas não batem com as features")
+    # Sem essa checagem, um array em outra precisão seria copiado para o heap, sem mmap
+    precision = metadata.get("precision", "float64")
+    kernel_arrays = ("folded_support_vectors", "support_sq_norms", "dual_coef")
+    if any(arrays[attribute].dtype != np.dtype(precision) for attribute in kernel_arrays):
+        raise ValueError(f"Artefato inconsistente: arrays do kernel não estão em {precision}")
+
+    return CompiledModel(
+        numeric_features=metadata["numeric_features"],
+        categorical_features=metadata["categorical_features"],
+        category_index=metadata["category_index"],
+        intercept=metadata["intercept"],
+        gamma=metadata["gamma"],
+        prob_a=metadata["prob_a"],
+        prob_b=metadata["prob_b"],
+        classes=np.asarray(metadata["classes"]),
+        # Artefatos gravados antes do modelo aproximado são sempre do SVC (Platt)
+        calibration=metadata.get("calibration", "platt"),
+        precision=precision,
+        **arrays,
+    )
+
+
+def main():
+    import joblib
+    from src.model.model import MODEL_EXPORT_PATH, MODEL_PATH
+    from src.model.prediction_cache import artifact_fingerprint
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH, help="pipeline .joblib de origem")
+    parser.add_argument("--output", type=Path, default=MODEL_EXPORT_PATH, help="diretório de saída")
+    parser.add_argument("--precision", choices=PRECISIONS, default="float64", help="precisão dos arrays do kernel")
+    args = parser.parse_args()
+
+    compiled = CompiledModel.from_pipeline(joblib.load(args.model)).with_precision(args.precision)
+    directory = export_compiled_model(compiled, args.output, artifact_fingerprint(args.model))
+    print(f"Artefato de serving gravado em {directory}")
+
+
+if __name__ == "__main__":
+    main()
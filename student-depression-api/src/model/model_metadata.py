@@ -0,0 +1,54 @@
+"""
+Metadados que acompanham o .joblib (student-depression-svm.metadata.json):
+métricas e tempos do treinamento (src/model/train.py) e a importância das
+features calculada offline (src/model/feature_importance.py), lida pela API
+junto com o modelo.
+
+Só usa a biblioteca padrão, para funcionar também no modo enxuto.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def metadata_path(model_path: Path) -> Path:
+    """
+    Arquivo de metadados que acompanha o .joblib
+    """
+    return Path(model_path).with_suffix(".metadata.json")
+
+
+def read_metadata(path: Path) -> dict:
+    """
+    Metadados gravados em path ({} se o arquivo não existir)
+    """
+    try:
+        with open(path, encoding="utf-8") as source:
+            return json.load(source)
+    except FileNotFoundError:
+        return {}
+
+
+def write_metadata(path: Path, metadata: dict):
+    """
+    Grava os metadados de uma vez (arquivo temporário + rename), para que a
+    API nunca leia um arquivo pela metade
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "w", encoding="utf-8") as output:
+        json.dump(metadata, output, ensure_ascii=False, indent=2)
+    os.replace(temporary, path)
+
+
+def feature_importance_for(metadata: dict, fingerprint: Optional[str]) -> Optional[Dict[str, float]]:
+    """
+    Importância (%) de cada coluna do modelo, se os metadados tiverem sido
+    calculados para o artefato com esse fingerprint
+    """
+    section = metadata.get("feature_importance")
+    if not section or fingerprint is None or section.get("model_fingerprint") != fingerprint:
+        return None
+    return {feature: values["percent"] for feature, values in section["importances"].items()}
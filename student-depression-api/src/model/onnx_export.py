@@ -0,0 +1,81 @@
+"""
+Exporta o pipeline .joblib (pré-processador + SVC com probabilidades) para
+ONNX, avaliado pelo backend "onnx" (SCORING_MODE=onnx) com o ONNX Runtime na CPU.
+
+Cada coluna do pipeline vira uma entrada do grafo: double [N, 1] para as
+numéricas e string [N, 1] para as categóricas. O conversor troca espaços e
+"?" nos nomes das entradas, então a ordem das colunas fica gravada nos
+metadados do arquivo, junto com o fingerprint do .joblib de origem.
+
+Precisa do skl2onnx, que só é usado na exportação: pip install skl2onnx
+
+Uso (a partir de student-depression-api/):
+    python -m src.model.onnx_export [--model PIPELINE.joblib] [--output MODELO.onnx]
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import Optional
+
+ONNX_TARGET_OPSET = 17
+
+
+def import_skl2onnx():
+    try:
+        import skl2onnx
+    except ImportError:
+        raise RuntimeError("A exportação para ONNX precisa do skl2onnx: pip install skl2onnx") from None
+    return skl2onnx
+
+
+def export_onnx(pipeline, path: Path, source_fingerprint: Optional[str] = None) -> Path:
+    """
+    Converte o pipeline e grava o arquivo .onnx; retorna o caminho
+    """
+    skl2onnx = import_skl2onnx()
+    from skl2onnx.common.data_types import DoubleTensorType, StringTensorType
+
+    numeric = {
+        feature
+        for name, _, features in pipeline.named_steps["preprocessor"].transformers_
+        if name == "num"
+        for feature in features
+    }
+    columns = list(pipeline.feature_names_in_)
+    initial_types = [
+        (column, DoubleTensorType([None, 1]) if column in numeric else StringTensorType([None, 1]))
+        for column in columns
+    ]
+    # zipmap=False: probabilidades como tensor [N, 2], não lista de dicionários
+    onnx_model = skl2onnx.convert_sklearn(
+        pipeline,
+        initial_types=initial_types,
+        options={id(pipeline.steps[-1][1]): {"zipmap": False}},
+        target_opset=ONNX_TARGET_OPSET,
+    )
+    for key, value in (("columns", json.dumps(columns)), ("source_fingerprint", source_fingerprint or "")):
+        entry = onnx_model.metadata_props.add()
+        entry.key, entry.value = key, value
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(onnx_model.SerializeToString())
+    return path
+
+
+def main():
+    import joblib
+    from src.model.model import MODEL_ONNX_PATH, MODEL_PATH
+    from src.model.prediction_cache import artifact_fingerprint
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH, help="pipeline .joblib de origem")
+    parser.add_argument("--output", type=Path, default=MODEL_ONNX_PATH, help="arquivo .onnx de saída")
+    args = parser.parse_args()
+
+    path = export_onnx(joblib.load(args.model), args.output, artifact_fingerprint(args.model))
+    print(f"Modelo ONNX gravado em {path}")
+
+
+if __name__ == "__main__":
+    main()
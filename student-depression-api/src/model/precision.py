@@ -0,0 +1,98 @@
+"""
+Relatório de paridade do CompiledModel em float32 contra o float64, em dados
+separados (por padrão, a parte de teste da divisão do treinamento): maior
+desvio das probabilidades e da margem e as linhas cujo rótulo muda.
+
+Em float32 ficam os vetores de suporte, as normas, os coeficientes duais e a
+entrada codificada; a matriz do kernel é calculada em float32 e só a
+calibração (Platt ou sigmoide) volta para float64. O erro dominante é a soma
+kernel · coeficientes em float32, sobre milhares de vetores de suporte.
+
+Uso (a partir de student-depression-api/):
+    python -m src.model.precision --data student_depression_dataset.csv [--model PIPELINE.joblib] [--all-rows]
+"""
+import argparse
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.model.compiled_model import PRECISIONS, CompiledModel
+from src.model.feature_importance import SCORE_CHUNK_ROWS, encode_frame, load_holdout
+
+# Linhas com rótulo trocado listadas no relatório (o total vai em label_flips)
+MAX_FLIPPED_ROWS = 20
+
+
+def chunked_outputs(compiled: CompiledModel, X: pd.DataFrame):
+    """
+    Margens, rótulos e probabilidades de X, em blocos de SCORE_CHUNK_ROWS linhas
+    """
+    encoded, sq_norms = encode_frame(compiled, X)
+    decisions, labels, probabilities = [], [], []
+    for start in range(0, len(X), SCORE_CHUNK_ROWS):
+        stop = start + SCORE_CHUNK_ROWS
+        decision = compiled.decision_function(encoded[start:stop], sq_norms[start:stop])
+        chunk_labels, chunk_probabilities = compiled.outputs(decision)
+        decisions.append(np.asarray(decision, dtype=np.float64))
+        labels.append(chunk_labels)
+        probabilities.append(chunk_probabilities)
+    return np.concatenate(decisions), np.concatenate(labels), np.concatenate(probabilities)
+
+
+def parity_report(reference: CompiledModel, candidate: CompiledModel, X: pd.DataFrame) -> dict:
+    """
+    Compara as saídas de candidate (ex.: float32) com as de reference em X
+    """
+    reference_decision, reference_labels, reference_probabilities = chunked_outputs(reference, X)
+    decision, labels, probabilities = chunked_outputs(candidate, X)
+    deviation = np.abs(probabilities[:, 1] - reference_probabilities[:, 1])
+    flipped = np.flatnonzero(labels != reference_labels)
+    return {
+        "reference_precision": reference.precision,
+        "precision": candidate.precision,
+        "rows": int(len(X)),
+        "max_probability_deviation": float(deviation.max(initial=0.0)),
+        "mean_probability_deviation": float(deviation.mean()) if len(X) else 0.0,
+        "max_decision_deviation": float(np.abs(decision - reference_decision).max(initial=0.0)),
+        "label_flips": int(len(flipped)),
+        "flipped_rows": [
+            {
+                "row": int(row),
+                "reference_decision": float(reference_decision[row]),
+                "decision": float(decision[row]),
+                "reference_probability": float(reference_probabilities[row, 1]),
+                "probability": float(probabilities[row, 1]),
+            }
+            for row in flipped[:MAX_FLIPPED_ROWS]
+        ],
+    }
+
+
+def main():
+    import joblib
+    from src.model.model import MODEL_PATH
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", type=Path, required=True, help="CSV do Student Depression Dataset")
+    parser.add_argument("--model", type=Path, default=MODEL_PATH, help="pipeline .joblib avaliado")
+    parser.add_argument("--precision", choices=PRECISIONS, default="float32", help="precisão comparada com float64")
+    parser.add_argument("--all-rows", action="store_true", help="usa o arquivo inteiro como conjunto separado")
+    parser.add_argument("--output", type=Path, default=None, help="grava o relatório em JSON")
+    args = parser.parse_args()
+
+    reference = CompiledModel.from_pipeline(joblib.load(args.model))
+    X, _ = load_holdout(args.data, args.all_rows)
+    report = parity_report(reference, reference.with_precision(args.precision), X)
+
+    print(f"{report['precision']} x {report['reference_precision']} em {report['rows']} linhas")
+    print(f"Maior desvio da probabilidade: {report['max_probability_deviation']:.2e} (média {report['mean_probability_deviation']:.2e})")
+    print(f"Maior desvio da margem: {report['max_decision_deviation']:.2e}")
+    print(f"Rótulos trocados: {report['label_flips']}")
+    for flip in report["flipped_rows"]:
+        print(f"  linha {flip['row']}: margem {flip['reference_decision']:+.2e} -> {flip['decision']:+.2e}")
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+# Cache em memória das respostas de /model/predict
+PREDICTION_CACHE_ENABLED = os.getenv("PREDICTION_CACHE_ENABLED", "true").lower() == "true"
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "4096"))
+# Tempo de vida das entradas em segundos (0 = sem expiração)
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "0"))
+
+# Campos do PredictionRequest, na ordem usada pela chave canônica
+REQUEST_KEY_FIELDS = (
+    "gender", "age", "academic_pressure", "cgpa", "study_satisfaction", "sleep_duration",
+    "dietary_habits", "suicidal_thoughts", "work_study_hours", "financial_stress", "family_history",
+)
+
+
+def request_cache_key(request) -> tuple:
+    """
+    Forma canônica de uma requisição: os valores já validados pelo Pydantic, em ordem fixa
+    """
+    return tuple(getattr(request, field) for field in REQUEST_KEY_FIELDS)
+
+
+def artifact_fingerprint(path: Path) -> Optional[str]:
+    """
+    Identifica o conteúdo do artefato do modelo; muda quando o arquivo muda
+    """
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+    except OSError:
+        return None
+
+
+# Versão de um cache que ainda não recebeu nenhuma leitura nem escrita
+_NO_VERSION = object()
+
+
+def _consume_exception(task: "asyncio.Task"):
+    # Marca a exceção como consumida caso ninguém esteja aguardando
+    if not task.cancelled():
+        task.exception()
+
+
+class PredictionCache:
+    """
+    Cache LRU com TTL opcional e deduplicação de requisições em andamento
+    (single-flight): requisições idênticas concorrentes aguardam a mesma
+    avaliação do modelo. Todo o conteúdo é descartado quando a versão do
+    modelo muda; valores calculados com uma versão anterior à troca não
+    entram no cache.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = PREDICTION_CACHE_SIZE,
+        ttl: float = PREDICTION_CACHE_TTL,
+        time_fn: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._time = time_fn
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._version = _NO_VERSION
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.deduplicated = 0
+        self.invalidations = 0
+        self.stale_discarded = 0
+
+    def _check_version(self, version: Hashable):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: Hashable, version: Hashable = None) -> Optional[Any]:
+        self._check_version(version)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and self._time() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any, version: Hashable = None):
+        # Só uma leitura troca a versão: uma avaliação iniciada antes da troca
+        # do modelo e terminada depois não pode devolver o cache à versão antiga
+        if self._version is _NO_VERSION:
+            self._version = version
+        elif version != self._version:
+            self.stale_discarded += 1
+            return
+        expires_at = self._time() + self.ttl if self.ttl > 0 else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]], version: Hashable = None) -> Any:
+        value = self.get(key, version)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        # Avaliações em andamento de outra versão do modelo não são reaproveitadas
+        inflight_key = (version, key)
+        inflight = self._inflight.get(inflight_key)
+        if inflight is not None:
+            self.deduplicated += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        # A avaliação roda numa task própria, que cada requisição só aguarda
+        # através de shield: se quem a iniciou for cancelado (timeout ou
+        # desconexão do cliente), as requisições deduplicadas continuam
+        # recebendo o valor
+        task = asyncio.ensure_future(self._compute(key, compute, version))
+        task.add_done_callback(_consume_exception)
+        self._inflight[inflight_key] = task
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]], version: Hashable) -> Any:
+        try:
+            value = await compute()
+            self.put(key, value, version)
+            return value
+        finally:
+            self._inflight.pop((version, key), None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.deduplicated
+        return {
+            "enabled": PREDICTION_CACHE_ENABLED,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "deduplicated": self.deduplicated,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "stale_discarded": self.stale_discarded,
+            "in_flight": len(self._inflight),
+            "hit_rate": (self.hits + self.deduplicated) / lookups if lookups else 0.0,
+        }
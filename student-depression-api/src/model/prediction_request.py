@@ -1,6 +1,9 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 class PredictionRequest(BaseModel):
+    # NaN e infinito não são respostas válidas (o SVC devolveria uma predição sem sentido)
+    model_config = ConfigDict(allow_inf_nan=False)
+
     gender: str
     age: int
     academic_pressure: int = Field(alias='academic_pressure')
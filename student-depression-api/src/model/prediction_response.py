@@ -1,8 +1,27 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any
+from pydantic import BaseModel, ConfigDict
+from typing import List, Literal
+
+class FeatureFeedback(BaseModel):
+    model_config = ConfigDict(strict=True, extra='forbid')
+
+    feature: str
+    user_value: str
+    importance: float
+    impact_level: Literal['BAIXO', 'MODERADO', 'ALTO', 'MUITO ALTO', 'CRÍTICO']
+    message: str
+    context: str
 
 class PredictionResponse(BaseModel):
     prediction: int
     probability: List[float]
     depression_risk: str
-    feature_feedback: List[Dict[str, Any]]
\ No newline at end of file
+    feature_feedback: List[FeatureFeedback]
+
+class FeatureContribution(BaseModel):
+    feature: str
+    model_feature: str
+    contribution: float
+    reference_probability: float
+
+class ExplainedPredictionResponse(PredictionResponse):
+    explanation: List[FeatureContribution]
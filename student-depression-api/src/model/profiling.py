@@ -0,0 +1,126 @@
+"""
+Perfil (cProfile) de uma fração das requisições, ligado por variável de ambiente.
+
+Uma requisição sorteada é perfilada no event loop e também nas threads de
+inferência que trabalham para ela; os perfis são somados e gravados em
+PROFILING_DIR no formato do pstats (.prof), que abre com
+`python -m pstats arquivo.prof` ou ferramentas como o snakeviz.
+
+Com PROFILING_ENABLED=false o middleware só repassa a requisição.
+"""
+import cProfile
+import itertools
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+# Fração das requisições perfiladas (0.01 = 1%)
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0.01"))
+PROFILING_DIR = Path(os.getenv("PROFILING_DIR", "profiles"))
+
+
+class ProfileSession:
+    """Perfis coletados para uma requisição, em uma ou mais threads."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def run(self, fn: Callable, *args):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Outro profiler já ativo nesta thread/interpretador: roda sem perfilar
+            return fn(*args)
+        try:
+            return fn(*args)
+        finally:
+            profile.disable()
+            with self._lock:
+                self.profiles.append(profile)
+
+    def dump(self, directory: Path) -> Optional[Path]:
+        with self._lock:
+            profiles = list(self.profiles)
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_sequence)}-{self.label}.prof"
+        stats.dump_stats(path)
+        return path
+
+
+_sequence = itertools.count()
+
+# Só uma requisição é perfilada por vez: perfis sobrepostos no event loop se atrapalham
+_sampling = threading.Lock()
+
+# Sessão da requisição perfilada em andamento (propagada para as threads de inferência)
+_active: ContextVar[Optional[ProfileSession]] = ContextVar("profile_session", default=None)
+
+
+def active_session() -> Optional[ProfileSession]:
+    return _active.get() if PROFILING_ENABLED else None
+
+
+def should_sample() -> bool:
+    return random.random() < PROFILING_SAMPLE_RATE
+
+
+def session_label(path: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que perfila as requisições sorteadas. O perfil do event
+    loop pode incluir trechos de outras requisições concorrentes.
+    """
+
+    def __init__(self, app, directory: Optional[Path] = None):
+        self.app = app
+        self.directory = directory
+
+    async def __call__(self, scope, receive, send):
+        if not PROFILING_ENABLED or scope["type"] != "http" or not should_sample():
+            await self.app(scope, receive, send)
+            return
+        if not _sampling.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        session = ProfileSession(session_label(scope["path"]))
+        token = _active.set(session)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            profile = None
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if profile is not None:
+                profile.disable()
+                session.profiles.append(profile)
+            _active.reset(token)
+            _sampling.release()
+            try:
+                path = session.dump(self.directory or PROFILING_DIR)
+                logger.info("Perfil da requisição gravado em %s", path)
+            except OSError:
+                logger.exception("Erro ao gravar o perfil da requisição")
@@ -1,19 +1,167 @@
+import gzip
+import hashlib
 import json
-from fastapi import APIRouter, HTTPException
+import logging
+import os
+import threading
+from fastapi import APIRouter, HTTPException, Request, Response
 from pathlib import Path
+from typing import Optional
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+QUESTIONS_PATH = Path(__file__).parent.parent / "data" / "questions.json"
+# Intervalo (s) em que o mtime de questions.json é verificado para recarregar o arquivo
+QUESTIONS_WATCH_INTERVAL = float(os.getenv("QUESTIONS_WATCH_INTERVAL", "2"))
+QUESTIONS_CACHE_CONTROL = os.getenv("QUESTIONS_CACHE_CONTROL", "public, max-age=60, must-revalidate")
+
+
+class QuestionsSnapshot:
+    """Versão imutável de questions.json pronta para ser servida."""
+
+    def __init__(self, questions: list, mtime_ns: int):
+        self.questions = questions
+        self.mtime_ns = mtime_ns
+        # Mesmo formato gerado pelo JSONResponse do FastAPI
+        self.body = json.dumps(questions, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        # Cada representação tem o seu ETag forte: os bytes servidos são diferentes
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+
+def validate_questions(questions) -> list:
+    if not isinstance(questions, list):
+        raise ValueError("questions.json deve conter uma lista de questões")
+    for position, question in enumerate(questions):
+        if not isinstance(question, dict) or "type" not in question or "id" not in question.get("data", {}):
+            raise ValueError(f"Questão {position} sem 'type' ou 'data.id'")
+    return questions
+
+
+class QuestionsStore:
+    """
+    Mantém questions.json em memória. O arquivo é lido e validado uma vez e
+    uma thread em segundo plano observa o mtime para recarregá-lo quando for
+    editado; a rota só lê o snapshot atual, sem acessar o disco.
+    """
+
+    def __init__(self, path: Path = QUESTIONS_PATH, watch_interval: float = QUESTIONS_WATCH_INTERVAL):
+        self.path = path
+        self.watch_interval = watch_interval
+        self.snapshot: Optional[QuestionsSnapshot] = None
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def load(self) -> QuestionsSnapshot:
+        with self._lock:
+            mtime_ns = self.path.stat().st_mtime_ns
+            with open(self.path, "r", encoding="utf-8") as f:
+                questions = validate_questions(json.load(f))
+            self.snapshot = QuestionsSnapshot(questions, mtime_ns)
+            self.reloads += 1
+            return self.snapshot
+
+    def reload_if_changed(self) -> bool:
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except OSError:
+            # Arquivo removido ou inacessível: continua servindo a última versão válida
+            return False
+        if self.snapshot is not None and mtime_ns == self.snapshot.mtime_ns:
+            return False
+        try:
+            self.load()
+            return True
+        except Exception:
+            logger.warning("Erro ao recarregar %s, mantendo a versão anterior", self.path, exc_info=True)
+            return False
+
+    def start_watching(self):
+        if self._watcher is not None or self.watch_interval <= 0:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="questions-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        self._watcher = None
+
+    def _watch(self):
+        while not self._stop.wait(self.watch_interval):
+            self.reload_if_changed()
+
+    def current(self) -> QuestionsSnapshot:
+        snapshot = self.snapshot
+        if snapshot is None:
+            # Primeira requisição antes da inicialização da aplicação
+            snapshot = self.load()
+            self.start_watching()
+        return snapshot
+
+
+questions_store = QuestionsStore()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    Se o Accept-Encoding aceita gzip: a codificação "gzip" (ou "*", quando gzip
+    não aparece) com q > 0. "gzip;q=0" recusa a compressão.
+    """
+    if not accept_encoding:
+        return False
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
 
 
 @router.get("")
-async def get_questions():
+async def get_questions(request: Request):
     """Retorna todas as questions do arquivo questions.json"""
-    questions_path = Path(__file__).parent.parent / "data" / "questions.json"
-    if not questions_path.exists():
-        raise HTTPException(status_code=404, detail="Arquivo questions.json não encontrado.")
     try:
-        with open(questions_path, "r", encoding="utf-8") as f:
-            questions = json.load(f)
-        return questions
+        snapshot = questions_store.current()
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Arquivo questions.json não encontrado.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao ler questions.json: {str(e)}")
+
+    gzipped = accepts_gzip(request.headers.get("accept-encoding"))
+    etag = snapshot.gzip_etag if gzipped else snapshot.etag
+    headers = {
+        "ETag": etag,
+        "Cache-Control": QUESTIONS_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=snapshot.gzip_body, media_type="application/json", headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
@@ -0,0 +1,66 @@
+import os
+from typing import Tuple
+import numpy as np
+from src.model.libsvm_probability import svc_outputs
+
+# "compiled" usa o CompiledModel (NumPy puro, sem pandas/sklearn por requisição);
+# "single_pass" roda o pré-processador e o kernel uma única vez por chamada;
+# "pipeline" mantém o comportamento antigo (model.predict + model.predict_proba);
+# "onnx" usa o pipeline exportado para ONNX, no ONNX Runtime (ver backends.py)
+SCORING_MODE = os.getenv("SCORING_MODE", "compiled")
+
+
+def supports_single_pass(model) -> bool:
+    """
+    Verifica se o modelo é o pipeline pré-processador + SVC binário com probabilidades
+    """
+    if model is None:
+        return False
+    # Importado aqui para não carregar o scikit-learn quando só o artefato NumPy é usado
+    from sklearn.pipeline import Pipeline
+    from sklearn.svm import SVC
+
+    if not isinstance(model, Pipeline):
+        return False
+    classifier = model.steps[-1][1]
+    return (
+        isinstance(classifier, SVC)
+        and classifier.probability
+        and len(classifier.classes_) == 2
+        and len(classifier.probA_) == 1
+    )
+
+
+def is_approximate(model) -> bool:
+    """
+    Verifica se o modelo é o pipeline aproximado (Nyström + classificador
+    linear calibrado) gerado por python -m src.model.train --approximate N
+    """
+    if model is None:
+        return False
+    from sklearn.pipeline import Pipeline
+
+    return isinstance(model, Pipeline) and "feature_map" in model.named_steps
+
+
+def supports_compilation(model) -> bool:
+    """
+    Verifica se o CompiledModel representa o modelo: o SVC do single_pass ou o pipeline aproximado
+    """
+    return supports_single_pass(model) or is_approximate(model)
+
+
+def predict_with_proba(model, X) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Retorna (predições, probabilidades) para X.
+
+    Fora do modo "pipeline", o pré-processador e o kernel RBF são avaliados
+    uma única vez; para qualquer outro modelo (ou modo "pipeline") usa predict
+    e predict_proba do próprio modelo.
+    """
+    if SCORING_MODE == "pipeline" or not supports_single_pass(model):
+        return model.predict(X), model.predict_proba(X)
+
+    transformed = model[:-1].transform(X)
+    svc = model.steps[-1][1]
+    return svc_outputs(svc.decision_function(transformed), svc.classes_, svc.probA_[0], svc.probB_[0])
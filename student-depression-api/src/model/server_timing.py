@@ -0,0 +1,57 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+# Envia o header Server-Timing com as etapas de /model/predict
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+
+
+class RequestTimings:
+    """Duração acumulada de cada etapa de uma única requisição."""
+
+    __slots__ = ("started", "stages")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def merge(self, other: "RequestTimings"):
+        for name, seconds in other.stages.items():
+            self.add(name, seconds)
+
+    def header_value(self) -> str:
+        """
+        Valor do header Server-Timing, com as durações em milissegundos
+        """
+        entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.stages.items()]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.3f}")
+        return ", ".join(entries)
+
+
+# Etapas da requisição em andamento; propagado para as threads de inferência
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("server_timings", default=None)
+
+
+def begin() -> Optional[RequestTimings]:
+    """
+    Passa a coletar as etapas da requisição atual (None se o header estiver desligado)
+    """
+    if not SERVER_TIMING_ENABLED:
+        return None
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def current() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def record(name: str, seconds: float):
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, seconds)
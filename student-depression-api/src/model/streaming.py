@@ -0,0 +1,130 @@
+import csv
+import os
+from collections import deque
+from typing import AsyncIterator, List, Optional
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+
+# Linhas pontuadas por vez no endpoint de streaming; a memória usada é proporcional a isso
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "500"))
+# Tamanho máximo de uma linha do upload; linhas maiores viram erro na própria linha
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", "16384"))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-lines"}
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+
+
+def upload_format(content_type: Optional[str]) -> Optional[str]:
+    """
+    "ndjson" ou "csv" a partir do Content-Type do upload (None se não suportado)
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in NDJSON_CONTENT_TYPES:
+        return "ndjson"
+    if media_type in CSV_CONTENT_TYPES:
+        return "csv"
+    return None
+
+
+class LineTooLong:
+    """Marca uma linha descartada por passar de STREAM_MAX_LINE_BYTES."""
+
+    def __init__(self, size: int):
+        self.size = size
+
+
+class LineReader:
+    """
+    Lê o corpo da requisição linha a linha, sem carregá-lo inteiro na memória.
+    No máximo uma linha incompleta (limitada a max_line_bytes) fica em buffer.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], max_line_bytes: int = STREAM_MAX_LINE_BYTES):
+        self._chunks = chunks.__aiter__()
+        self.max_line_bytes = max_line_bytes
+        self._buffer = bytearray()
+        self._lines = deque()
+        self._discarding = 0
+        self._eof = False
+
+    async def readline(self):
+        """
+        Próxima linha (bytes sem o terminador), LineTooLong ou None no fim do corpo
+        """
+        while not self._lines:
+            if self._eof:
+                return None
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self._finish()
+                continue
+            self._feed(chunk)
+        return self._lines.popleft()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        line = await self.readline()
+        if line is None:
+            raise StopAsyncIteration
+        return line
+
+    def _feed(self, chunk: bytes):
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            if newline < 0:
+                self._append(chunk[start:])
+                return
+            self._append(chunk[start:newline])
+            self._end_line()
+            start = newline + 1
+
+    def _append(self, data: bytes):
+        if self._discarding:
+            self._discarding += len(data)
+        elif len(self._buffer) + len(data) > self.max_line_bytes:
+            self._discarding = len(self._buffer) + len(data)
+            self._buffer.clear()
+        else:
+            self._buffer += data
+
+    def _end_line(self):
+        if self._discarding:
+            self._lines.append(LineTooLong(self._discarding))
+            self._discarding = 0
+        else:
+            self._lines.append(bytes(self._buffer).rstrip(b"\r"))
+            self._buffer.clear()
+
+    def _finish(self):
+        self._eof = True
+        if self._buffer or self._discarding:
+            self._end_line()
+
+
+def parse_csv_line(line: bytes) -> List[str]:
+    """
+    Campos de uma linha CSV (campos entre aspas não podem conter quebras de linha)
+    """
+    return next(csv.reader([line.decode("utf-8-sig")]), [])
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse que não escuta desconexões em paralelo. O gerador lê o
+    corpo da requisição enquanto escreve a resposta, e a escuta em paralelo
+    do StreamingResponse consumiria as mensagens do corpo; a desconexão do
+    cliente já aparece como ClientDisconnect na leitura do corpo.
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,537 @@
+"""
+Treinamento reprodutível do modelo servido pela API, a partir do CSV do
+Student Depression Dataset (Kaggle), no lugar das células do notebook
+model/terappia_model.ipynb.
+
+Etapas:
+- o mesmo tratamento de dados do notebook (colunas removidas, limpeza e
+  tradução para o português usado pelo questionário);
+- busca de C/gamma do SVC RBF com successive halving (HalvingGridSearchCV),
+  em paralelo em todos os núcleos. O ColumnTransformer ajustado em cada
+  fold é cacheado (Pipeline(memory=...)) e reaproveitado pelos candidatos;
+- os candidatos são avaliados sem probabilidades (probability=False evita as
+  5 validações cruzadas internas do libsvm por ajuste); só o modelo final é
+  ajustado uma vez com calibração (Platt, probability=True), no formato que o
+  CompiledModel e o modo single_pass da API esperam;
+- importância das features por permutação na parte de teste
+  (src/model/feature_importance.py), lida pela API junto com o modelo;
+- gravação do pipeline .joblib, do artefato de serving (model_export) e de um
+  arquivo de metadados com métricas e tempos;
+- opcionalmente (--approximate N), um modelo aproximado: Nyström com N
+  componentes (mesmo kernel RBF e gamma do SVC escolhido) + LinearSVC com
+  calibração sigmoide. O custo da predição passa a ser fixo em N linhas do
+  kernel, em vez de um por vetor de suporte. Ele é comparado com o SVC exato
+  na mesma parte de teste e só é gravado se a perda de acurácia e de recall
+  não passar de --max-accuracy-loss;
+- com --precision float32, os artefatos de serving são gravados em float32 e
+  o relatório de paridade contra o float64 na parte de teste
+  (src/model/precision.py) vai para os metadados;
+- o substituto da pontuação em cascata (regressão logística destilada das
+  probabilidades do SVC na parte de treino, src/model/distillation.py),
+  gravado ao lado do .joblib, com o relatório de fidelidade na parte de teste
+  (concordância com o SVC e fração escalada, na faixa --cascade-band).
+
+Uso (a partir de student-depression-api/):
+    python -m src.model.train --data student_depression_dataset.csv [--jobs -1] [--baselines]
+    python -m src.model.train --data student_depression_dataset.csv --approximate 500 [--max-accuracy-loss 0.01]
+"""
+import argparse
+import hashlib
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.compose import ColumnTransformer
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.metrics import accuracy_score, brier_score_loss, f1_score, log_loss, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import HalvingGridSearchCV, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.kernel_approximation import Nystroem
+from sklearn.svm import SVC, LinearSVC
+from src.model.cascade import CASCADE_BAND_HIGH, CASCADE_BAND_LOW, surrogate_path
+from src.model.compiled_model import PRECISIONS, CompiledModel
+from src.model.distillation import SURROGATE_C, distill_surrogate, fidelity_report
+from src.model.precision import parity_report
+from src.model.feature_importance import DEFAULT_REPEATS, permutation_importance
+from src.model.model_export import export_compiled_model
+from src.model.model_metadata import metadata_path, write_metadata
+from src.model.prediction_cache import artifact_fingerprint
+
+METADATA_FORMAT_VERSION = 1
+RANDOM_STATE = 42
+TEST_SIZE = 0.3
+
+CATEGORICAL_FEATURES = ['Gender', 'Sleep Duration', 'Dietary Habits', 'Have you ever had suicidal thoughts ?', 'Family History of Mental Illness']
+NUMERICAL_FEATURES = ['Age', 'CGPA', 'Study Satisfaction', 'Academic Pressure', 'Financial Stress', 'Work/Study Hours']
+
+# Colunas do dataset original que o questionário não coleta
+DROPPED_COLUMNS = ['id', 'City', 'Degree', 'Job Satisfaction', 'Work Pressure', 'Profession']
+
+# Tradução dos valores do dataset para os usados pelo questionário e pela API
+VALUE_MAPPERS = {
+    'Gender': {'Male': 'Masculino', 'Female': 'Feminino'},
+    'Sleep Duration': {
+        "'5-6 hours'": "5-6 horas",
+        "'Less than 5 hours'": "Menos de 5 horas",
+        "'7-8 hours'": "7-8 horas",
+        "'More than 8 hours'": "Mais de 8 horas",
+    },
+    'Dietary Habits': {'Healthy': 'Muito saudáveis', 'Moderate': 'Moderadamente saudáveis', 'Unhealthy': 'Pouco saudáveis'},
+    'Have you ever had suicidal thoughts ?': {'Yes': 'Sim', 'No': 'Não'},
+    'Family History of Mental Illness': {'Yes': 'Sim', 'No': 'Não'},
+}
+
+# Grade da busca: o notebook usava os padrões do SVC (C=1, gamma='scale')
+DEFAULT_C_GRID = [0.1, 0.3, 1.0, 3.0, 10.0]
+DEFAULT_GAMMA_GRID = ['scale', 0.01, 0.03, 0.1, 0.3]
+
+# Modelo aproximado: perda máxima (SVC exato - aproximado) aceita em cada métrica
+DEFAULT_MAX_ACCURACY_LOSS = 0.01
+GATED_METRICS = ('accuracy', 'recall')
+CALIBRATION_FOLDS = 5
+
+
+def prepare_dataset(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Aplica o tratamento do notebook e retorna (X, y) com as colunas na ordem
+    de feature_names_in_ do modelo em produção
+    """
+    df = df.rename(columns={'Depression': 'target'})
+    df = df.drop(columns=[column for column in DROPPED_COLUMNS if column in df.columns])
+    df = df[df['Financial Stress'].astype(str) != '?']
+    df = df.dropna().copy()
+    for column, mapper in VALUE_MAPPERS.items():
+        df[column] = df[column].map(mapper)
+    # Valores fora dos mapeamentos (ex.: outro gênero) viram NaN e são removidos, como no notebook
+    df = df.dropna()
+    df['Financial Stress'] = df['Financial Stress'].astype(float)
+
+    X = df.drop(columns='target')
+    y = df['target'].astype(int)
+    return X, y
+
+
+def build_pipeline(C: float = 1.0, gamma='scale', probability: bool = False, memory=None) -> Pipeline:
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), NUMERICAL_FEATURES),
+            ('cat', OneHotEncoder(handle_unknown='ignore'), CATEGORICAL_FEATURES),
+        ],
+        remainder='passthrough'
+    )
+    return Pipeline(
+        steps=[
+            ('preprocessor', preprocessor),
+            ('classifier', SVC(kernel='rbf', C=C, gamma=gamma, probability=probability, random_state=RANDOM_STATE)),
+        ],
+        memory=memory,
+    )
+
+
+def build_approximate_pipeline(components: int, gamma: float) -> Pipeline:
+    """
+    Pré-processador do SVC + Nyström (RBF) + LinearSVC com calibração
+    sigmoide. ensemble=False ajusta um único LinearSVC em todas as linhas e
+    uma única sigmoide nas margens da validação cruzada, como o Platt do
+    SVC(probability=True), no formato que o CompiledModel entende.
+    """
+    pipeline = build_pipeline()
+    pipeline.steps[-1:] = [
+        ('feature_map', Nystroem(kernel='rbf', gamma=gamma, n_components=components, random_state=RANDOM_STATE)),
+        ('classifier', CalibratedClassifierCV(
+            LinearSVC(random_state=RANDOM_STATE), method='sigmoid', cv=CALIBRATION_FOLDS, ensemble=False,
+        )),
+    ]
+    return pipeline
+
+
+def approximate_model_path(path: Path) -> Path:
+    """
+    Caminho do modelo aproximado ao lado do exato: svm.joblib -> svm-nystroem.joblib (ou diretório svm -> svm-nystroem)
+    """
+    path = Path(path)
+    return path.with_name(f"{path.stem}-nystroem{path.suffix}")
+
+
+def search_hyperparameters(
+    X: pd.DataFrame,
+    y: pd.Series,
+    c_grid: List[float],
+    gamma_grid: List,
+    jobs: int,
+    folds: int,
+    factor: int,
+    scoring: str,
+    cache_dir: Path,
+) -> HalvingGridSearchCV:
+    """
+    Successive halving sobre C/gamma: todos os candidatos começam com poucas
+    linhas e só os melhores 1/factor seguem para a rodada seguinte, com factor
+    vezes mais linhas. Os folds rodam em paralelo (n_jobs).
+    """
+    search = HalvingGridSearchCV(
+        build_pipeline(memory=joblib.Memory(cache_dir, verbose=0)),
+        param_grid={'classifier__C': c_grid, 'classifier__gamma': gamma_grid},
+        factor=factor,
+        resource='n_samples',
+        cv=StratifiedKFold(n_splits=folds, shuffle=True, random_state=RANDOM_STATE),
+        scoring=scoring,
+        n_jobs=jobs,
+        refit=False,
+        random_state=RANDOM_STATE,
+    )
+    search.fit(X, y)
+    return search
+
+
+def evaluate(pipeline: Pipeline, X: pd.DataFrame, y: pd.Series) -> Dict[str, float]:
+    predictions = pipeline.predict(X)
+    metrics = {
+        'accuracy': accuracy_score(y, predictions),
+        'recall': recall_score(y, predictions),
+        'precision': precision_score(y, predictions),
+        'f1': f1_score(y, predictions),
+    }
+    if hasattr(pipeline, 'predict_proba'):
+        probabilities = pipeline.predict_proba(X)[:, 1]
+        metrics.update({
+            'roc_auc': roc_auc_score(y, probabilities),
+            'brier': brier_score_loss(y, probabilities),
+            'log_loss': log_loss(y, probabilities),
+        })
+    return {name: float(value) for name, value in metrics.items()}
+
+
+def fit_baseline(name: str, X_train, y_train, X_test, y_test) -> Tuple[str, Dict[str, float]]:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.neural_network import MLPClassifier
+
+    classifier = {
+        'random_forest': RandomForestClassifier(random_state=RANDOM_STATE),
+        'mlp': MLPClassifier(random_state=RANDOM_STATE),
+    }[name]
+    pipeline = build_pipeline()
+    pipeline.steps[-1] = ('classifier', classifier)
+    pipeline.fit(X_train, y_train)
+    return name, evaluate(pipeline, X_test, y_test)
+
+
+def fit_baselines(X_train, y_train, X_test, y_test, jobs: int) -> Dict[str, Dict[str, float]]:
+    """
+    Random Forest e MLP do notebook, ajustados em paralelo, só para comparação
+    """
+    results = joblib.Parallel(n_jobs=jobs)(
+        joblib.delayed(fit_baseline)(name, X_train, y_train, X_test, y_test)
+        for name in ('random_forest', 'mlp')
+    )
+    return dict(results)
+
+
+def train_approximate(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    exact: Pipeline,
+    exact_metrics: Dict[str, float],
+    exact_fingerprint: Optional[str],
+    components: int,
+    max_loss: float,
+    model_path: Path,
+    export_path: Optional[Path],
+    importance_repeats: int,
+    jobs: int,
+    precision: str = 'float64',
+) -> dict:
+    """
+    Ajusta o modelo aproximado com o gamma do SVC exato e o compara com ele
+    na parte de teste. Só grava o .joblib, o artefato de serving e os
+    metadados do aproximado se a perda ficar dentro de max_loss; a seção
+    retornada vai para os metadados do modelo exato.
+    """
+    svc = exact.named_steps['classifier']
+    started = time.perf_counter()
+    pipeline = build_approximate_pipeline(components, svc._gamma)
+    pipeline.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+
+    metrics = evaluate(pipeline, X_test, y_test)
+    loss = {metric: exact_metrics[metric] - metrics[metric] for metric in GATED_METRICS}
+    section = {
+        'method': 'nystroem',
+        'components': int(pipeline.named_steps['feature_map'].components_.shape[0]),
+        'exact_support_vectors': int(svc.support_vectors_.shape[0]),
+        'gamma': json_value(svc._gamma),
+        'calibration': 'sigmoid',
+        'metrics': metrics,
+        'loss': loss,
+        'max_loss': max_loss,
+        'accepted': all(value <= max_loss for value in loss.values()),
+        'fit_seconds': fit_seconds,
+        'model_path': None,
+        'model_fingerprint': None,
+    }
+    if not section['accepted']:
+        return section
+
+    model_path = Path(model_path)
+    joblib.dump(pipeline, model_path)
+    fingerprint = artifact_fingerprint(model_path)
+    compiled = CompiledModel.from_pipeline(pipeline)
+    if export_path is not None:
+        export_compiled_model(compiled.with_precision(precision), export_path, fingerprint)
+    importance = permutation_importance(compiled, X_test, y_test, repeats=importance_repeats, jobs=jobs) if importance_repeats else None
+    if importance is not None:
+        importance['model_fingerprint'] = fingerprint
+    section.update(model_path=str(model_path), model_fingerprint=fingerprint)
+
+    write_metadata(metadata_path(model_path), {
+        'format_version': METADATA_FORMAT_VERSION,
+        'trained_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'model_fingerprint': fingerprint,
+        'exact_model_fingerprint': exact_fingerprint,
+        'approximation': section,
+        'metrics': metrics,
+        'feature_importance': importance,
+    })
+    return section
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def json_value(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def train(
+    data_path: Path,
+    model_path: Path,
+    export_path: Optional[Path],
+    c_grid: List[float] = DEFAULT_C_GRID,
+    gamma_grid: List = DEFAULT_GAMMA_GRID,
+    jobs: int = -1,
+    folds: int = 5,
+    factor: int = 3,
+    scoring: str = 'accuracy',
+    baselines: bool = False,
+    cache_dir: Optional[Path] = None,
+    importance_repeats: int = DEFAULT_REPEATS,
+    approximate_components: int = 0,
+    max_accuracy_loss: float = DEFAULT_MAX_ACCURACY_LOSS,
+    precision: str = 'float64',
+    cascade_band: Tuple[float, float] = (CASCADE_BAND_LOW, CASCADE_BAND_HIGH),
+) -> dict:
+    """
+    Treina, avalia e grava o modelo, o substituto da cascata (e o aproximado,
+    com approximate_components > 0). Retorna os metadados gravados.
+    """
+    started = time.perf_counter()
+    X, y = prepare_dataset(pd.read_csv(data_path))
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+
+    with tempfile.TemporaryDirectory(prefix="train-cache-") as temporary:
+        search_started = time.perf_counter()
+        search = search_hyperparameters(
+            X_train, y_train, c_grid, gamma_grid, jobs, folds, factor, scoring, cache_dir or Path(temporary)
+        )
+        search_seconds = time.perf_counter() - search_started
+
+    best_params = search.best_params_
+    final_started = time.perf_counter()
+    # Sem memory=: o pipeline gravado não pode apontar para o cache temporário
+    pipeline = build_pipeline(best_params['classifier__C'], best_params['classifier__gamma'], probability=True)
+    pipeline.fit(X_train, y_train)
+    final_fit_seconds = time.perf_counter() - final_started
+
+    test_metrics = evaluate(pipeline, X_test, y_test)
+    compiled = CompiledModel.from_pipeline(pipeline)
+    importance = permutation_importance(compiled, X_test, y_test, repeats=importance_repeats, jobs=jobs) if importance_repeats else None
+    baseline_metrics = fit_baselines(X_train, y_train, X_test, y_test, jobs) if baselines else None
+
+    model_path = Path(model_path)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(pipeline, model_path)
+    fingerprint = artifact_fingerprint(model_path)
+    if export_path is not None:
+        export_compiled_model(compiled.with_precision(precision), export_path, fingerprint)
+    if importance is not None:
+        importance['model_fingerprint'] = fingerprint
+    precision_report = None if precision == 'float64' else parity_report(compiled, compiled.with_precision(precision), X_test)
+
+    surrogate_started = time.perf_counter()
+    surrogate = distill_surrogate(compiled, X_train, fingerprint)
+    surrogate_fit_seconds = time.perf_counter() - surrogate_started
+    surrogate.save(surrogate_path(model_path))
+    cascade = {
+        'method': 'logistic_regression',
+        'C': SURROGATE_C,
+        'path': str(surrogate_path(model_path)),
+        'fidelity': fidelity_report(compiled, surrogate, X_test, cascade_band),
+    }
+
+    approximation = None
+    if approximate_components:
+        approximation = train_approximate(
+            X_train, y_train, X_test, y_test, pipeline, test_metrics, fingerprint,
+            approximate_components, max_accuracy_loss,
+            approximate_model_path(model_path),
+            None if export_path is None else approximate_model_path(export_path),
+            importance_repeats, jobs, precision,
+        )
+
+    classifier = pipeline.named_steps['classifier']
+    metadata = {
+        'format_version': METADATA_FORMAT_VERSION,
+        'trained_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'model_fingerprint': fingerprint,
+        'dataset': {
+            'path': str(data_path),
+            'sha256': file_sha256(data_path),
+            'rows': int(len(X)),
+            'train_rows': int(len(X_train)),
+            'test_rows': int(len(X_test)),
+            'test_size': TEST_SIZE,
+            'random_state': RANDOM_STATE,
+        },
+        'features': list(X.columns),
+        'search': {
+            'method': 'HalvingGridSearchCV',
+            'scoring': scoring,
+            'folds': folds,
+            'factor': factor,
+            'param_grid': {'C': c_grid, 'gamma': gamma_grid},
+            'candidates': len(search.cv_results_['params']),
+            'iterations': int(search.n_iterations_),
+            'resources_per_iteration': [int(n) for n in search.n_resources_],
+            'best_params': {'C': json_value(best_params['classifier__C']), 'gamma': json_value(best_params['classifier__gamma'])},
+            'best_cv_score': float(search.best_score_),
+        },
+        'model': {
+            'kernel': classifier.kernel,
+            'C': json_value(classifier.C),
+            'gamma': json_value(classifier.gamma),
+            'calibration': 'platt',
+            'n_support': [int(n) for n in classifier.n_support_],
+        },
+        'metrics': test_metrics,
+        'baselines': baseline_metrics,
+        'feature_importance': importance,
+        'approximation': approximation,
+        'precision': precision,
+        'precision_report': precision_report,
+        'cascade': cascade,
+        'timings': {
+            'search_seconds': search_seconds,
+            'final_fit_seconds': final_fit_seconds,
+            'importance_seconds': importance['seconds'] if importance else None,
+            'approximation_fit_seconds': approximation['fit_seconds'] if approximation else None,
+            'surrogate_fit_seconds': surrogate_fit_seconds,
+            'total_seconds': time.perf_counter() - started,
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'scikit_learn': sklearn.__version__,
+            'n_jobs': jobs,
+            'cpu_count': os.cpu_count(),
+        },
+    }
+    write_metadata(metadata_path(model_path), metadata)
+    return metadata
+
+
+def parse_gamma(value: str):
+    return value if value in ('scale', 'auto') else float(value)
+
+
+def main():
+    from src.model.model import MODEL_EXPORT_PATH, MODEL_PATH
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", type=Path, required=True, help="CSV do Student Depression Dataset")
+    parser.add_argument("--model", type=Path, default=MODEL_PATH, help="pipeline .joblib de saída")
+    parser.add_argument("--export", type=Path, default=MODEL_EXPORT_PATH, help="diretório do artefato de serving")
+    parser.add_argument("--no-export", action="store_true", help="não gera o artefato de serving")
+    parser.add_argument("--jobs", type=int, default=-1, help="processos da busca (-1 = todos os núcleos)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--factor", type=int, default=3, help="fator do successive halving")
+    parser.add_argument("--scoring", default="accuracy", help="métrica da busca (ex.: accuracy, recall, roc_auc)")
+    parser.add_argument("--C", dest="c_grid", type=float, nargs="+", default=DEFAULT_C_GRID)
+    parser.add_argument("--gamma", dest="gamma_grid", type=parse_gamma, nargs="+", default=DEFAULT_GAMMA_GRID)
+    parser.add_argument("--baselines", action="store_true", help="treina também Random Forest e MLP para comparação")
+    parser.add_argument("--cache-dir", type=Path, default=None, help="cache do ColumnTransformer (padrão: diretório temporário)")
+    parser.add_argument("--importance-repeats", type=int, default=DEFAULT_REPEATS, help="repetições da importância por permutação (0 = não calcula)")
+    parser.add_argument("--approximate", type=int, default=0, metavar="N", help="treina também o modelo aproximado com N componentes do Nyström")
+    parser.add_argument("--max-accuracy-loss", type=float, default=DEFAULT_MAX_ACCURACY_LOSS, help="perda máxima de acurácia e de recall do modelo aproximado")
+    parser.add_argument("--precision", choices=PRECISIONS, default="float64", help="precisão dos arrays do kernel nos artefatos de serving")
+    parser.add_argument(
+        "--cascade-band", type=float, nargs=2, default=[CASCADE_BAND_LOW, CASCADE_BAND_HIGH], metavar=("BAIXO", "ALTO"),
+        help="faixa de incerteza avaliada no relatório de fidelidade da cascata",
+    )
+    args = parser.parse_args()
+
+    metadata = train(
+        args.data, args.model, None if args.no_export else args.export,
+        c_grid=args.c_grid,
+        gamma_grid=args.gamma_grid,
+        jobs=args.jobs,
+        folds=args.folds,
+        factor=args.factor,
+        scoring=args.scoring,
+        baselines=args.baselines,
+        cache_dir=args.cache_dir,
+        importance_repeats=args.importance_repeats,
+        approximate_components=args.approximate,
+        max_accuracy_loss=args.max_accuracy_loss,
+        precision=args.precision,
+        cascade_band=tuple(args.cascade_band),
+    )
+    search = metadata['search']
+    print(f"Melhores parâmetros: {search['best_params']} ({search['scoring']} na validação cruzada: {search['best_cv_score']:.4f})")
+    print("Teste: " + ", ".join(f"{name}={value:.4f}" for name, value in metadata['metrics'].items()))
+    timings = metadata['timings']
+    print(f"Busca {timings['search_seconds']:.1f} s, ajuste final {timings['final_fit_seconds']:.1f} s, total {timings['total_seconds']:.1f} s")
+    print(f"Modelo gravado em {args.model} (metadados em {metadata_path(args.model)})")
+    report = metadata['precision_report']
+    if report is not None:
+        print(
+            f"Paridade {report['precision']} x float64: maior desvio da probabilidade {report['max_probability_deviation']:.2e}, "
+            f"rótulos trocados {report['label_flips']} de {report['rows']}"
+        )
+
+    fidelity = metadata['cascade']['fidelity']
+    print(
+        f"Cascata (faixa {fidelity['band']}): {fidelity['escalated_fraction']:.1%} das linhas escaladas para o SVC, "
+        f"concordância {fidelity['agreement']:.2%} (substituto sozinho {fidelity['surrogate_agreement']:.2%})"
+    )
+
+    approximation = metadata['approximation']
+    if approximation is None:
+        return
+    print(
+        f"Aproximado ({approximation['components']} componentes x {approximation['exact_support_vectors']} vetores de suporte): "
+        + ", ".join(f"{name}={value:.4f}" for name, value in approximation['metrics'].items())
+    )
+    loss = ", ".join(f"{name} {value:+.4f}" for name, value in approximation['loss'].items())
+    if not approximation['accepted']:
+        print(f"Modelo aproximado recusado: perda ({loss}) acima de {approximation['max_loss']}")
+        raise SystemExit(1)
+    print(f"Modelo aproximado gravado em {approximation['model_path']} (perda: {loss})")
+
+
+if __name__ == "__main__":
+    main()
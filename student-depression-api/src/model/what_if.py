@@ -0,0 +1,127 @@
+"""
+Cenários "e se": quais mudanças nas respostas modificáveis mais reduzem a
+probabilidade de depressão de um estudante.
+
+A grade de candidatos é o produto cartesiano das opções de cada feature
+modificável (tiradas de questions.json), sempre incluindo a resposta atual.
+Ela é avaliada inteira de uma vez, sem montar uma linha por candidato: como
+||z - sv||² é a soma das parcelas de cada feature, o kernel RBF de um
+candidato é o kernel da resposta atual vezes um fator por feature alterada,
+
+    K(z, sv) = K(x, sv) · Π_f exp(-gamma · (d_f(z_f, sv) - d_f(x_f, sv)))
+
+Os fatores de cada opção saem de uma única chamada (uma linha por opção) e
+a decisão de toda a grade vira produtos elemento a elemento seguidos de uma
+multiplicação de matrizes com os fatores da última feature.
+"""
+import os
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from src.model.compiled_model import REQUEST_FIELDS, CompiledModel
+
+# Respostas que o estudante pode mudar (as demais são características ou histórico)
+MODIFIABLE_FEATURES = ("sleep_duration", "academic_pressure", "work_study_hours", "dietary_habits", "financial_stress")
+# Combinações das demais features avaliadas por vez (limita a matriz combinações x vetores de suporte)
+WHAT_IF_CHUNK_ROWS = int(os.getenv("WHAT_IF_CHUNK_ROWS", "256"))
+
+# Campo do PredictionRequest -> coluna do modelo
+MODEL_COLUMNS = {field: column for column, field in REQUEST_FIELDS.items()}
+
+
+def candidate_values(questions: list, compiled: CompiledModel, request, fields: Sequence[str]) -> Dict[str, list]:
+    """
+    Opções de cada feature modificável segundo questions.json, com a resposta
+    atual na lista. Categorias que o modelo não viu no treinamento ficam de
+    fora, porque seriam codificadas como "nenhuma categoria".
+    """
+    by_id = {question["data"]["id"]: question for question in questions}
+    values = {}
+    for field in fields:
+        current = getattr(request, field)
+        data = by_id[field]["data"]
+        if by_id[field]["type"] == "number":
+            options = list(range(int(data["min"]), int(data["max"]) + 1))
+        else:
+            options = [type(current)(option) for option in data["alternatives"]]
+        known = compiled.category_index.get(MODEL_COLUMNS[field])
+        if known is not None:
+            options = [option for option in options if option in known]
+        if current not in options:
+            options.insert(0, current)
+        values[field] = options
+    return values
+
+
+def option_factors(compiled: CompiledModel, request, values: Dict[str, list]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Kernel ponderado (dual_coef · K) da resposta atual e, para cada opção, o
+    fator que o kernel ganha quando só aquela feature muda
+    """
+    rows = [request]
+    for field, options in values.items():
+        rows.extend(request.model_copy(update={field: option}) for option in options)
+    distances = compiled.squared_distances(*compiled.encode_requests(rows))
+
+    base = distances[0]
+    factors = {}
+    start = 1
+    for field, options in values.items():
+        factors[field] = np.exp(-compiled.gamma * (distances[start:start + len(options)] - base))
+        start += len(options)
+    return compiled.dual_coef * np.exp(-compiled.gamma * base), factors
+
+
+def score_grid(compiled: CompiledModel, request, values: Dict[str, list]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (predições, probabilidade de depressão) de todos os candidatos, com um
+    eixo por feature na ordem de values
+    """
+    weights, factors = option_factors(compiled, request, values)
+    fields = list(values)
+    # A feature com mais opções fica na multiplicação de matrizes
+    last = max(fields, key=lambda field: len(values[field]))
+    head = [field for field in fields if field != last]
+    head_shape = [len(values[field]) for field in head]
+    n_head = int(np.prod(head_shape))
+    index = np.indices(head_shape).reshape(len(head), n_head)
+
+    decision = np.empty((n_head, len(values[last])))
+    for start in range(0, n_head, WHAT_IF_CHUNK_ROWS):
+        stop = min(start + WHAT_IF_CHUNK_ROWS, n_head)
+        combined = np.tile(weights, (stop - start, 1))
+        for position, field in enumerate(head):
+            combined *= factors[field][index[position, start:stop]]
+        decision[start:stop] = combined @ factors[last].T
+    decision += compiled.intercept
+
+    shape = [*head_shape, len(values[last])]
+    order = [(head + [last]).index(field) for field in fields]
+    decision = decision.reshape(shape).transpose(order)
+    predictions, probabilities = compiled.outputs(decision.ravel())
+    return predictions.reshape(decision.shape), probabilities[:, 1].reshape(decision.shape)
+
+
+def best_changes(probabilities: np.ndarray, current: Tuple[int, ...], max_changes: int, top_k: int) -> List[Tuple[int, ...]]:
+    """
+    Posições na grade das top_k combinações que mais reduzem a probabilidade,
+    com no máximo max_changes features alteradas. Só entram combinações em
+    que cada mudança contribui: desfazer qualquer uma delas aumenta a
+    probabilidade. Empates ficam com a de menos mudanças.
+    """
+    shape = probabilities.shape
+    changed = []
+    for axis, position in enumerate(current):
+        mask = np.arange(shape[axis]) != position
+        changed.append(mask.reshape([-1 if other == axis else 1 for other in range(len(shape))]))
+    n_changes = sum(mask.astype(int) for mask in changed)
+
+    useful = np.ones(shape, dtype=bool)
+    for axis, position in enumerate(current):
+        undone = np.take(probabilities, [position], axis=axis)
+        useful &= ~changed[axis] | (undone > probabilities)
+
+    eligible = (n_changes >= 1) & (n_changes <= max_changes) & (probabilities < probabilities[current]) & useful
+    candidates = np.flatnonzero(eligible)
+    n_changes = np.broadcast_to(n_changes, shape).ravel()[candidates]
+    order = np.lexsort((n_changes, probabilities.ravel()[candidates]))[:top_k]
+    return [tuple(int(i) for i in np.unravel_index(candidates[position], shape)) for position in order]
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from src.model.prediction_request import PredictionRequest
+
+ModifiableFeature = Literal['sleep_duration', 'academic_pressure', 'work_study_hours', 'dietary_habits', 'financial_stress']
+
+class WhatIfRequest(BaseModel):
+    answers: PredictionRequest
+    # Features que podem mudar (padrão: todas as modificáveis)
+    features: Optional[List[ModifiableFeature]] = Field(default=None, min_length=1)
+    max_changes: int = Field(default=2, ge=1, le=5)
+    top_k: int = Field(default=5, ge=1, le=50)
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List, Union
+
+class WhatIfChange(BaseModel):
+    field: str
+    current: Union[int, str]
+    suggested: Union[int, str]
+
+class WhatIfScenario(BaseModel):
+    changes: List[WhatIfChange]
+    prediction: int
+    probability: float
+    reduction: float
+
+class WhatIfResponse(BaseModel):
+    prediction: int
+    probability: float
+    candidates_evaluated: int
+    scenarios: List[WhatIfScenario]
@@ -10,7 +10,7 @@ from main import app
 @pytest.fixture(scope="session", autouse=True)
 def mock_model():
     """Mock do modelo SVM para os testes."""
-    with patch('src.model.model.joblib.load') as mock_load:
+    with patch('joblib.load') as mock_load:
         mock_model = MagicMock()
         mock_load.return_value = mock_model
         yield mock_model
@@ -74,3 +74,72 @@ def low_risk_prediction_data():
         "financial_stress": 1,
         "family_history": "Não"
     }
+
+
+@pytest.fixture(scope="session")
+def svm_pipeline():
+    """Pipeline SVM real (sem mock), para testes de paridade numérica."""
+    # joblib.load está mockado na sessão; numpy_pickle.load é a função original
+    from joblib import numpy_pickle
+    from src.model.model import MODEL_PATH
+    return numpy_pickle.load(MODEL_PATH)
+
+
+@pytest.fixture(scope="module")
+def compiled(svm_pipeline):
+    """CompiledModel (NumPy puro) do pipeline real."""
+    from src.model.compiled_model import CompiledModel
+    return CompiledModel.from_pipeline(svm_pipeline)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def serving_model(svm_pipeline):
+    """
+    Coloca o pipeline real em uso. Na aplicação isso acontece no lifespan,
+    que o TestClient só executa quando usado com `with`.
+    """
+    from src.model import model as model_module
+    model_module.install_model(svm_pipeline)
+    return svm_pipeline
+
+
+@pytest.fixture
+def restore_serving_model(svm_pipeline):
+    """Devolve o pipeline real e o estado de inicialização ao fim do teste."""
+    from src.model import model as model_module
+    state = dict(model_module.startup_state)
+    yield
+    model_module.install_model(svm_pipeline)
+    model_module.startup_state.update(state)
+
+
+@pytest.fixture(scope="session")
+def training_sample(svm_pipeline):
+    """
+    Amostra da distribuição de treino: os vetores de suporte do SVC convertidos
+    de volta para o formato de entrada do pipeline.
+    """
+    import numpy as np
+    import pandas as pd
+
+    preprocessor = svm_pipeline.named_steps['preprocessor']
+    support_vectors = svm_pipeline.named_steps['classifier'].support_vectors_
+    rows = np.random.default_rng(42).choice(len(support_vectors), size=1500, replace=False)
+    transformed = support_vectors[rows]
+
+    columns = {}
+    offset = 0
+    for name, transformer, features in preprocessor.transformers_:
+        if name == 'num':
+            width = len(features)
+            values = transformer.inverse_transform(transformed[:, offset:offset + width])
+            for i, feature in enumerate(features):
+                columns[feature] = np.round(values[:, i], 2)
+        elif name == 'cat':
+            width = sum(len(c) for c in transformer.categories_)
+            values = transformer.inverse_transform(transformed[:, offset:offset + width])
+            for i, feature in enumerate(features):
+                columns[feature] = values[:, i]
+        offset += width
+
+    return pd.DataFrame(columns)[list(svm_pipeline.feature_names_in_)]
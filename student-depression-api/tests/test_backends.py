@@ -0,0 +1,159 @@
+"""
+Testes dos backends de inferência (src/model/backends.py): paridade de todos
+os backends com o pipeline scikit-learn numa amostra fixa e escolha do backend
+por SCORING_MODE.
+"""
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model import model as model_module
+from src.model.backends import InferenceBackend, NumpyBackend, OnnxBackend, SklearnBackend
+from src.model.compiled_model import REQUEST_FIELDS, CompiledModel
+from src.model.prediction_cache import artifact_fingerprint
+from src.model.prediction_request import PredictionRequest
+from tests.test_compiled_model import to_requests
+
+
+client = TestClient(app)
+
+# O ONNX Runtime avalia o kernel com outra ordem de operações
+ONNX_ATOL = 1e-5
+
+
+@pytest.fixture(scope="module")
+def onnx_path(svm_pipeline, tmp_path_factory):
+    pytest.importorskip("skl2onnx", reason="pacotes do ONNX ausentes: pip install -r requirements-onnx.txt")
+    pytest.importorskip("onnxruntime", reason="pacotes do ONNX ausentes: pip install -r requirements-onnx.txt")
+    from src.model.onnx_export import export_onnx
+
+    return export_onnx(svm_pipeline, tmp_path_factory.mktemp("onnx") / "svm.onnx", artifact_fingerprint(model_module.MODEL_PATH))
+
+
+@pytest.fixture(scope="module")
+def sample(training_sample):
+    """Amostra fixa: vetores de suporte do treino e os perfis de aquecimento."""
+    return to_requests(training_sample) + [PredictionRequest(**profile) for profile in model_module.WARMUP_PROFILES]
+
+
+@pytest.fixture(scope="module")
+def expected(svm_pipeline, sample):
+    model_input = model_module.build_model_input(sample)
+    return svm_pipeline.predict(model_input), svm_pipeline.predict_proba(model_input)
+
+
+class TestParity:
+    """Compara cada backend com predict/predict_proba do pipeline."""
+
+    def test_numpy(self, svm_pipeline, sample, expected):
+        """Testa o backend NumPy (CompiledModel)."""
+        labels, probabilities = NumpyBackend(CompiledModel.from_pipeline(svm_pipeline)).predict(sample)
+        np.testing.assert_array_equal(labels, expected[0])
+        np.testing.assert_allclose(probabilities, expected[1], rtol=0, atol=1e-9)
+
+    @pytest.mark.parametrize("mode", ["single_pass", "pipeline"])
+    def test_sklearn(self, svm_pipeline, sample, expected, mode):
+        """Testa o backend scikit-learn nos dois modos."""
+        with patch('src.model.scoring.SCORING_MODE', mode):
+            labels, probabilities = SklearnBackend(svm_pipeline).predict(sample)
+        np.testing.assert_array_equal(labels, expected[0])
+        np.testing.assert_allclose(probabilities, expected[1], rtol=0, atol=1e-9)
+
+    def test_onnx(self, onnx_path, sample, expected):
+        """Testa o backend ONNX Runtime."""
+        labels, probabilities = OnnxBackend.load(onnx_path).predict(sample)
+        np.testing.assert_array_equal(labels, expected[0])
+        np.testing.assert_allclose(probabilities, expected[1], rtol=0, atol=ONNX_ATOL)
+
+    def test_onnx_single_row(self, onnx_path, sample, expected):
+        """Testa uma linha por vez, o caso de /model/predict."""
+        backend = OnnxBackend.load(onnx_path)
+        for index in (0, len(sample) - 1):
+            labels, probabilities = backend.predict([sample[index]])
+            assert labels.shape == (1,) and probabilities.shape == (1, 2)
+            assert labels[0] == expected[0][index]
+            np.testing.assert_allclose(probabilities[0], expected[1][index], rtol=0, atol=ONNX_ATOL)
+
+    def test_onnx_metadata(self, onnx_path, svm_pipeline):
+        """Testa a ordem das colunas e o fingerprint gravados no arquivo."""
+        backend = OnnxBackend.load(onnx_path)
+        assert [field for _, field, _ in backend.inputs] == [
+            REQUEST_FIELDS[column] for column in svm_pipeline.feature_names_in_
+        ]
+        assert backend.source_fingerprint == artifact_fingerprint(model_module.MODEL_PATH)
+
+
+class TestBackendSelection:
+    """Escolha do backend por SCORING_MODE."""
+
+    @pytest.mark.parametrize("mode,backend", [
+        ("compiled", "numpy"),
+        ("single_pass", "sklearn"),
+        ("pipeline", "sklearn"),
+    ])
+    def test_scoring_mode(self, mode, backend):
+        """Testa o backend de cada modo."""
+        with patch('src.model.scoring.SCORING_MODE', mode):
+            assert model_module.active_backend().name == backend
+
+    def test_without_pipeline(self):
+        """Sem o pipeline (MODEL_FORMAT=mmap) só o backend NumPy está disponível."""
+        with patch('src.model.model.model', None), patch('src.model.scoring.SCORING_MODE', 'single_pass'):
+            assert model_module.active_backend().name == "numpy"
+
+    def test_onnx_not_loaded(self):
+        """Testa o erro quando SCORING_MODE=onnx e o modelo ONNX não foi carregado."""
+        with patch('src.model.scoring.SCORING_MODE', 'onnx'):
+            with pytest.raises(RuntimeError, match="ONNX"):
+                model_module.active_backend()
+
+    def test_incomplete_backend_fails_on_instantiation(self):
+        """Testa se um backend sem predict falha ao ser criado, e não na primeira predição."""
+        class Incomplete(InferenceBackend):
+            name = "incompleto"
+
+        with pytest.raises(TypeError, match="predict"):
+            Incomplete()
+
+
+@pytest.mark.usefixtures("restore_serving_model")
+class TestOnnxServing:
+    """Serving com SCORING_MODE=onnx."""
+
+    def test_predict_with_onnx(self, onnx_path, svm_pipeline, valid_prediction_data):
+        """Testa /model/predict com o modelo ONNX carregado junto com o pipeline."""
+        with patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            expected = client.post("/model/predict", json=valid_prediction_data).json()
+            with patch('src.model.scoring.SCORING_MODE', 'onnx'), \
+                    patch('src.model.model.MODEL_ONNX_PATH', onnx_path), \
+                    patch('joblib.load', return_value=svm_pipeline):
+                assert model_module.load_model(model_format="joblib")
+                assert model_module.active_backend() is model_module.onnx_model
+                response = client.post("/model/predict", json=valid_prediction_data)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["prediction"] == expected["prediction"]
+        np.testing.assert_allclose(data["probability"], expected["probability"], rtol=0, atol=ONNX_ATOL)
+
+    def test_onnx_from_other_artifact(self, onnx_path, svm_pipeline, tmp_path):
+        """Testa a recusa de um .onnx exportado de outro artefato."""
+        import joblib
+
+        other = tmp_path / "outro.joblib"
+        joblib.dump(svm_pipeline, other, compress=3)
+        with patch('src.model.scoring.SCORING_MODE', 'onnx'), \
+                patch('src.model.model.MODEL_ONNX_PATH', onnx_path), \
+                patch('joblib.load', return_value=svm_pipeline):
+            assert not model_module.load_model(other, "joblib")
+        assert "onnx_export" in model_module.startup_state["error"]
+
+    def test_missing_onnx_file(self, tmp_path, svm_pipeline):
+        """Testa a falha de carregamento sem o arquivo .onnx."""
+        pytest.importorskip("onnxruntime")
+        with patch('src.model.scoring.SCORING_MODE', 'onnx'), \
+                patch('src.model.model.MODEL_ONNX_PATH', tmp_path / "nao-existe.onnx"), \
+                patch('joblib.load', return_value=svm_pipeline):
+            assert not model_module.load_model(model_format="joblib")
+        assert not model_module.model_available()
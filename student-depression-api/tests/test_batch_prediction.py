@@ -0,0 +1,74 @@
+"""
+Testes para o endpoint de predição em lote.
+"""
+import json
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+
+
+client = TestClient(app)
+
+
+class TestBatchPrediction:
+    """Testes para /model/predict/batch."""
+
+    def test_batch_matches_single_predictions(self, valid_prediction_data, high_risk_prediction_data, low_risk_prediction_data):
+        """Testa se o lote retorna, em ordem, o mesmo resultado das chamadas individuais."""
+        items = [valid_prediction_data, high_risk_prediction_data, low_risk_prediction_data]
+
+        response = client.post("/model/predict/batch", json=items)
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["index"] for r in results] == [0, 1, 2]
+
+        for item, result in zip(items, results):
+            single = client.post("/model/predict", json=item).json()
+            assert result["error"] is None
+            assert result["result"]["prediction"] == single["prediction"]
+            assert result["result"]["probability"] == pytest.approx(single["probability"])
+            assert result["result"]["feature_feedback"] == single["feature_feedback"]
+
+    def test_invalid_item_does_not_fail_batch(self, valid_prediction_data):
+        """Testa se um item inválido gera erro apenas na sua posição."""
+        invalid = dict(valid_prediction_data)
+        del invalid["cgpa"]
+
+        response = client.post("/model/predict/batch", json=[valid_prediction_data, invalid, valid_prediction_data])
+        assert response.status_code == 200
+        results = response.json()["results"]
+
+        assert results[0]["result"] is not None
+        assert results[1]["result"] is None
+        assert "cgpa" in results[1]["error"]
+        assert results[2]["result"] is not None
+
+    def test_nan_item_rejected(self, valid_prediction_data):
+        """Testa se um cgpa NaN vira erro do item, e não uma predição."""
+        body = json.dumps([valid_prediction_data, {**valid_prediction_data, "cgpa": float("nan")}])
+        response = client.post("/model/predict/batch", content=body, headers={"Content-Type": "application/json"})
+        assert response.status_code == 200
+        results = response.json()["results"]
+
+        assert results[0]["result"] is not None
+        assert results[1]["result"] is None
+        assert "cgpa" in results[1]["error"]
+
+    def test_empty_batch(self):
+        """Testa lote vazio."""
+        response = client.post("/model/predict/batch", json=[])
+        assert response.status_code == 200
+        assert response.json()["results"] == []
+
+    def test_batch_too_large(self, valid_prediction_data):
+        """Testa se lotes acima do limite são rejeitados."""
+        with patch('src.model.model.MAX_BATCH_SIZE', 2):
+            response = client.post("/model/predict/batch", json=[valid_prediction_data] * 3)
+        assert response.status_code == 413
+
+    def test_batch_model_not_loaded(self, valid_prediction_data):
+        """Testa erro quando o modelo não foi carregado."""
+        with patch('src.model.model.model', None), patch('src.model.model.compiled_model', None):
+            response = client.post("/model/predict/batch", json=[valid_prediction_data])
+        assert response.status_code == 500
@@ -0,0 +1,151 @@
+"""
+Testes para o CLI de pontuação offline (src/model/batch_score.py).
+"""
+import csv
+import json
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model import batch_score
+from src.model import model as model_module
+from src.model.batch_score import Progress, file_format, score_chunk, score_file
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def isolated_model():
+    """
+    Com --workers 1 o modelo é carregado no próprio processo; restaura o
+    modelo dos testes e as métricas depois.
+    """
+    with patch('src.model.model.model', model_module.model), \
+            patch('src.model.model.compiled_model', model_module.compiled_model), \
+            patch('src.model.model.model_fingerprint', model_module.model_fingerprint), \
+            patch.dict(model_module.startup_state), \
+            patch('src.model.metrics.METRICS_ENABLED', True):
+        yield
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as output:
+        writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def read_csv(path):
+    with open(path, newline="") as source:
+        return list(csv.DictReader(source))
+
+
+class TestScoreChunk:
+    """Testes para a pontuação de um bloco."""
+
+    def test_matches_api(self, valid_prediction_data, high_risk_prediction_data):
+        """Testa se o bloco tem o mesmo resultado de /model/predict."""
+        columns = score_chunk([valid_prediction_data, high_risk_prediction_data], with_feedback=True)
+
+        for position, item in enumerate([valid_prediction_data, high_risk_prediction_data]):
+            single = client.post("/model/predict", json=item).json()
+            assert columns["error"][position] is None
+            assert columns["prediction"][position] == single["prediction"]
+            assert columns["probability_0"][position] == pytest.approx(single["probability"][0])
+            assert columns["probability_1"][position] == pytest.approx(single["probability"][1])
+            assert columns["depression_risk"][position] == single["depression_risk"]
+            assert json.loads(columns["feature_feedback"][position]) == single["feature_feedback"]
+
+    def test_invalid_row(self, valid_prediction_data):
+        """Testa se uma linha inválida gera erro apenas na sua posição."""
+        columns = score_chunk([{**valid_prediction_data, "age": "vinte"}, valid_prediction_data], with_feedback=False)
+        assert "age" in columns["error"][0]
+        assert columns["prediction"][0] is None
+        assert columns["error"][1] is None
+        assert columns["feature_feedback"][1] is None
+
+    def test_model_not_loaded(self, valid_prediction_data):
+        """Testa erro quando o modelo não foi carregado."""
+        with patch('src.model.model.model', None), patch('src.model.model.compiled_model', None):
+            with pytest.raises(RuntimeError):
+                score_chunk([valid_prediction_data], with_feedback=False)
+
+
+class TestScoreFile:
+    """Testes para a pontuação de arquivos inteiros."""
+
+    def test_csv_round_trip(self, tmp_path, isolated_model, valid_prediction_data, high_risk_prediction_data):
+        """Testa ordem, colunas extras e erros numa execução em blocos."""
+        rows = [{"student_id": f"s{i}", **(valid_prediction_data if i % 2 else high_risk_prediction_data)} for i in range(7)]
+        rows[3]["cgpa"] = ""
+        write_csv(tmp_path / "in.csv", rows)
+
+        result = score_file(tmp_path / "in.csv", tmp_path / "out.csv", workers=1, chunk_size=3, model_format="mmap")
+        assert (result.rows, result.errors) == (7, 1)
+
+        scored = read_csv(tmp_path / "out.csv")
+        assert [row["student_id"] for row in scored] == [f"s{i}" for i in range(7)]
+        assert "feature_feedback" not in scored[0]
+        assert "cgpa" in scored[3]["error"]
+        assert scored[3]["prediction"] == ""
+        single = client.post("/model/predict", json=valid_prediction_data).json()
+        assert int(scored[1]["prediction"]) == single["prediction"]
+        assert float(scored[1]["probability_1"]) == pytest.approx(single["probability"][1])
+
+    def test_process_pool_matches_single_process(self, tmp_path, isolated_model, valid_prediction_data, high_risk_prediction_data):
+        """Testa se o pool de processos produz o mesmo arquivo que um processo só."""
+        rows = [valid_prediction_data, high_risk_prediction_data] * 10
+        write_csv(tmp_path / "in.csv", rows)
+
+        score_file(tmp_path / "in.csv", tmp_path / "single.csv", workers=1, chunk_size=4, with_feedback=True, model_format="mmap")
+        score_file(tmp_path / "in.csv", tmp_path / "pool.csv", workers=2, chunk_size=4, with_feedback=True, model_format="mmap")
+
+        single = read_csv(tmp_path / "single.csv")
+        pool = read_csv(tmp_path / "pool.csv")
+        assert [row["feature_feedback"] for row in pool] == [row["feature_feedback"] for row in single]
+        for got, want in zip(pool, single):
+            assert got["prediction"] == want["prediction"]
+            assert float(got["probability_1"]) == pytest.approx(float(want["probability_1"]))
+
+    def test_missing_columns(self, tmp_path, isolated_model, valid_prediction_data):
+        """Testa arquivo sem alguma coluna obrigatória."""
+        partial = dict(valid_prediction_data)
+        del partial["family_history"]
+        write_csv(tmp_path / "in.csv", [partial])
+        with pytest.raises(ValueError, match="family_history"):
+            score_file(tmp_path / "in.csv", tmp_path / "out.csv", model_format="mmap")
+
+    def test_progress(self, tmp_path, isolated_model, valid_prediction_data):
+        """Testa se o progresso é reportado a cada bloco."""
+        write_csv(tmp_path / "in.csv", [valid_prediction_data] * 5)
+        output = []
+
+        class Stream:
+            def write(self, text):
+                output.append(text)
+
+            def flush(self):
+                pass
+
+        score_file(tmp_path / "in.csv", tmp_path / "out.csv", chunk_size=2, model_format="mmap",
+                   progress=Progress(stream=Stream()))
+        updates = [text for text in output if "linhas/s" in text]
+        assert len(updates) == 3
+        assert updates[-1].startswith("\r5 linhas")
+
+    def test_file_format(self):
+        """Testa a detecção do formato pela extensão."""
+        assert file_format("dados.csv") == "csv"
+        assert file_format("dados.parquet") == "parquet"
+        assert file_format("dados", "csv") == "csv"
+        with pytest.raises(ValueError):
+            file_format("dados.xlsx")
+
+    def test_parquet_requires_pyarrow(self, tmp_path, valid_prediction_data):
+        """Testa a mensagem quando o pyarrow não está instalado."""
+        write_csv(tmp_path / "in.csv", [valid_prediction_data])
+        with patch.object(batch_score, 'import_parquet', side_effect=RuntimeError("pip install pyarrow")):
+            with pytest.raises(RuntimeError, match="pyarrow"):
+                score_file(tmp_path / "in.csv", tmp_path / "out.parquet", model_format="mmap")
+        assert not (tmp_path / "out.parquet").exists()
@@ -0,0 +1,285 @@
+"""
+Testes da pontuação em cascata (src/model/cascade.py) e da destilação do
+substituto (src/model/distillation.py).
+"""
+import json
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model import model as model_module
+from src.model.cascade import Surrogate, cascade_outputs, surrogate_path
+from src.model.distillation import REPORT_BANDS, distill_surrogate, fidelity_report, scaled_inputs
+from src.model.explanations import local_contributions, perturbed_requests, reference_values
+from src.model.feature_importance import encode_frame
+from src.model.prediction_cache import artifact_fingerprint
+from src.model.prediction_request import PredictionRequest
+from src.model.train import train
+from tests.test_compiled_model import to_requests
+from tests.test_train import kaggle_dataset
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def surrogate(compiled, training_sample):
+    return distill_surrogate(compiled, training_sample[:1000], "fingerprint-teste")
+
+
+@pytest.fixture(scope="module")
+def holdout(compiled, training_sample):
+    """Linhas fora da destilação, já codificadas."""
+    X = training_sample[1000:]
+    return X, *encode_frame(compiled, X)
+
+
+class TestSurrogate:
+    """Testes para o substituto destilado."""
+
+    def test_scaled_inputs(self, compiled, svm_pipeline, holdout):
+        """Testa a entrada escalada contra o pré-processador do pipeline."""
+        X, encoded, _ = holdout
+        expected = svm_pipeline.named_steps['preprocessor'].transform(X)
+        np.testing.assert_allclose(scaled_inputs(compiled, encoded), expected, rtol=0, atol=1e-12)
+
+    def test_folded_scaler(self, compiled, surrogate, holdout):
+        """Testa o scaler dobrado nos pesos: mesma probabilidade que na entrada escalada."""
+        _, encoded, _ = holdout
+        scaled = scaled_inputs(compiled, encoded)
+        unfolded = surrogate.weights.copy()
+        unfolded[:compiled.n_numeric] *= compiled.scale
+        logit = scaled @ unfolded + surrogate.intercept + unfolded[:compiled.n_numeric] @ (compiled.mean / compiled.scale)
+        np.testing.assert_allclose(surrogate.probability(encoded), 1 / (1 + np.exp(-logit)), rtol=0, atol=1e-12)
+
+    def test_follows_svm(self, compiled, surrogate, holdout):
+        """Testa que o substituto acompanha as probabilidades do SVC."""
+        _, encoded, sq_norms = holdout
+        _, expected = compiled.predict_encoded(encoded, sq_norms)
+        probability = surrogate.probability(encoded)
+        assert np.corrcoef(probability, expected[:, 1])[0, 1] > 0.9
+        assert ((probability > 0.5) == (expected[:, 1] > 0.5)).mean() > 0.85
+
+    def test_save_and_load(self, surrogate, tmp_path):
+        """Testa a gravação e a leitura do JSON."""
+        path = surrogate.save(tmp_path / "svm.surrogate.json")
+        loaded = Surrogate.load(path)
+        np.testing.assert_array_equal(loaded.weights, surrogate.weights)
+        assert loaded.intercept == surrogate.intercept
+        np.testing.assert_array_equal(loaded.classes, surrogate.classes)
+        assert loaded.source_fingerprint == "fingerprint-teste"
+
+    def test_unknown_format_version(self, surrogate, tmp_path):
+        """Testa a recusa de versões de formato desconhecidas."""
+        path = surrogate.save(tmp_path / "svm.surrogate.json")
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["format_version"] = 99
+        path.write_text(json.dumps(data), encoding="utf-8")
+        with pytest.raises(ValueError, match="não suportada"):
+            Surrogate.load(path)
+
+    def test_path(self):
+        """Testa o caminho ao lado do .joblib e do diretório do artefato de serving."""
+        assert surrogate_path(model_module.MODEL_PATH).name == "student-depression-svm.surrogate.json"
+        assert surrogate_path(model_module.MODEL_EXPORT_PATH) == surrogate_path(model_module.MODEL_PATH)
+
+
+class TestCascadeOutputs:
+    """Testes para as saídas da cascata."""
+
+    def test_full_band(self, compiled, surrogate, holdout):
+        """Testa que a faixa [0, 1] escala tudo e reproduz o SVC."""
+        _, encoded, sq_norms = holdout
+        labels, probabilities, escalated = cascade_outputs(surrogate, compiled, encoded, sq_norms, 0.0, 1.0)
+        expected_labels, expected_probabilities = compiled.predict_encoded(encoded, sq_norms)
+        assert escalated.all()
+        np.testing.assert_array_equal(labels, expected_labels)
+        np.testing.assert_array_equal(probabilities, expected_probabilities)
+
+    def test_empty_band(self, compiled, surrogate, holdout):
+        """Testa que sem faixa o SVC não é avaliado."""
+        _, encoded, sq_norms = holdout
+        with patch.object(compiled, 'predict_encoded') as exact:
+            labels, probabilities, escalated = cascade_outputs(surrogate, compiled, encoded, sq_norms, 0.5, 0.5 - 1e-9)
+        exact.assert_not_called()
+        assert not escalated.any()
+        positive = surrogate.probability(encoded)
+        np.testing.assert_array_equal(probabilities[:, 1], positive)
+        np.testing.assert_array_equal(labels, (positive > 0.5).astype(int))
+
+    def test_mixed_band(self, compiled, surrogate, holdout):
+        """Testa que só as linhas da faixa vêm do SVC."""
+        _, encoded, sq_norms = holdout
+        labels, probabilities, escalated = cascade_outputs(surrogate, compiled, encoded, sq_norms, 0.2, 0.8)
+        expected_labels, expected_probabilities = compiled.predict_encoded(encoded, sq_norms)
+        positive = surrogate.probability(encoded)
+        assert 0 < escalated.sum() < len(escalated)
+        np.testing.assert_array_equal(escalated, (positive >= 0.2) & (positive <= 0.8))
+        # Só o arredondamento do BLAS muda no subconjunto escalado
+        np.testing.assert_allclose(probabilities[escalated], expected_probabilities[escalated], rtol=0, atol=1e-12)
+        np.testing.assert_array_equal(probabilities[~escalated, 1], positive[~escalated])
+        assert (labels == expected_labels).mean() > 0.99
+
+    def test_incompatible_surrogate(self, compiled, surrogate, holdout):
+        """Testa a recusa de um substituto com outro número de colunas."""
+        _, encoded, sq_norms = holdout
+        other = Surrogate(surrogate.weights[:-1], surrogate.intercept, surrogate.classes)
+        with pytest.raises(ValueError, match="incompatível"):
+            cascade_outputs(other, compiled, encoded, sq_norms, 0.2, 0.8)
+
+
+class TestFidelityReport:
+    """Testes para o relatório de fidelidade."""
+
+    def test_report(self, compiled, surrogate, holdout):
+        """Testa a concordância e a fração escalada contra cascade_outputs."""
+        X, encoded, sq_norms = holdout
+        report = fidelity_report(compiled, surrogate, X, (0.2, 0.8))
+        labels, _, escalated = cascade_outputs(surrogate, compiled, encoded, sq_norms, 0.2, 0.8)
+        expected_labels, _ = compiled.predict_encoded(encoded, sq_norms)
+
+        assert report["rows"] == len(X)
+        assert report["band"] == [0.2, 0.8]
+        assert report["escalated_fraction"] == pytest.approx(escalated.mean())
+        assert report["agreement"] == pytest.approx((labels == expected_labels).mean())
+        assert report["surrogate_agreement"] <= report["agreement"]
+        assert [band["band"] for band in report["bands"]] == [list(band) for band in REPORT_BANDS]
+
+    def test_narrower_band_escalates_less(self, compiled, surrogate, holdout):
+        """Testa que faixas mais estreitas escalam menos linhas."""
+        report = fidelity_report(compiled, surrogate, holdout[0])
+        fractions = [band["escalated_fraction"] for band in report["bands"]]
+        assert fractions == sorted(fractions, reverse=True)
+
+    def test_invalid_band(self, compiled, surrogate, holdout):
+        """Testa a recusa de uma faixa invertida."""
+        with pytest.raises(ValueError, match="Faixa"):
+            fidelity_report(compiled, surrogate, holdout[0], (0.8, 0.2))
+
+
+@pytest.mark.usefixtures("restore_serving_model")
+class TestCascadeServing:
+    """Serving com SCORING_MODE=cascade."""
+
+    def test_predict(self, svm_pipeline, valid_prediction_data, high_risk_prediction_data):
+        """Testa /model/predict e as estatísticas de escalação."""
+        with patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            expected = [client.post("/model/predict", json=data).json() for data in (valid_prediction_data, high_risk_prediction_data)]
+            before = client.get("/model/cascade/stats").json()
+            with patch('src.model.scoring.SCORING_MODE', 'cascade'), patch('joblib.load', return_value=svm_pipeline):
+                assert model_module.load_model(model_format="joblib")
+                assert model_module.active_backend().name == "cascade"
+                responses = [client.post("/model/predict", json=data) for data in (valid_prediction_data, high_risk_prediction_data)]
+        stats = client.get("/model/cascade/stats").json()
+
+        assert [response.status_code for response in responses] == [200, 200]
+        assert [response.json()["prediction"] for response in responses] == [data["prediction"] for data in expected]
+        assert stats["rows"] - before["rows"] == 2
+        assert stats["band"] == [0.2, 0.8]
+        assert 0 <= stats["escalation_rate"] <= 1
+        assert "cascade_escalation_rate " in client.get("/metrics").text
+
+    def test_batch_counts_escalations(self, svm_pipeline, surrogate, compiled, training_sample):
+        """Testa que o lote escala exatamente as linhas da faixa."""
+        requests = to_requests(training_sample[1000:1100])
+        model_module.install_model(svm_pipeline, surrogate=surrogate)
+        before = client.get("/model/cascade/stats").json()
+        with patch('src.model.scoring.SCORING_MODE', 'cascade'):
+            labels, _ = model_module.score_requests(requests)
+        stats = client.get("/model/cascade/stats").json()
+
+        positive = surrogate.probability(compiled.encode_requests(requests)[0])
+        assert stats["rows"] - before["rows"] == len(requests)
+        assert stats["escalated"] - before["escalated"] == int(((positive >= 0.2) & (positive <= 0.8)).sum())
+        assert len(labels) == len(requests)
+
+    @pytest.mark.parametrize("band,escalated", [((0.0, 1.0), 1), ((0.5, 0.5 - 1e-9), 0)])
+    def test_explanation_uses_one_model(self, svm_pipeline, surrogate, compiled, high_risk_prediction_data, band, escalated):
+        """Testa que a requisição e as perturbações de ?explain=true vêm de um único modelo e contam como uma linha."""
+        request = PredictionRequest(**high_risk_prediction_data)
+        rows, features = perturbed_requests(request, reference_values(compiled))
+        encoded, sq_norms = compiled.encode_requests(rows)
+        if escalated:
+            _, probabilities = compiled.predict_encoded(encoded, sq_norms)
+        else:
+            positive = surrogate.probability(encoded)
+            probabilities = np.column_stack([1 - positive, positive])
+        expected = local_contributions(probabilities, features)
+
+        model_module.install_model(svm_pipeline, surrogate=surrogate)
+        before = client.get("/model/cascade/stats").json()
+        with patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False), \
+                patch('src.model.scoring.SCORING_MODE', 'cascade'), \
+                patch('src.model.cascade.CASCADE_BAND_LOW', band[0]), \
+                patch('src.model.cascade.CASCADE_BAND_HIGH', band[1]):
+            response = client.post("/model/predict?explain=true", json=high_risk_prediction_data)
+        stats = client.get("/model/cascade/stats").json()
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["probability"][1] == pytest.approx(probabilities[0, 1], abs=1e-12)
+        assert [item["model_feature"] for item in data["explanation"]] == [item["model_feature"] for item in expected]
+        for item, reference in zip(data["explanation"], expected):
+            assert item["contribution"] == pytest.approx(reference["contribution"], abs=1e-12)
+        assert stats["rows"] - before["rows"] == 1
+        assert stats["escalated"] - before["escalated"] == escalated
+
+    def test_warm_up_not_counted(self, svm_pipeline, surrogate):
+        """Testa que o aquecimento não entra nas contagens da cascata."""
+        model_module.install_model(svm_pipeline, surrogate=surrogate)
+        before = client.get("/model/cascade/stats").json()
+        with patch('src.model.scoring.SCORING_MODE', 'cascade'):
+            model_module.warm_up()
+        assert client.get("/model/cascade/stats").json()["rows"] == before["rows"]
+
+    def test_surrogate_not_loaded(self):
+        """Testa o erro quando SCORING_MODE=cascade e o substituto não foi carregado."""
+        with patch('src.model.scoring.SCORING_MODE', 'cascade'):
+            with pytest.raises(RuntimeError, match="substituto"):
+                model_module.active_backend()
+
+    def test_surrogate_from_other_artifact(self, surrogate, svm_pipeline, tmp_path):
+        """Testa a recusa de um substituto destilado de outro artefato."""
+        path = surrogate.save(tmp_path / "svm.surrogate.json")
+        with patch('src.model.scoring.SCORING_MODE', 'cascade'), \
+                patch('src.model.model.MODEL_SURROGATE_PATH', path), \
+                patch('joblib.load', return_value=svm_pipeline):
+            assert not model_module.load_model(model_format="joblib")
+        assert "distillation" in model_module.startup_state["error"]
+
+    def test_invalid_band(self, svm_pipeline):
+        """Testa a falha de carregamento com a faixa invertida."""
+        with patch('src.model.scoring.SCORING_MODE', 'cascade'), \
+                patch('src.model.cascade.CASCADE_BAND_LOW', 0.9), \
+                patch('joblib.load', return_value=svm_pipeline):
+            assert not model_module.load_model(model_format="joblib")
+        assert "Faixa" in model_module.startup_state["error"]
+
+
+class TestShippedSurrogate:
+    """O substituto versionado em src/resources acompanha o .joblib."""
+
+    def test_matches_joblib_artifact(self, compiled):
+        """Testa o fingerprint registrado e as dimensões."""
+        surrogate = Surrogate.load(model_module.MODEL_SURROGATE_PATH)
+        assert surrogate.source_fingerprint == artifact_fingerprint(model_module.MODEL_PATH)
+        assert len(surrogate.weights) == compiled.n_transformed
+
+
+class TestTrainedSurrogate:
+    """Testes para o substituto gravado pelo treinamento."""
+
+    def test_train_writes_surrogate(self, tmp_path):
+        """Testa o arquivo do substituto e a seção cascade dos metadados."""
+        kaggle_dataset(300, seed=3).to_csv(tmp_path / "dataset.csv", index=False)
+        metadata = train(
+            tmp_path / "dataset.csv", tmp_path / "svm.joblib", None,
+            c_grid=[1.0], gamma_grid=['scale'], jobs=1, folds=3, importance_repeats=0, cascade_band=(0.3, 0.7),
+        )
+        fidelity = metadata['cascade']['fidelity']
+        assert fidelity['rows'] == metadata['dataset']['test_rows']
+        assert fidelity['band'] == [0.3, 0.7]
+        assert 0 <= fidelity['escalated_fraction'] <= 1
+        assert 0 <= fidelity['agreement'] <= 1
+        assert Surrogate.load(tmp_path / "svm.surrogate.json").source_fingerprint == metadata['model_fingerprint']
@@ -0,0 +1,62 @@
+"""
+Testes de paridade do CompiledModel (NumPy puro) com o pipeline scikit-learn.
+"""
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from src.model.compiled_model import REQUEST_FIELDS
+from src.model.prediction_request import PredictionRequest
+
+
+def to_requests(frame):
+    """Converte as linhas de um DataFrame do pipeline em objetos com os campos do PredictionRequest."""
+    renamed = frame.rename(columns=REQUEST_FIELDS)
+    return [SimpleNamespace(**row) for row in renamed.to_dict(orient='records')]
+
+
+class TestCompiledModelParity:
+    """Compara o CompiledModel com o pipeline original."""
+
+    def test_arrays_are_contiguous(self, compiled):
+        """Testa se os parâmetros extraídos são arrays contíguos."""
+        for array in (compiled.folded_support_vectors, compiled.support_sq_norms, compiled.dual_coef, compiled.mean, compiled.scale):
+            assert array.flags['C_CONTIGUOUS']
+            assert array.dtype == np.float64
+
+    def test_decision_function_matches(self, svm_pipeline, compiled, training_sample):
+        """Testa se a margem do SVC é a mesma do pipeline."""
+        encoded, sq_norms = compiled.encode_requests(to_requests(training_sample))
+        expected = svm_pipeline.decision_function(training_sample)
+        np.testing.assert_allclose(compiled.decision_function(encoded, sq_norms), expected, rtol=0, atol=1e-9)
+
+    def test_predictions_match(self, svm_pipeline, compiled, training_sample):
+        """Testa se predições e probabilidades batem com predict/predict_proba."""
+        labels, probabilities = compiled.predict_with_proba(to_requests(training_sample))
+        np.testing.assert_array_equal(labels, svm_pipeline.predict(training_sample))
+        np.testing.assert_allclose(probabilities, svm_pipeline.predict_proba(training_sample), rtol=0, atol=1e-9)
+
+    def test_prediction_request_input(self, svm_pipeline, compiled, valid_prediction_data):
+        """Testa a pontuação direta a partir de um PredictionRequest."""
+        from src.model.model import build_model_input
+
+        request = PredictionRequest(**valid_prediction_data)
+        labels, probabilities = compiled.predict_with_proba([request])
+        frame = build_model_input([request])
+
+        assert labels[0] == svm_pipeline.predict(frame)[0]
+        np.testing.assert_allclose(probabilities, svm_pipeline.predict_proba(frame), rtol=0, atol=1e-9)
+
+    def test_unknown_category_is_ignored(self, svm_pipeline, compiled, valid_prediction_data):
+        """Testa se categorias desconhecidas são ignoradas como no OneHotEncoder."""
+        from src.model.model import build_model_input
+
+        request = PredictionRequest(**{**valid_prediction_data, "sleep_duration": "Irregular"})
+        _, probabilities = compiled.predict_with_proba([request])
+        np.testing.assert_allclose(probabilities, svm_pipeline.predict_proba(build_model_input([request])), rtol=0, atol=1e-9)
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+    def test_non_finite_numeric_rejected(self, compiled, valid_prediction_data, value):
+        """Testa se NaN/infinito gera erro, como no pipeline, em vez de uma predição de classe 0."""
+        request = SimpleNamespace(**{**valid_prediction_data, "cgpa": value})
+        with pytest.raises(ValueError, match="NaN"):
+            compiled.predict_with_proba([request])
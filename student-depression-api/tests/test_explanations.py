@@ -0,0 +1,96 @@
+"""
+Testes para a explicação local das predições (src/model/explanations.py e
+POST /model/predict?explain=true).
+"""
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model import model as model_module
+from src.model.model import build_model_input
+from src.model.prediction_request import PredictionRequest
+
+
+client = TestClient(app)
+
+
+def pipeline_probability(pipeline, request: PredictionRequest, **changes) -> float:
+    return pipeline.predict_proba(build_model_input([request.model_copy(update=changes)]))[0, 1]
+
+
+def explained(data):
+    with patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+        response = client.post("/model/predict?explain=true", json=data)
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestExplainedPrediction:
+    """Testes para a explicação na rota /model/predict."""
+
+    def test_same_prediction_with_explanation(self, valid_prediction_data):
+        """Testa se a predição não muda e se cada feature aparece uma vez."""
+        plain = client.post("/model/predict", json=valid_prediction_data).json()
+        data = explained(valid_prediction_data)
+
+        assert data["prediction"] == plain["prediction"]
+        assert data["probability"] == pytest.approx(plain["probability"])
+        assert data["feature_feedback"] == plain["feature_feedback"]
+        assert len(data["explanation"]) == 11
+        assert {item["feature"] for item in data["explanation"]} == {item["feature"] for item in plain["feature_feedback"]}
+        contributions = [abs(item["contribution"]) for item in data["explanation"]]
+        assert contributions == sorted(contributions, reverse=True)
+
+    def test_without_explain_has_no_explanation(self, valid_prediction_data):
+        """Testa se a resposta padrão continua sem o campo."""
+        assert "explanation" not in client.post("/model/predict", json=valid_prediction_data).json()
+
+    def test_numeric_reference_is_training_mean(self, svm_pipeline, high_risk_prediction_data):
+        """Testa a contribuição numérica contra o pipeline com a média do treinamento."""
+        request = PredictionRequest(**high_risk_prediction_data)
+        item = next(item for item in explained(high_risk_prediction_data)["explanation"] if item["model_feature"] == "Academic Pressure")
+
+        mean = svm_pipeline.named_steps["preprocessor"].named_transformers_["num"].mean_
+        position = list(svm_pipeline.named_steps["preprocessor"].transformers_[0][2]).index("Academic Pressure")
+        reference = pipeline_probability(svm_pipeline, request, academic_pressure=mean[position])
+        assert item["reference_probability"] == pytest.approx(reference)
+        assert item["contribution"] == pytest.approx(pipeline_probability(svm_pipeline, request) - reference)
+
+    def test_categorical_reference_averages_categories(self, svm_pipeline, valid_prediction_data):
+        """Testa a contribuição categórica contra a média sobre as categorias."""
+        request = PredictionRequest(**valid_prediction_data)
+        item = next(item for item in explained(valid_prediction_data)["explanation"] if item["model_feature"] == "Sleep Duration")
+
+        options = ["Menos de 5 horas", "5-6 horas", "7-8 horas", "Mais de 8 horas"]
+        reference = sum(pipeline_probability(svm_pipeline, request, sleep_duration=option) for option in options) / len(options)
+        assert item["reference_probability"] == pytest.approx(reference)
+
+    def test_single_model_call(self, valid_prediction_data):
+        """Testa se a requisição e todas as linhas perturbadas vão numa única chamada."""
+        with patch.object(model_module, 'score_requests', wraps=model_module.score_requests) as score:
+            explained(valid_prediction_data)
+        assert score.call_count == 1
+        rows = score.call_args.args[0]
+        assert rows[0] == PredictionRequest(**valid_prediction_data)
+        assert len(rows) == 1 + 6 + 13
+
+    def test_cached_separately(self, valid_prediction_data):
+        """Testa se a explicação é cacheada com chave própria, ao lado da predição."""
+        model_module.prediction_cache.clear()
+        stats = model_module.prediction_cache.stats()
+        client.post("/model/predict", json=valid_prediction_data)
+        first = client.post("/model/predict?explain=true", json=valid_prediction_data).json()
+        assert model_module.prediction_cache.stats()["misses"] == stats["misses"] + 2
+
+        with patch.object(model_module, 'score_requests', side_effect=AssertionError("não deveria chamar o modelo")):
+            second = client.post("/model/predict?explain=true", json=valid_prediction_data).json()
+        assert second == first
+        assert model_module.prediction_cache.stats()["hits"] == stats["hits"] + 1
+
+    def test_model_without_compiled_version(self, valid_prediction_data):
+        """Testa erro quando o modelo carregado não é o pipeline SVC esperado."""
+        with patch('src.model.model.compiled_model', None), \
+                patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            response = client.post("/model/predict?explain=true", json=valid_prediction_data)
+        assert response.status_code == 400
+        assert "explicação" in response.json()["detail"]
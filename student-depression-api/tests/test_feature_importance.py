@@ -0,0 +1,151 @@
+"""
+Testes para a importância das features por permutação
+(src/model/feature_importance.py) e o seu uso no feedback da API.
+"""
+import joblib
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model import model as model_module
+from src.model.compiled_model import CompiledModel
+from src.model.feature_importance import encode_frame, feature_columns, norm_contributions, permutation_importance, permuted_accuracy
+from src.model.feedback import FEATURE_IMPORTANCE, FEEDBACK_RULES, install_feature_importance
+from src.model.model_metadata import feature_importance_for, metadata_path, read_metadata, write_metadata
+from src.model.prediction_cache import artifact_fingerprint
+from src.model.train import prepare_dataset
+from tests.test_train import kaggle_dataset
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def holdout():
+    return prepare_dataset(kaggle_dataset(300, seed=1))
+
+
+@pytest.fixture
+def restore_serving_model(restore_serving_model):
+    """Além do pipeline e do estado (tests/conftest.py), devolve a importância padrão."""
+    yield
+    install_feature_importance(FEATURE_IMPORTANCE)
+
+
+class TestPermutationImportance:
+    """Testes para o cálculo sobre a matriz codificada."""
+
+    @pytest.mark.parametrize("feature", ["CGPA", "Sleep Duration", "Have you ever had suicidal thoughts ?"])
+    def test_permuted_accuracy_matches_pipeline(self, svm_pipeline, holdout, feature):
+        """Testa se permutar as colunas codificadas equivale a permutar a coluna original."""
+        X, y = holdout
+        compiled = CompiledModel.from_pipeline(svm_pipeline)
+        encoded, sq_norms = encode_frame(compiled, X)
+        columns = feature_columns(compiled)
+        contributions = norm_contributions(compiled, encoded, columns)
+
+        score = permuted_accuracy(compiled, encoded, sq_norms, y.to_numpy(), columns[feature], contributions[feature], seed=7)
+
+        permutation = np.random.default_rng(7).permutation(len(y))
+        permuted = X.copy()
+        permuted[feature] = X[feature].to_numpy()[permutation]
+        assert score == pytest.approx((svm_pipeline.predict(permuted) == y.to_numpy()).mean())
+
+    def test_section(self, svm_pipeline, holdout):
+        """Testa o formato da seção gravada nos metadados."""
+        X, y = holdout
+        section = permutation_importance(CompiledModel.from_pipeline(svm_pipeline), X, y, repeats=2, jobs=1)
+
+        assert set(section["importances"]) == set(svm_pipeline.feature_names_in_)
+        assert (section["rows"], section["repeats"]) == (len(y), 2)
+        assert section["baseline_score"] == pytest.approx((svm_pipeline.predict(X) == y.to_numpy()).mean())
+        means = [values["mean"] for values in section["importances"].values()]
+        assert means == sorted(means, reverse=True)
+        assert sum(values["percent"] for values in section["importances"].values()) == pytest.approx(100, abs=0.6)
+
+    def test_reproducible(self, svm_pipeline, holdout):
+        """Testa se a mesma semente dá o mesmo resultado, em série ou em paralelo."""
+        X, y = holdout
+        compiled = CompiledModel.from_pipeline(svm_pipeline)
+        serial = permutation_importance(compiled, X, y, repeats=2, jobs=1)
+        parallel = permutation_importance(compiled, X, y, repeats=2, jobs=2)
+        assert serial["importances"] == parallel["importances"]
+
+
+class TestModelMetadata:
+    """Testes para os metadados que acompanham o artefato."""
+
+    def test_round_trip(self, tmp_path):
+        """Testa gravação e leitura, e o arquivo ausente."""
+        path = metadata_path(tmp_path / "svm.joblib")
+        assert read_metadata(path) == {}
+        write_metadata(path, {"feature_importance": {"model_fingerprint": "abc", "importances": {"Age": {"percent": 2.5}}}})
+        assert read_metadata(path)["feature_importance"]["model_fingerprint"] == "abc"
+        assert not path.with_name(path.name + ".tmp").exists()
+
+    def test_fingerprint_must_match(self):
+        """Testa se a importância de outro artefato é ignorada."""
+        metadata = {"feature_importance": {"model_fingerprint": "abc", "importances": {"Age": {"percent": 2.5}}}}
+        assert feature_importance_for(metadata, "abc") == {"Age": 2.5}
+        assert feature_importance_for(metadata, "outro") is None
+        assert feature_importance_for(metadata, None) is None
+        assert feature_importance_for({}, "abc") is None
+
+
+class TestServingImportance:
+    """Testes para a importância usada pela API."""
+
+    def write_artifact(self, tmp_path, svm_pipeline, fingerprint=None):
+        path = tmp_path / "svm.joblib"
+        joblib.dump(svm_pipeline, path)
+        importance = {feature: {"percent": 9.1} for feature in FEATURE_IMPORTANCE}
+        write_metadata(metadata_path(path), {"feature_importance": {
+            "model_fingerprint": fingerprint or artifact_fingerprint(path), "importances": importance,
+        }})
+        return path
+
+    def test_metadata_importance_in_feedback(self, tmp_path, svm_pipeline, restore_serving_model, valid_prediction_data):
+        """Testa se o feedback passa a usar a importância dos metadados."""
+        path = self.write_artifact(tmp_path, svm_pipeline)
+        with patch('joblib.load', return_value=svm_pipeline):
+            assert model_module.load_model(path, "joblib")
+
+        assert model_module.startup_state["feature_importance_source"] == "metadata"
+        feedback = client.post("/model/predict", json=valid_prediction_data).json()["feature_feedback"]
+        assert all(item["importance"] == 9.1 for item in feedback)
+
+    def test_other_artifact_falls_back(self, tmp_path, svm_pipeline, restore_serving_model, valid_prediction_data):
+        """Testa se metadados de outro artefato não são usados."""
+        path = self.write_artifact(tmp_path, svm_pipeline, fingerprint="outro")
+        with patch('joblib.load', return_value=svm_pipeline):
+            assert model_module.load_model(path, "joblib")
+
+        assert model_module.startup_state["feature_importance_source"] == "default"
+        feedback = client.post("/model/predict", json=valid_prediction_data).json()["feature_feedback"]
+        assert [item["importance"] for item in feedback] == [FEATURE_IMPORTANCE[rule["model_feature"]] for rule in FEEDBACK_RULES]
+
+    def test_missing_metadata_logs_info(self, tmp_path, svm_pipeline, restore_serving_model, caplog):
+        """Testa se a ausência dos metadados (o caso normal) não gera aviso, e metadados de outro artefato sim."""
+        path = tmp_path / "svm.joblib"
+        joblib.dump(svm_pipeline, path)
+        with caplog.at_level("INFO", logger="src.model.model"), patch('joblib.load', return_value=svm_pipeline):
+            assert model_module.load_model(path, "joblib")
+        assert model_module.startup_state["feature_importance_source"] == "default"
+        assert [r.levelname for r in caplog.records if "importância das features" in r.getMessage().lower()] == ["INFO"]
+
+        caplog.clear()
+        path = self.write_artifact(tmp_path, svm_pipeline, fingerprint="outro")
+        with caplog.at_level("INFO", logger="src.model.model"), patch('joblib.load', return_value=svm_pipeline):
+            assert model_module.load_model(path, "joblib")
+        assert [r.levelname for r in caplog.records if "importância das features" in r.getMessage().lower()] == ["WARNING"]
+
+    def test_incomplete_importance_falls_back(self, tmp_path, svm_pipeline, restore_serving_model):
+        """Testa se uma importância sem todas as colunas não é usada."""
+        path = self.write_artifact(tmp_path, svm_pipeline)
+        metadata = read_metadata(metadata_path(path))
+        del metadata["feature_importance"]["importances"]["CGPA"]
+        write_metadata(metadata_path(path), metadata)
+        with patch('joblib.load', return_value=svm_pipeline):
+            assert model_module.load_model(path, "joblib")
+        assert model_module.startup_state["feature_importance_source"] == "default"
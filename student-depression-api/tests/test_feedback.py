@@ -0,0 +1,315 @@
+"""
+Testes do motor de feedback compilado.
+
+A implementação anterior (if/elif) está copiada abaixo sem alterações e
+serve de referência: a saída do motor compilado deve ser idêntica, byte a
+byte, para todas as faixas de todas as features.
+"""
+import json
+import math
+import pytest
+from typing import Any, Dict, List
+from src.model.feedback import FEATURE_IMPORTANCE, FEEDBACK_RULES, compile_feedback_rules, generate_feature_feedback
+
+
+LEGACY_FEATURE_IMPORTANCE = {
+    'Have you ever had suicidal thoughts ?': 48.5,
+    'Academic Pressure': 26.1,
+    'Financial Stress': 11.4,
+    'Age': 5.9,
+    'Work/Study Hours': 2.4,
+    'Dietary Habits': 2.4,
+    'Study Satisfaction': 2.3,
+    'Sleep Duration': 0.6,
+    'Gender': 0.4,
+    'Family History of Mental Illness': 0.1,
+    'CGPA': -0.1,
+}
+
+
+def legacy_generate_feature_feedback(user_data: dict) -> List[Dict[str, Any]]:
+    """
+    Gera feedback detalhado para cada feature baseado na resposta do usuário
+    """
+    feedback_list = []
+    
+    # 1. Gênero
+    feedback_list.append({
+        'feature': 'Gênero',
+        'user_value': user_data['gender'],
+        'importance': LEGACY_FEATURE_IMPORTANCE['Gender'],
+        'impact_level': 'BAIXO',
+        'message': f"Com base em sua resposta, o gênero '{user_data['gender']}' tem impacto mínimo na predição de depressão. Estudos mostram pequenas diferenças entre gêneros, mas fatores individuais são mais determinantes.",
+        'context': f"O gênero representa apenas {LEGACY_FEATURE_IMPORTANCE['Gender']}% da importância no modelo, indicando que não é um fator determinante."
+    })
+    
+    # 2. Idade - MODERADO (5.9%)
+    age_feedback = f"Com base na sua idade de {user_data['age']} anos, "
+    if user_data['age'] <= 20:
+        age_feedback += "você está em uma faixa etária onde episódios depressivos podem estar relacionados à adaptação universitária e independência. A idade tem um impacto moderado no modelo."
+    elif user_data['age'] <= 25:
+        age_feedback += "você está em uma idade de transições importantes (formatura, primeiro emprego), que podem ser fatores de estresse significativos."
+    else:
+        age_feedback += "você está em uma faixa etária com maior estabilidade emocional, o que pode ser um fator protetor importante."
+    
+    feedback_list.append({
+        'feature': 'Idade',
+        'user_value': f"{user_data['age']} anos",
+        'importance': LEGACY_FEATURE_IMPORTANCE['Age'],
+        'impact_level': 'MODERADO',
+        'message': age_feedback,
+        'context': f"A idade tem importância moderada ({LEGACY_FEATURE_IMPORTANCE['Age']}%) no modelo, sendo o quarto fator mais relevante."
+    })
+    
+    # 4. Coeficiente de Rendimento (CR)
+    cgpa_feedback = f"Seu CR de {user_data['cgpa']:.1f} "
+    if user_data['cgpa'] >= 8.0:
+        cgpa_feedback += "indica excelente desempenho acadêmico, o que geralmente está associado a maior autoestima e senso de competência."
+    elif user_data['cgpa'] >= 7.0:
+        cgpa_feedback += "mostra bom desempenho acadêmico, equilibrando expectativas e resultados adequadamente."
+    elif user_data['cgpa'] >= 6.0:
+        cgpa_feedback += "sugere desempenho mediano, que pode gerar algumas preocupações mas não é necessariamente problemático."
+    else:
+        cgpa_feedback += "pode estar gerando estresse acadêmico e impactando sua autoestima. Considere buscar apoio pedagógico."
+    
+    feedback_list.append({
+        'feature': 'Coeficiente de Rendimento (CR)',
+        'user_value': f"{user_data['cgpa']:.1f}",
+        'importance': LEGACY_FEATURE_IMPORTANCE['CGPA'],
+        'impact_level': 'BAIXO',
+        'message': cgpa_feedback,
+        'context': f"O CR tem baixa importância ({LEGACY_FEATURE_IMPORTANCE['CGPA']}%) no modelo, mas pode afetar autoestima e perspectivas futuras."
+    })
+    
+    # 5. Duração do Sono - BAIXO (0.6%)
+    sleep_feedback = f"Sua duração de sono '{user_data['sleep_duration']}' "
+    if user_data['sleep_duration'] == 'Menos de 5 horas':
+        sleep_feedback += "é insuficiente e pode estar impactando seu humor, concentração e bem-estar geral. Embora tenha baixo peso no modelo, é fundamental para saúde mental."
+    elif user_data['sleep_duration'] == '5-6 horas':
+        sleep_feedback += "está abaixo do recomendado para a maioria dos adultos. Pode estar afetando sua capacidade de lidar com estresse."
+    elif user_data['sleep_duration'] == '7-8 horas':
+        sleep_feedback += "está dentro da faixa ideal para a maioria dos adultos, contribuindo positivamente para sua saúde mental."
+    elif user_data['sleep_duration'] == 'Mais de 8 horas':
+        sleep_feedback += "pode indicar boa recuperação, mas se for excessivo (>9h) pode sinalizar possível escape ou alterações do humor."
+    else:
+        sleep_feedback += "com padrões irregulares pode estar impactando sua regulação emocional e energia."
+    
+    feedback_list.append({
+        'feature': 'Duração do Sono',
+        'user_value': user_data['sleep_duration'],
+        'importance': LEGACY_FEATURE_IMPORTANCE['Sleep Duration'],
+        'impact_level': 'BAIXO',
+        'message': sleep_feedback,
+        'context': f"A duração do sono tem baixa importância ({LEGACY_FEATURE_IMPORTANCE['Sleep Duration']}%) no modelo, mas permanece crucial para bem-estar geral."
+    })
+    
+    # 6. Hábitos Alimentares - BAIXO (2.3%)
+    diet_feedback = f"Seus hábitos alimentares '{user_data['dietary_habits']}' "
+    if user_data['dietary_habits'] == 'Muito saudáveis':
+        diet_feedback += "são excelentes e contribuem positivamente para sua energia, humor e bem-estar geral. Embora tenham baixo peso no modelo, são importantes para qualidade de vida."
+    elif user_data['dietary_habits'] == 'Moderadamente saudáveis':
+        diet_feedback += "mostram boa consciência nutricional, com espaço para pequenos ajustes que podem melhorar seu bem-estar."
+    elif user_data['dietary_habits'] == 'Pouco saudáveis':
+        diet_feedback += "podem estar impactando sua energia e humor. Mudanças na alimentação podem ter benefícios para bem-estar geral."
+    else:
+        diet_feedback += "podem estar afetando negativamente sua energia, concentração e estabilidade emocional."
+    
+    feedback_list.append({
+        'feature': 'Hábitos Alimentares',
+        'user_value': user_data['dietary_habits'],
+        'importance': LEGACY_FEATURE_IMPORTANCE['Dietary Habits'],
+        'impact_level': 'BAIXO',
+        'message': diet_feedback,
+        'context': f"Os hábitos alimentares têm baixa importância ({LEGACY_FEATURE_IMPORTANCE['Dietary Habits']}%) no modelo, mas contribuem para o bem-estar geral."
+    })
+    
+    # 7. Pensamentos Suicidas (CRÍTICO - 48.5%)
+    suicidal_feedback = f"Sua resposta '{user_data['suicidal_thoughts']}' sobre pensamentos suicidas "
+    if user_data['suicidal_thoughts'] == 'Sim':
+        suicidal_feedback += "é o fator de MAIOR RISCO identificado pelo modelo, representando quase metade da importância total. É FUNDAMENTAL buscar ajuda profissional imediatamente. Existem tratamentos eficazes e você não está sozinho(a)."
+    else:
+        suicidal_feedback += "é extremamente protetiva e representa o fator mais importante para reduzir o risco de depressão no modelo, com quase metade do peso total da predição."
+    
+    feedback_list.append({
+        'feature': 'Pensamentos Suicidas',
+        'user_value': user_data['suicidal_thoughts'],
+        'importance': LEGACY_FEATURE_IMPORTANCE['Have you ever had suicidal thoughts ?'],
+        'impact_level': 'CRÍTICO',
+        'message': suicidal_feedback,
+        'context': f"Esta é a feature MAIS IMPORTANTE ({LEGACY_FEATURE_IMPORTANCE['Have you ever had suicidal thoughts ?']}%) no modelo, representando quase metade de toda a predição. É o fator mais determinante."
+    })
+    
+    # 8. Horas de Estudo/Trabalho - BAIXO (2.4%)
+    hours_feedback = f"Suas {user_data['work_study_hours']} horas de estudo/trabalho por dia "
+    if user_data['work_study_hours'] <= 4:
+        hours_feedback += "indicam carga leve, o que pode ser protetor contra sobrecarga. Embora tenha baixo peso no modelo, ainda influencia o bem-estar."
+    elif user_data['work_study_hours'] <= 8:
+        hours_feedback += "representam uma carga equilibrada, adequada para a maioria das pessoas."
+    elif user_data['work_study_hours'] <= 12:
+        hours_feedback += "indicam carga intensa que pode gerar estresse, mas ainda manejável com boa organização."
+    else:
+        hours_feedback += "representam sobrecarga significativa que pode estar impactando seu bem-estar e eficiência."
+    
+    feedback_list.append({
+        'feature': 'Horas de Estudo/Trabalho',
+        'user_value': f"{user_data['work_study_hours']} horas/dia",
+        'importance': LEGACY_FEATURE_IMPORTANCE['Work/Study Hours'],
+        'impact_level': 'BAIXO',
+        'message': hours_feedback,
+        'context': f"As horas de estudo/trabalho têm baixa importância ({LEGACY_FEATURE_IMPORTANCE['Work/Study Hours']}%) no modelo, mas ainda podem afetar o bem-estar."
+    })
+    
+    # 9. Estresse Financeiro - ALTO (12.8%)
+    financial_feedback = f"Seu nível de estresse financeiro {user_data['financial_stress']}/5 "
+    if user_data['financial_stress'] <= 2:
+        financial_feedback += "é baixo, o que contribui positivamente para sua estabilidade emocional e foco nos estudos."
+    elif user_data['financial_stress'] == 3:
+        financial_feedback += "é moderado, mas ainda manejável. Considere estratégias de planejamento financeiro."
+    else:
+        financial_feedback += "é alto e pode estar impactando significativamente seu bem-estar e capacidade de concentração."
+    
+    feedback_list.append({
+        'feature': 'Estresse Financeiro',
+        'user_value': f"{user_data['financial_stress']}/5",
+        'importance': LEGACY_FEATURE_IMPORTANCE['Financial Stress'],
+        'impact_level': 'ALTO',
+        'message': financial_feedback,
+        'context': f"O estresse financeiro é o terceiro fator mais importante ({LEGACY_FEATURE_IMPORTANCE['Financial Stress']}%) no modelo - mudanças aqui têm impacto significativo."
+    })
+    
+    # 10. Histórico Familiar
+    family_feedback = f"Seu histórico familiar '{user_data['family_history']}' "
+    if user_data['family_history'] == 'Sim':
+        family_feedback += "indica predisposição genética, mas não determina seu destino. Estar ciente pode ajudar na prevenção e cuidado preventivo."
+    else:
+        family_feedback += "não indica predisposição familiar conhecida, o que pode ser um fator protetor."
+    
+    feedback_list.append({
+        'feature': 'Histórico Familiar',
+        'user_value': user_data['family_history'],
+        'importance': LEGACY_FEATURE_IMPORTANCE['Family History of Mental Illness'],
+        'impact_level': 'BAIXO',
+        'message': family_feedback,
+        'context': f"O histórico familiar tem baixa importância ({LEGACY_FEATURE_IMPORTANCE['Family History of Mental Illness']}%) no modelo."
+    })
+    
+    # 11. Satisfação Com estudos - BAIXO (2.3%)
+    study_satisfaction = user_data['study_satisfaction']
+    satisfaction_feedback = f"Sua satisfação com os estudos de {study_satisfaction}/5 "
+    if study_satisfaction >= 4:
+        satisfaction_feedback += "é alta, indicando boa realização pessoal com suas atividades atuais. Embora tenha baixo peso no modelo, é um fator protetor importante para qualidade de vida."
+    elif study_satisfaction >= 3:
+        satisfaction_feedback += "é moderada, mostrando alguma satisfação mas com espaço para melhorias na qualidade de vida."
+    elif study_satisfaction >= 2:
+        satisfaction_feedback += "é baixa e pode estar contribuindo para sentimentos de desmotivação e insatisfação geral."
+    else:
+        satisfaction_feedback += "é muito baixa, indicando possível necessidade de mudanças significativas em suas atividades ou perspectivas."
+    
+    feedback_list.append({
+        'feature': 'Satisfação com Estudos',
+        'user_value': f"{study_satisfaction}/5",
+        'importance': LEGACY_FEATURE_IMPORTANCE['Study Satisfaction'],
+        'impact_level': 'BAIXO',
+        'message': satisfaction_feedback,
+        'context': f"A satisfação com os estudos tem baixa importância ({LEGACY_FEATURE_IMPORTANCE['Study Satisfaction']}%) no modelo, mas é relevante para qualidade de vida geral."
+    })
+    
+    # 12. Pressão Acadêmica (MUITO ALTO - 26.1%)
+    academic_pressure = user_data['academic_pressure']
+    pressure_feedback = f"Sua pressão acadêmica de {academic_pressure}/5 "
+    if academic_pressure <= 1:
+        pressure_feedback += "é muito baixa, o que é extremamente protetor contra desenvolvimento de sintomas depressivos."
+    elif academic_pressure <= 2:
+        pressure_feedback += "é baixa, o que é altamente protetor contra desenvolvimento de sintomas depressivos."
+    elif academic_pressure == 3:
+        pressure_feedback += "é moderada e ainda manejável, mas requer atenção para não aumentar, dado seu alto peso no modelo."
+    elif academic_pressure == 4:
+        pressure_feedback += "é alta e representa um fator de risco MUITO SIGNIFICATIVO. É importante desenvolver estratégias de manejo de estresse urgentemente."
+    else:
+        pressure_feedback += "é extremamente alta e representa o SEGUNDO MAIOR FATOR DE RISCO no modelo. É CRUCIAL buscar formas de reduzir essa pressão imediatamente."
+    
+    feedback_list.append({
+        'feature': 'Pressão Acadêmica',
+        'user_value': f"{academic_pressure}/5",
+        'importance': LEGACY_FEATURE_IMPORTANCE['Academic Pressure'],
+        'impact_level': 'MUITO ALTO',
+        'message': pressure_feedback,
+        'context': f"A pressão acadêmica é o SEGUNDO FATOR MAIS IMPORTANTE ({LEGACY_FEATURE_IMPORTANCE['Academic Pressure']}%) no modelo de predição, com peso muito significativo."
+    })
+    
+    return feedback_list
+
+
+BASE_USER_DATA = {
+    "gender": "Masculino",
+    "age": 22,
+    "academic_pressure": 3,
+    "cgpa": 7.5,
+    "study_satisfaction": 3,
+    "sleep_duration": "7-8 horas",
+    "dietary_habits": "Moderadamente saudáveis",
+    "suicidal_thoughts": "Não",
+    "work_study_hours": 8,
+    "financial_stress": 3,
+    "family_history": "Não",
+}
+
+# Valores que cobrem todas as faixas de cada feature, incluindo os limites
+BUCKET_VALUES = {
+    "gender": ["Masculino", "Feminino", "Outro", ""],
+    "age": [-5, 0, 17, 20, 21, 25, 26, 60, 150],
+    "cgpa": [0.0, 5.99, 6.0, 6.95, 7.0, 7.5, 7.99, 8.0, 9.96, 10.0, 12.0, -1.0, math.nan],
+    "sleep_duration": ["Menos de 5 horas", "5-6 horas", "7-8 horas", "Mais de 8 horas", "Irregular", ""],
+    "dietary_habits": ["Muito saudáveis", "Moderadamente saudáveis", "Pouco saudáveis", "Muito pouco saudáveis"],
+    "suicidal_thoughts": ["Sim", "Não", "Talvez"],
+    "work_study_hours": [0, 1, 4, 5, 8, 9, 12, 13, 23, 30],
+    "financial_stress": [0, 1, 2, 3, 4, 5, 11],
+    "family_history": ["Sim", "Não", "?"],
+    "study_satisfaction": [0, 1, 2, 3, 4, 5, 11],
+    "academic_pressure": [0, 1, 2, 3, 4, 5, 11],
+}
+
+
+def as_bytes(feedback):
+    return json.dumps(feedback, ensure_ascii=False).encode("utf-8")
+
+
+class TestFeedbackParity:
+    """Compara o motor compilado com a implementação anterior."""
+
+    @pytest.mark.parametrize("field", sorted(BUCKET_VALUES))
+    def test_every_bucket_matches_legacy(self, field):
+        """Testa cada faixa de cada feature contra a implementação anterior."""
+        for value in BUCKET_VALUES[field]:
+            user_data = {**BASE_USER_DATA, field: value}
+            assert as_bytes(generate_feature_feedback(user_data)) == as_bytes(legacy_generate_feature_feedback(user_data)), (field, value)
+
+    def test_conftest_profiles_match_legacy(self, valid_prediction_data, high_risk_prediction_data, low_risk_prediction_data):
+        """Testa os perfis usados no restante da suíte."""
+        for user_data in (valid_prediction_data, high_risk_prediction_data, low_risk_prediction_data):
+            assert as_bytes(generate_feature_feedback(user_data)) == as_bytes(legacy_generate_feature_feedback(user_data))
+
+    def test_importance_comes_from_feature_importance(self):
+        """Testa se a importância usada é a de FEATURE_IMPORTANCE."""
+        assert FEATURE_IMPORTANCE == LEGACY_FEATURE_IMPORTANCE
+        feedback = generate_feature_feedback(BASE_USER_DATA)
+        expected = [FEATURE_IMPORTANCE[rule['model_feature']] for rule in FEEDBACK_RULES]
+        assert [item['importance'] for item in feedback] == expected
+
+
+class TestCompiledRules:
+    """Testes da compilação da tabela de regras."""
+
+    def test_custom_importance_is_rendered_in_context(self):
+        """Testa se a importância é interpolada na compilação."""
+        importance = {key: 1.5 for key in FEATURE_IMPORTANCE}
+        rules = compile_feedback_rules(FEEDBACK_RULES, importance)
+        feedback = generate_feature_feedback(BASE_USER_DATA, rules)
+        assert all(item['importance'] == 1.5 for item in feedback)
+        assert all("1.5%" in item['context'] for item in feedback)
+
+    def test_returns_new_dicts_each_call(self):
+        """Testa se cada chamada devolve dicionários novos."""
+        first = generate_feature_feedback(BASE_USER_DATA)
+        first[0]['message'] = 'alterado'
+        assert generate_feature_feedback(BASE_USER_DATA)[0]['message'] != 'alterado'
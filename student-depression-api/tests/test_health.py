@@ -0,0 +1,102 @@
+"""
+Testes para o carregamento do modelo no lifespan e a verificação de prontidão.
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model import model as model_module
+
+
+client = TestClient(app)
+
+
+pytestmark = pytest.mark.usefixtures("restore_serving_model")
+
+
+class TestReadiness:
+    """Testes para o endpoint /health/ready."""
+
+    def test_not_ready_before_warm_up(self):
+        """Modelo carregado mas não aquecido não recebe tráfego."""
+        model_module.startup_state["warmed_up"] = False
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_ready"
+
+    def test_ready_after_startup(self, svm_pipeline):
+        """Depois de carregar e aquecer, o serviço fica pronto e expõe as métricas."""
+        with patch('joblib.load', return_value=svm_pipeline):
+            asyncio.run(model_module.startup())
+
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert data["model_loaded"] is True
+        assert data["warmed_up"] is True
+        assert data["error"] is None
+        assert data["load_time_ms"] >= 0
+        assert data["warmup_time_ms"] >= data["warmup_last_ms"] >= 0
+
+    def test_liveness_is_independent_of_readiness(self):
+        """A raiz continua respondendo mesmo sem modelo."""
+        model_module.install_model(None)
+        assert client.get("/").status_code == 200
+        assert client.get("/health/ready").status_code == 503
+
+
+class TestModelStartup:
+    """Testes para o carregamento e aquecimento do modelo."""
+
+    def test_load_failure_keeps_service_not_ready(self):
+        """Falha no carregamento deixa o modelo como None e registra o erro."""
+        with patch('joblib.load', side_effect=OSError("arquivo corrompido")):
+            asyncio.run(model_module.startup())
+
+        assert model_module.model is None
+        assert model_module.compiled_model is None
+        assert not model_module.is_ready()
+        data = client.get("/health/ready").json()
+        assert "arquivo corrompido" in data["error"]
+
+    def test_predict_without_model_returns_500(self, valid_prediction_data):
+        """Sem modelo carregado, a predição continua respondendo 500."""
+        model_module.install_model(None)
+        with patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            response = client.post("/model/predict", json=valid_prediction_data)
+        assert response.status_code == 500
+
+    def test_warm_up_failure_is_recorded(self, svm_pipeline):
+        """Erro no aquecimento não derruba a aplicação, mas ela não fica pronta."""
+        with patch('joblib.load', return_value=svm_pipeline), \
+                patch('src.model.model.score_requests', side_effect=RuntimeError("falha")):
+            asyncio.run(model_module.startup())
+
+        assert model_module.startup_state["model_loaded"] is True
+        assert not model_module.is_ready()
+        assert "falha" in model_module.startup_state["error"]
+
+    def test_install_model_compiles_pipeline(self, svm_pipeline):
+        """Instalar o pipeline recompila a versão NumPy e muda a versão do cache."""
+        version_before = model_module.current_model_version()
+        model_module.install_model(svm_pipeline, "outro-artefato")
+        assert model_module.compiled_model is not None
+        assert model_module.current_model_version() != version_before
+
+
+class TestLifespan:
+    """Testes para o lifespan da aplicação."""
+
+    def test_lifespan_loads_and_warms_model(self, svm_pipeline, valid_prediction_data):
+        """O lifespan carrega o modelo antes da primeira requisição e o desliga no fim."""
+        with patch('joblib.load', return_value=svm_pipeline) as mock_load:
+            with TestClient(app) as lifespan_client:
+                mock_load.assert_called_once()
+                assert lifespan_client.get("/health/ready").status_code == 200
+                response = lifespan_client.post("/model/predict", json=valid_prediction_data)
+                assert response.status_code == 200
+
+        # Durante o desligamento o serviço deixa de se anunciar como pronto
+        assert not model_module.is_ready()
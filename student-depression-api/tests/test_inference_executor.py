@@ -0,0 +1,161 @@
+"""
+Testes para o executor de inferência com fila limitada.
+"""
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model.inference_executor import ExecutorSaturatedError, InferenceExecutor
+
+
+client = TestClient(app)
+
+
+class TestInferenceExecutor:
+    """Testes unitários do InferenceExecutor."""
+
+    def test_runs_function_in_worker_thread(self):
+        """Testa se a função roda fora da thread do event loop."""
+        executor = InferenceExecutor(max_workers=1, max_queue_size=1)
+
+        async def scenario():
+            return await executor.run(lambda: threading.current_thread().name)
+
+        assert asyncio.run(scenario()).startswith("inference")
+        assert executor.stats()["completed"] == 1
+        executor.shutdown()
+
+    def test_rejects_when_queue_is_full(self):
+        """Testa se o executor rejeita chamadas além de workers + fila."""
+        executor = InferenceExecutor(max_workers=1, max_queue_size=1)
+        release = threading.Event()
+
+        async def scenario():
+            first = asyncio.ensure_future(executor.run(release.wait))
+            second = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0.05)
+
+            assert executor.queue_depth == 1
+            with pytest.raises(ExecutorSaturatedError):
+                await executor.run(release.wait)
+
+            release.set()
+            await asyncio.gather(first, second)
+
+        asyncio.run(scenario())
+        stats = executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["queue_depth"] == 0
+        assert stats["wait_ms_max"] > 0
+        executor.shutdown()
+
+    def test_cancelled_calls_keep_their_slot_until_done(self):
+        """Testa se chamadas canceladas só liberam a vaga quando o trabalho sai do pool."""
+        executor = InferenceExecutor(max_workers=1, max_queue_size=1)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(executor.run(release.wait))
+            queued = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0.05)
+            running.cancel()
+            queued.cancel()
+            await asyncio.gather(running, queued, return_exceptions=True)
+
+            # A chamada na fila nunca rodou e liberou a vaga; a que está rodando continua ocupando a thread
+            assert executor.queue_depth == 0
+            assert executor.stats()["in_flight"] == 1
+            admitted = asyncio.ensure_future(executor.run(lambda: 1))
+            await asyncio.sleep(0)
+            with pytest.raises(ExecutorSaturatedError):
+                await executor.run(lambda: 2)
+
+            release.set()
+            assert await admitted == 1
+            await asyncio.sleep(0.05)
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            release.set()
+        stats = executor.stats()
+        assert stats["queue_depth"] == 0
+        assert stats["in_flight"] == 0
+        assert stats["cancelled"] == 2
+        assert stats["completed"] == 1
+        # A chamada cancelada durante a execução entra na média de espera; a que saiu da fila, não
+        assert stats["started"] == 2
+        assert stats["wait_ms_avg"] == pytest.approx(executor._wait_total / 2 * 1000)
+        executor.shutdown()
+
+    def test_cancelled_after_work_finished_counts_as_cancelled(self):
+        """Testa se quem é cancelado depois de a função terminar, sem receber o resultado, conta como cancelado."""
+        executor = InferenceExecutor(max_workers=1, max_queue_size=0)
+
+        async def scenario():
+            call = asyncio.ensure_future(executor.run(lambda: 1))
+            await asyncio.sleep(0)
+            # Bloqueia o event loop: a função termina antes de o resultado ser entregue
+            time.sleep(0.05)
+            call.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+
+        asyncio.run(scenario())
+        stats = executor.stats()
+        assert stats["cancelled"] == 1
+        assert stats["completed"] == 0
+        assert stats["queue_depth"] == 0
+        assert stats["in_flight"] == 0
+        executor.shutdown()
+
+    def test_propagates_exceptions(self):
+        """Testa se exceções da função chegam a quem aguarda."""
+        executor = InferenceExecutor(max_workers=1, max_queue_size=0)
+
+        def fail():
+            raise ValueError("falhou")
+
+        with pytest.raises(ValueError):
+            asyncio.run(executor.run(fail))
+        assert executor.stats()["in_flight"] == 0
+        executor.shutdown()
+
+
+class TestPredictBackpressure:
+    """Testes do comportamento da rota quando o executor está cheio."""
+
+    def test_predict_returns_503_with_retry_after(self, valid_prediction_data):
+        """Testa se a rota responde 503 com Retry-After quando a fila está cheia."""
+        from src.model.model import inference_executor
+
+        with patch.object(inference_executor, 'run', side_effect=ExecutorSaturatedError("cheia")), \
+                patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            response = client.post("/model/predict", json=valid_prediction_data)
+
+        assert response.status_code == 503
+        assert "retry-after" in response.headers
+
+    def test_batch_returns_503_with_retry_after(self, valid_prediction_data):
+        """Testa o mesmo comportamento no endpoint em lote."""
+        from src.model.model import inference_executor
+
+        with patch.object(inference_executor, 'run', side_effect=ExecutorSaturatedError("cheia")):
+            response = client.post("/model/predict/batch", json=[valid_prediction_data])
+
+        assert response.status_code == 503
+        assert "retry-after" in response.headers
+
+    def test_executor_stats_endpoint(self, valid_prediction_data):
+        """Testa se as estatísticas do executor são expostas."""
+        client.post("/model/predict", json=valid_prediction_data)
+        response = client.get("/model/executor/stats")
+        assert response.status_code == 200
+        data = response.json()
+        for key in ("max_workers", "max_queue_size", "queue_depth", "rejected", "wait_ms_avg"):
+            assert key in data
+        assert data["completed"] >= 1
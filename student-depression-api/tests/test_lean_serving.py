@@ -0,0 +1,60 @@
+"""
+Testes do modo enxuto (MODEL_FORMAT=mmap): a aplicação serve sem importar pandas nem scikit-learn.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Roda num interpretador novo, já que a suíte de testes importa pandas e scikit-learn
+LEAN_SCRIPT = """
+import json, sys
+from fastapi.testclient import TestClient
+from main import app
+
+payload = json.loads(sys.argv[1])
+with TestClient(app) as client:
+    ready = client.get("/health/ready")
+    prediction = client.post("/model/predict", json=payload)
+    questions = client.get("/questions")
+
+print(json.dumps({
+    "ready": ready.status_code,
+    "predict": prediction.status_code,
+    "prediction": prediction.json(),
+    "questions": questions.status_code,
+    "heavy": [m for m in ("pandas", "sklearn", "scipy", "joblib") if m in sys.modules],
+}))
+"""
+
+
+def run_lean_app(payload: dict) -> dict:
+    env = {**os.environ, "MODEL_FORMAT": "mmap", "MODEL_PRELOAD": "false"}
+    output = subprocess.run(
+        [sys.executable, "-c", LEAN_SCRIPT, json.dumps(payload)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True, timeout=120,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class TestLeanServing:
+    """Serving com o artefato NumPy, sem o pipeline scikit-learn."""
+
+    def test_serves_without_pandas_or_sklearn(self, valid_prediction_data):
+        """/model/predict e /questions respondem sem carregar pandas, scikit-learn ou joblib."""
+        result = run_lean_app(valid_prediction_data)
+        assert result["ready"] == 200
+        assert result["predict"] == 200
+        assert result["questions"] == 200
+        assert result["heavy"] == []
+
+    def test_lean_prediction_matches_pipeline(self, valid_prediction_data):
+        """A resposta do modo enxuto é a mesma do app com o pipeline completo."""
+        from fastapi.testclient import TestClient
+        from main import app
+
+        expected = TestClient(app).post("/model/predict", json=valid_prediction_data).json()
+        assert run_lean_app(valid_prediction_data)["prediction"] == expected
@@ -0,0 +1,119 @@
+"""
+Testes para a pontuação incremental (src/model/incremental.py) e a sessão ao
+vivo do questionário (WebSocket /model/predict/live).
+"""
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from main import app
+from src.model.compiled_model import CompiledModel
+from src.model.incremental import IncrementalModel, IncrementalSession
+from src.model.prediction_request import PredictionRequest
+
+
+client = TestClient(app)
+
+
+def imputed_row(compiled: CompiledModel, answers: dict):
+    """Entrada do modelo com as respostas dadas e as demais imputadas, montada coluna a coluna."""
+    encoded = np.zeros(compiled.n_transformed)
+    for index, (feature, field) in enumerate(zip(compiled.numeric_features, compiled.numeric_fields)):
+        encoded[index] = answers.get(field, compiled.mean[index])
+    for feature, field in zip(compiled.categorical_features, compiled.categorical_fields):
+        columns = compiled.category_index[feature]
+        if field in answers:
+            if answers[field] in columns:
+                encoded[columns[answers[field]]] = 1.0
+        else:
+            encoded[list(columns.values())] = 1.0 / len(columns)
+    scaled = np.concatenate([(encoded[:compiled.n_numeric] - compiled.mean) / compiled.scale, encoded[compiled.n_numeric:]])
+    return encoded[None, :], np.array([(scaled ** 2).sum()])
+
+
+class TestIncrementalSession:
+    """Testes para a atualização das parcelas por feature."""
+
+    def test_estimates_match_full_scoring(self, svm_pipeline, high_risk_prediction_data):
+        """Testa cada estimativa parcial contra a entrada completa com imputação."""
+        compiled = CompiledModel.from_pipeline(svm_pipeline)
+        session = IncrementalSession(IncrementalModel(compiled))
+        answers = {}
+        for field, value in [(None, None), *high_risk_prediction_data.items()]:
+            if field is not None:
+                session.answer(field, value)
+                answers[field] = value
+            _, expected = compiled.predict_encoded(*imputed_row(compiled, answers))
+            _, probabilities = session.estimate()
+            np.testing.assert_allclose(probabilities, expected[0], atol=1e-9)
+
+    def test_changed_answer(self, svm_pipeline, valid_prediction_data, high_risk_prediction_data):
+        """Testa a troca de respostas já dadas."""
+        compiled = CompiledModel.from_pipeline(svm_pipeline)
+        session = IncrementalSession(IncrementalModel(compiled))
+        for field, value in high_risk_prediction_data.items():
+            session.answer(field, value)
+        for field, value in valid_prediction_data.items():
+            session.answer(field, value)
+
+        _, expected = compiled.predict_with_proba([PredictionRequest(**valid_prediction_data)])
+        np.testing.assert_allclose(session.estimate()[1], expected[0], atol=1e-9)
+
+    def test_invalid_answers(self, svm_pipeline):
+        """Testa campo desconhecido e valor inválido."""
+        session = IncrementalSession(IncrementalModel(CompiledModel.from_pipeline(svm_pipeline)))
+        with pytest.raises(ValueError):
+            session.answer("city", "Kalyan")
+        with pytest.raises(ValueError):
+            session.answer("age", "vinte")
+        with pytest.raises(ValueError):
+            session.answer("cgpa", float("nan"))
+        session.answer("age", "22")
+        assert session.answers == {"age": 22}
+
+
+class TestLiveRoute:
+    """Testes para o WebSocket /model/predict/live."""
+
+    def test_session_until_final(self, valid_prediction_data):
+        """Testa as estimativas e o resultado final idêntico ao de /model/predict."""
+        with client.websocket_connect("/model/predict/live") as websocket:
+            first = websocket.receive_json()
+            assert first["type"] == "estimate"
+            assert first["answered"] == 0
+            assert len(first["missing"]) == 11
+
+            for position, (field, value) in enumerate(valid_prediction_data.items(), start=1):
+                websocket.send_json({"field": field, "value": value})
+                message = websocket.receive_json()
+                if position < len(valid_prediction_data):
+                    assert message["type"] == "estimate"
+                    assert message["answered"] == position
+                    assert field not in message["missing"]
+                    assert sum(message["probability"]) == pytest.approx(1)
+
+        assert message["type"] == "final"
+        expected = client.post("/model/predict", json=valid_prediction_data).json()
+        assert {key: value for key, value in message.items() if key != "type"} == expected
+
+    def test_invalid_message_keeps_session(self, valid_prediction_data):
+        """Testa se uma mensagem inválida não encerra a sessão."""
+        with client.websocket_connect("/model/predict/live") as websocket:
+            websocket.receive_json()
+            websocket.send_text("não é json")
+            assert websocket.receive_json()["type"] == "error"
+            websocket.send_json({"field": "age", "value": "vinte"})
+            error = websocket.receive_json()
+            assert error["type"] == "error"
+            assert "age" in error["detail"]
+            websocket.send_json({"field": "age", "value": 22})
+            assert websocket.receive_json()["answered"] == 1
+
+    def test_model_not_loaded(self):
+        """Testa o encerramento da sessão quando o modelo não foi carregado."""
+        with patch('src.model.model.model', None), patch('src.model.model.compiled_model', None):
+            with client.websocket_connect("/model/predict/live") as websocket:
+                with pytest.raises(WebSocketDisconnect) as disconnect:
+                    websocket.receive_json()
+        assert disconnect.value.code == 1011
@@ -0,0 +1,139 @@
+"""
+Testes para as métricas por etapa e o endpoint /metrics (src/model/metrics.py).
+"""
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model import metrics
+from src.model.inference_executor import ExecutorSaturatedError
+from src.model.metrics import MetricsRegistry, PREDICTION_STAGES
+
+
+client = TestClient(app)
+
+
+def stage_count(name: str) -> int:
+    return metrics.STAGE_DURATION.count(name)
+
+
+class TestMetricPrimitives:
+    """Testes para contadores, histogramas e o formato texto do Prometheus."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Testa buckets cumulativos, +Inf, soma e contagem."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latência", ("stage",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "a")
+        histogram.observe(0.5, "a")
+        histogram.observe(5.0, "a")
+
+        text = registry.render()
+        assert "# TYPE latency_seconds histogram" in text
+        assert 'latency_seconds_bucket{stage="a",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{stage="a",le="1.0"} 2' in text
+        assert 'latency_seconds_bucket{stage="a",le="+Inf"} 3' in text
+        assert 'latency_seconds_sum{stage="a"} 5.55' in text
+        assert 'latency_seconds_count{stage="a"} 3' in text
+
+    def test_counter_labels(self):
+        """Testa contadores com labels e escape de aspas."""
+        registry = MetricsRegistry()
+        counter = registry.counter("errors_total", "Erros", ("exception",))
+        counter.inc('Erro "estranho"')
+        counter.inc('Erro "estranho"', amount=2)
+
+        assert counter.value('Erro "estranho"') == 3
+        assert 'errors_total{exception="Erro \\"estranho\\""} 3' in registry.render()
+
+    def test_gauge_without_value_is_omitted(self):
+        """Gauges sem valor (None) não aparecem na saída."""
+        registry = MetricsRegistry()
+        registry.gauge("load_seconds", "Carregamento", lambda: None)
+        registry.gauge("ready", "Pronto", lambda: 1)
+        lines = registry.render().splitlines()
+        assert not any(line.startswith("load_seconds ") for line in lines)
+        assert "ready 1" in lines
+
+
+class TestMetricsEndpoint:
+    """Testes para o endpoint /metrics."""
+
+    def test_metrics_content_type(self):
+        """Testa o content-type do formato texto do Prometheus."""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE prediction_stage_duration_seconds histogram" in response.text
+
+    def test_prediction_moves_stage_histograms(self, valid_prediction_data):
+        """Cada etapa da predição registra uma observação."""
+        before = {name: stage_count(name) for name in PREDICTION_STAGES}
+        with patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            response = client.post("/model/predict", json=valid_prediction_data)
+        assert response.status_code == 200
+
+        for name in PREDICTION_STAGES:
+            assert stage_count(name) > before[name], name
+
+    def test_request_counters_by_route_and_status(self, valid_prediction_data):
+        """Requisições são contadas por template de rota, método e status."""
+        ok_before = metrics.REQUESTS.value("/model/predict", "POST", "200")
+        invalid_before = metrics.REQUESTS.value("/model/predict", "POST", "422")
+        duration_before = metrics.REQUEST_DURATION.count("/model/predict", "POST")
+
+        client.post("/model/predict", json=valid_prediction_data)
+        client.post("/model/predict", json={})
+
+        assert metrics.REQUESTS.value("/model/predict", "POST", "200") == ok_before + 1
+        assert metrics.REQUESTS.value("/model/predict", "POST", "422") == invalid_before + 1
+        assert metrics.REQUEST_DURATION.count("/model/predict", "POST") == duration_before + 2
+
+    def test_unknown_paths_share_one_label(self):
+        """Caminhos desconhecidos não criam uma série por URL."""
+        before = metrics.REQUESTS.value("unmatched", "GET", "404")
+        client.get("/nao-existe-123")
+        client.get("/nao-existe-456")
+        assert metrics.REQUESTS.value("unmatched", "GET", "404") == before + 2
+
+    def test_errors_by_exception_type(self, valid_prediction_data):
+        """Erros são contados pelo tipo da exceção."""
+        validation_before = metrics.PREDICTION_ERRORS.value("/model/predict", "ValidationError")
+        saturated_before = metrics.PREDICTION_ERRORS.value("/model/predict", "ExecutorSaturatedError")
+
+        client.post("/model/predict", json={**valid_prediction_data, "age": "vinte"})
+        with patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False), \
+                patch('src.model.micro_batcher.MICRO_BATCH_ENABLED', False), \
+                patch('src.model.model.inference_executor.run', side_effect=ExecutorSaturatedError("cheia")):
+            assert client.post("/model/predict", json=valid_prediction_data).status_code == 503
+
+        assert metrics.PREDICTION_ERRORS.value("/model/predict", "ValidationError") == validation_before + 1
+        assert metrics.PREDICTION_ERRORS.value("/model/predict", "ExecutorSaturatedError") == saturated_before + 1
+
+    def test_batch_item_errors(self, valid_prediction_data):
+        """Itens inválidos do lote contam como erro da rota de lote."""
+        before = metrics.PREDICTION_ERRORS.value("/model/predict/batch", "ValidationError")
+        client.post("/model/predict/batch", json=[valid_prediction_data, {"age": 20}])
+        assert metrics.PREDICTION_ERRORS.value("/model/predict/batch", "ValidationError") == before + 1
+
+    def test_model_not_loaded_events(self, valid_prediction_data):
+        """Requisições sem modelo carregado são contadas por rota."""
+        before = metrics.MODEL_NOT_LOADED.value("/model/predict")
+        with patch('src.model.model.model', None), patch('src.model.model.compiled_model', None):
+            assert client.post("/model/predict", json=valid_prediction_data).status_code == 500
+        assert metrics.MODEL_NOT_LOADED.value("/model/predict") == before + 1
+        assert 'model_not_loaded_total{route="/model/predict"}' in client.get("/metrics").text
+
+    def test_metrics_can_be_disabled(self, valid_prediction_data):
+        """Com METRICS_ENABLED=false nada é registrado."""
+        before = stage_count("feedback")
+        with patch('src.model.metrics.METRICS_ENABLED', False), \
+                patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            client.post("/model/predict", json=valid_prediction_data)
+        assert stage_count("feedback") == before
+
+    def test_model_gauges(self):
+        """O estado do modelo e das filas aparece como gauge."""
+        text = client.get("/metrics").text
+        assert "# TYPE model_ready gauge" in text
+        assert "inference_queue_depth " in text
+        assert "prediction_cache_hit_rate " in text
@@ -0,0 +1,115 @@
+"""
+Testes para o micro-batching de requisições concorrentes.
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model.inference_executor import InferenceExecutor
+from src.model.micro_batcher import MicroBatcher
+
+
+client = TestClient(app)
+
+
+class RecordingScorer:
+    """Função de pontuação falsa que registra o tamanho de cada lote."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, items):
+        self.batch_sizes.append(len(items))
+        return [ValueError(item) if item < 0 else item * 10 for item in items]
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor(max_workers=1, max_queue_size=8)
+    yield executor
+    executor.shutdown()
+
+
+class TestMicroBatcher:
+    """Testes unitários do MicroBatcher."""
+
+    def test_concurrent_requests_share_one_call(self, executor):
+        """Testa se requisições concorrentes são pontuadas juntas e recebem o próprio resultado."""
+        scorer = RecordingScorer()
+        batcher = MicroBatcher(scorer, executor, max_wait_ms=50, max_batch_size=100)
+
+        async def scenario():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+        assert asyncio.run(scenario()) == [i * 10 for i in range(10)]
+        assert scorer.batch_sizes == [10]
+        assert batcher.stats()["flushes_by_timeout"] == 1
+
+    def test_flushes_when_batch_is_full(self, executor):
+        """Testa se o lote é disparado ao atingir o tamanho máximo."""
+        scorer = RecordingScorer()
+        batcher = MicroBatcher(scorer, executor, max_wait_ms=10_000, max_batch_size=4)
+
+        async def scenario():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(8)))
+
+        assert asyncio.run(scenario()) == [i * 10 for i in range(8)]
+        assert scorer.batch_sizes == [4, 4]
+        stats = batcher.stats()
+        assert stats["flushes_by_size"] == 2
+        assert stats["avg_batch_size"] == 4
+        assert stats["batch_size_histogram"]["le_4"] == 2
+
+    def test_item_error_only_affects_its_request(self, executor):
+        """Testa se a exceção de um item volta só para a sua requisição."""
+        batcher = MicroBatcher(RecordingScorer(), executor, max_wait_ms=20, max_batch_size=100)
+
+        async def scenario():
+            return await asyncio.gather(batcher.submit(1), batcher.submit(-1), return_exceptions=True)
+
+        ok, error = asyncio.run(scenario())
+        assert ok == 10
+        assert isinstance(error, ValueError)
+
+    def test_executor_failure_reaches_every_request(self, executor):
+        """Testa se uma falha do executor é propagada para todo o lote."""
+        def broken(items):
+            raise RuntimeError("quebrou")
+
+        batcher = MicroBatcher(broken, executor, max_wait_ms=20, max_batch_size=100)
+
+        async def scenario():
+            return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        # Cada requisição recebe a sua instância, encadeada à exceção original
+        assert results[0] is not results[1]
+        assert results[0].__cause__ is results[1].__cause__
+        assert str(results[0].__cause__) == "quebrou"
+
+
+class TestMicroBatchedRoute:
+    """Testes da rota /model/predict com micro-batching."""
+
+    def test_predict_matches_unbatched(self, valid_prediction_data):
+        """Testa se o resultado com e sem micro-batching é o mesmo."""
+        with patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            with patch('src.model.micro_batcher.MICRO_BATCH_ENABLED', True):
+                batched = client.post("/model/predict", json=valid_prediction_data)
+            with patch('src.model.micro_batcher.MICRO_BATCH_ENABLED', False):
+                direct = client.post("/model/predict", json=valid_prediction_data)
+
+        assert batched.status_code == 200
+        assert batched.json() == direct.json()
+
+    def test_batcher_stats_endpoint(self, valid_prediction_data):
+        """Testa se as métricas de tamanho de lote são expostas."""
+        with patch('src.model.micro_batcher.MICRO_BATCH_ENABLED', True), \
+                patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            client.post("/model/predict", json=valid_prediction_data)
+        data = client.get("/model/batcher/stats").json()
+        assert data["batches"] >= 1
+        assert data["items"] >= data["batches"]
+        assert "batch_size_histogram" in data
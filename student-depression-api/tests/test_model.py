@@ -355,7 +355,7 @@ class TestFeatureImportance:
 class TestModelLoading:
     """Testes para carregamento do modelo."""
     
-    @patch('src.model.model.joblib.load')
+    @patch('joblib.load')
     def test_model_loading_success(self, mock_joblib_load):
         """Testa se o modelo é carregado com sucesso."""
         from src.model import model as model_module
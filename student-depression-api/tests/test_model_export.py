@@ -0,0 +1,149 @@
+"""
+Testes para o artefato de serving mapeado em memória (src/model/model_export.py).
+"""
+import json
+import mmap
+import asyncio
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model import model as model_module
+from src.model.model_export import (
+    ARRAY_FILES,
+    METADATA_FILE,
+    export_compiled_model,
+    load_compiled_model,
+)
+from src.model.prediction_cache import artifact_fingerprint
+from tests.test_compiled_model import to_requests
+
+
+client = TestClient(app)
+
+
+def is_memory_mapped(array: np.ndarray) -> bool:
+    base = array
+    while base is not None:
+        if isinstance(base, (np.memmap, mmap.mmap)):
+            return True
+        base = getattr(base, "base", None)
+    return False
+
+
+@pytest.fixture
+def export_dir(compiled, tmp_path):
+    return export_compiled_model(compiled, tmp_path / "export", "fingerprint-teste")
+
+
+class TestExportRoundTrip:
+    """Exportação e carregamento do artefato."""
+
+    def test_arrays_are_memory_mapped(self, export_dir):
+        """Os arrays grandes ficam mapeados, somente leitura, sem cópia para o heap."""
+        loaded = load_compiled_model(export_dir)
+        for attribute in ARRAY_FILES:
+            array = getattr(loaded, attribute)
+            assert is_memory_mapped(array), attribute
+            assert not array.flags.writeable
+            assert array.flags['C_CONTIGUOUS']
+
+    def test_outputs_unchanged(self, compiled, export_dir, svm_pipeline, training_sample):
+        """Predições e probabilidades são idênticas às do modelo compilado em memória."""
+        requests = to_requests(training_sample)
+        loaded = load_compiled_model(export_dir)
+        labels, probabilities = loaded.predict_with_proba(requests)
+        expected_labels, expected_probabilities = compiled.predict_with_proba(requests)
+
+        np.testing.assert_array_equal(labels, expected_labels)
+        np.testing.assert_array_equal(probabilities, expected_probabilities)
+        np.testing.assert_array_equal(labels, svm_pipeline.predict(training_sample))
+
+    def test_load_without_mmap(self, export_dir):
+        """mmap=False carrega os arrays para memória privada."""
+        loaded = load_compiled_model(export_dir, mmap=False)
+        assert not is_memory_mapped(loaded.folded_support_vectors)
+
+    def test_pickled_arrays_are_rejected(self, export_dir):
+        """O carregamento nunca faz unpickle."""
+        np.save(export_dir / ARRAY_FILES["dual_coef"], np.array([object()], dtype=object), allow_pickle=True)
+        with pytest.raises(ValueError):
+            load_compiled_model(export_dir)
+
+    def test_unknown_format_version(self, export_dir):
+        """Versões de formato desconhecidas são recusadas."""
+        metadata_path = export_dir / METADATA_FILE
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        metadata["format_version"] = 99
+        metadata_path.write_text(json.dumps(metadata), encoding="utf-8")
+        with pytest.raises(ValueError, match="não suportada"):
+            load_compiled_model(export_dir)
+
+    def test_export_without_calibration(self, export_dir):
+        """Artefatos anteriores ao modelo aproximado, sem "calibration", são do SVC (Platt)."""
+        metadata_path = export_dir / METADATA_FILE
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        assert metadata.pop("calibration") == "platt"
+        metadata_path.write_text(json.dumps(metadata), encoding="utf-8")
+        assert load_compiled_model(export_dir).calibration == "platt"
+
+    def test_inconsistent_arrays(self, export_dir):
+        """Arrays com número de vetores de suporte diferente são recusados."""
+        np.save(export_dir / ARRAY_FILES["dual_coef"], np.zeros(3))
+        with pytest.raises(ValueError, match="inconsistente"):
+            load_compiled_model(export_dir)
+
+
+class TestShippedExport:
+    """O artefato versionado em src/resources acompanha o .joblib."""
+
+    def test_export_matches_joblib_artifact(self):
+        """O fingerprint registrado é o do .joblib atual."""
+        metadata = json.loads((model_module.MODEL_EXPORT_PATH / METADATA_FILE).read_text(encoding="utf-8"))
+        assert metadata["source_fingerprint"] == artifact_fingerprint(model_module.MODEL_PATH)
+
+    def test_shipped_export_parity(self, svm_pipeline, training_sample):
+        """O artefato versionado reproduz o pipeline."""
+        loaded = load_compiled_model(model_module.MODEL_EXPORT_PATH)
+        labels, probabilities = loaded.predict_with_proba(to_requests(training_sample))
+        np.testing.assert_array_equal(labels, svm_pipeline.predict(training_sample))
+        np.testing.assert_allclose(probabilities, svm_pipeline.predict_proba(training_sample), rtol=0, atol=1e-9)
+
+
+@pytest.mark.usefixtures("restore_serving_model")
+class TestMmapServing:
+    """Serving com MODEL_FORMAT=mmap."""
+
+    def test_load_model_mmap(self):
+        """Sem o pipeline, só a versão compilada fica em uso."""
+        assert model_module.load_model(model_format="mmap")
+        assert model_module.model is None
+        assert is_memory_mapped(model_module.compiled_model.folded_support_vectors)
+        assert model_module.startup_state["model_format"] == "mmap"
+        assert model_module.model_fingerprint == artifact_fingerprint(model_module.MODEL_PATH)
+
+    def test_predict_with_mmap_model(self, valid_prediction_data):
+        """/model/predict responde igual com o artefato mapeado, em qualquer SCORING_MODE."""
+        with patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            expected = client.post("/model/predict", json=valid_prediction_data).json()
+            model_module.load_model(model_format="mmap")
+            with patch('src.model.scoring.SCORING_MODE', 'pipeline'):
+                response = client.post("/model/predict", json=valid_prediction_data)
+        assert response.status_code == 200
+        assert response.json() == expected
+
+    def test_invalid_format(self):
+        """MODEL_FORMAT desconhecido deixa o serviço sem modelo."""
+        assert not model_module.load_model(model_format="onnx")
+        assert not model_module.model_available()
+        assert "MODEL_FORMAT" in model_module.startup_state["error"]
+
+    def test_preloaded_model_is_only_warmed(self):
+        """Com preload, o lifespan do worker não recarrega o modelo."""
+        model_module.preload()
+        assert model_module.startup_state["preloaded"]
+        with patch('src.model.model.load_model') as mock_load:
+            asyncio.run(model_module.startup())
+        mock_load.assert_not_called()
+        assert model_module.is_ready()
@@ -0,0 +1,144 @@
+"""
+Testes para o CompiledModel em float32 e o relatório de paridade
+(src/model/precision.py).
+"""
+import json
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model import model as model_module
+from src.model.model_export import ARRAY_FILES, METADATA_FILE, export_compiled_model, load_compiled_model
+from src.model.precision import parity_report
+from src.model.prediction_request import PredictionRequest
+from src.model.train import train
+from tests.test_compiled_model import to_requests
+from tests.test_model_export import is_memory_mapped
+from tests.test_train import kaggle_dataset
+
+
+client = TestClient(app)
+
+# Desvio aceito nas probabilidades em float32 (a soma do kernel em float32 fica em ~1e-4)
+FLOAT32_ATOL = 1e-3
+
+
+class TestFloat32Model:
+    """Testes para os arrays do kernel em float32."""
+
+    def test_arrays(self, compiled):
+        """Testa o tipo dos arrays e a entrada codificada."""
+        reduced = compiled.with_precision("float32")
+        assert compiled.with_precision("float64") is compiled
+        for array in (reduced.folded_support_vectors, reduced.support_sq_norms, reduced.dual_coef):
+            assert array.dtype == np.float32
+            assert array.flags['C_CONTIGUOUS']
+        assert reduced.mean.dtype == np.float64
+        requests = [PredictionRequest(**profile) for profile in model_module.WARMUP_PROFILES]
+        encoded, sq_norms = reduced.encode_requests(requests)
+        assert encoded.dtype == np.float32 and sq_norms.dtype == np.float32
+
+    def test_outputs_close(self, compiled, training_sample):
+        """Testa as probabilidades e os rótulos em float32 contra o float64."""
+        requests = to_requests(training_sample)
+        labels, probabilities = compiled.with_precision("float32").predict_with_proba(requests)
+        expected_labels, expected_probabilities = compiled.predict_with_proba(requests)
+        assert probabilities.dtype == np.float64
+        np.testing.assert_allclose(probabilities, expected_probabilities, rtol=0, atol=FLOAT32_ATOL)
+        np.testing.assert_array_equal(labels, expected_labels)
+
+    def test_invalid_precision(self, compiled):
+        """Testa precisões desconhecidas."""
+        with pytest.raises(ValueError, match="Precisão"):
+            compiled.with_precision("float16")
+
+
+class TestParityReport:
+    """Testes para o relatório de paridade."""
+
+    def test_float32_report(self, compiled, training_sample):
+        """Testa o relatório float32 x float64."""
+        report = parity_report(compiled, compiled.with_precision("float32"), training_sample)
+        assert report["precision"] == "float32" and report["reference_precision"] == "float64"
+        assert report["rows"] == len(training_sample)
+        assert 0 < report["max_probability_deviation"] < FLOAT32_ATOL
+        assert report["mean_probability_deviation"] <= report["max_probability_deviation"]
+        assert report["label_flips"] == 0
+        assert report["flipped_rows"] == []
+
+    def test_label_flips(self, compiled, training_sample):
+        """Testa a contagem e a lista das linhas com rótulo trocado."""
+        shifted = compiled.with_precision("float32")
+        shifted.intercept += 0.05
+        report = parity_report(compiled, shifted, training_sample)
+
+        decision = compiled.decision_function(*compiled.encode_requests(to_requests(training_sample)))
+        expected_flips = int(((decision >= -0.05) & (decision < 0)).sum())
+        assert report["label_flips"] >= expected_flips > 0
+        assert len(report["flipped_rows"]) == min(report["label_flips"], 20)
+        assert all(flip["reference_decision"] < 0 <= flip["decision"] for flip in report["flipped_rows"])
+
+
+class TestFloat32Export:
+    """Testes para o artefato de serving em float32."""
+
+    def test_round_trip(self, compiled, tmp_path, training_sample):
+        """Testa o mmap sem cópia e as saídas do artefato em float32."""
+        reduced = compiled.with_precision("float32")
+        directory = export_compiled_model(reduced, tmp_path / "export")
+        assert json.loads((directory / METADATA_FILE).read_text(encoding="utf-8"))["precision"] == "float32"
+
+        loaded = load_compiled_model(directory)
+        assert loaded.precision == "float32"
+        assert is_memory_mapped(loaded.folded_support_vectors)
+        assert loaded.folded_support_vectors.nbytes * 2 == compiled.folded_support_vectors.nbytes
+        requests = to_requests(training_sample)
+        np.testing.assert_array_equal(loaded.predict_with_proba(requests)[1], reduced.predict_with_proba(requests)[1])
+
+    def test_mismatched_arrays(self, compiled, tmp_path):
+        """Testa a recusa de arrays em precisão diferente da declarada."""
+        directory = export_compiled_model(compiled.with_precision("float32"), tmp_path / "export")
+        np.save(directory / ARRAY_FILES["dual_coef"], compiled.dual_coef)
+        with pytest.raises(ValueError, match="float32"):
+            load_compiled_model(directory)
+
+
+class TestFloat32Serving:
+    """Testes para MODEL_PRECISION=float32 e a opção do treinamento."""
+
+    def test_predict(self, svm_pipeline, restore_serving_model, valid_prediction_data):
+        """Testa /model/predict com o modelo em float32."""
+        with patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            expected = client.post("/model/predict", json=valid_prediction_data).json()
+            with patch('src.model.model.MODEL_PRECISION', 'float32'):
+                model_module.install_model(svm_pipeline)
+            response = client.post("/model/predict", json=valid_prediction_data)
+
+        assert model_module.compiled_model.precision == "float32"
+        assert model_module.startup_state["precision"] == "float32"
+        data = response.json()
+        assert data["prediction"] == expected["prediction"]
+        np.testing.assert_allclose(data["probability"], expected["probability"], rtol=0, atol=FLOAT32_ATOL)
+
+    def test_mmap_keeps_artifact_precision(self, compiled, restore_serving_model, tmp_path):
+        """Testa o artefato float32 mapeado sem conversão quando MODEL_PRECISION não é definido."""
+        directory = export_compiled_model(compiled.with_precision("float32"), tmp_path / "export")
+        with patch('src.model.model.MODEL_EXPORT_PATH', directory):
+            assert model_module.load_model(model_format="mmap")
+        assert model_module.compiled_model.precision == "float32"
+        assert is_memory_mapped(model_module.compiled_model.folded_support_vectors)
+        assert model_module.startup_state["precision"] == "float32"
+
+    def test_train_report(self, tmp_path):
+        """Testa o artefato float32 e o relatório de paridade gravados pelo treinamento."""
+        kaggle_dataset(300, seed=2).to_csv(tmp_path / "dataset.csv", index=False)
+        metadata = train(
+            tmp_path / "dataset.csv", tmp_path / "svm.joblib", tmp_path / "svm",
+            c_grid=[1.0], gamma_grid=['scale'], jobs=1, folds=3, importance_repeats=0, precision="float32",
+        )
+        assert metadata['precision'] == "float32"
+        report = metadata['precision_report']
+        assert report['rows'] == metadata['dataset']['test_rows']
+        assert report['max_probability_deviation'] < FLOAT32_ATOL
+        assert load_compiled_model(tmp_path / "svm").precision == "float32"
@@ -0,0 +1,202 @@
+"""
+Testes para o cache LRU de predições com deduplicação de requisições em andamento.
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model.prediction_cache import PredictionCache, request_cache_key
+from src.model.prediction_request import PredictionRequest
+
+
+client = TestClient(app)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def compute_returning(value, calls):
+    async def compute():
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+    return compute
+
+
+class TestPredictionCache:
+    """Testes unitários do PredictionCache."""
+
+    def test_hit_after_miss(self):
+        """Testa se a segunda consulta é servida pelo cache."""
+        cache = PredictionCache(maxsize=10)
+        calls = []
+
+        async def scenario():
+            first = await cache.get_or_compute("a", compute_returning(1, calls))
+            second = await cache.get_or_compute("a", compute_returning(2, calls))
+            return first, second
+
+        assert asyncio.run(scenario()) == (1, 1)
+        assert calls == [1]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        """Testa se a entrada menos usada é removida ao passar do limite."""
+        cache = PredictionCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiration(self):
+        """Testa se entradas expiram após o TTL."""
+        clock = FakeClock()
+        cache = PredictionCache(maxsize=10, ttl=5, time_fn=clock)
+        cache.put("a", 1)
+
+        clock.now = 4.9
+        assert cache.get("a") == 1
+        clock.now = 5.0
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_single_flight(self):
+        """Testa se requisições idênticas concorrentes compartilham uma única avaliação."""
+        cache = PredictionCache(maxsize=10)
+        calls = []
+
+        async def scenario():
+            return await asyncio.gather(*(cache.get_or_compute("a", compute_returning(7, calls)) for _ in range(5)))
+
+        assert asyncio.run(scenario()) == [7] * 5
+        assert calls == [7]
+        assert cache.stats()["deduplicated"] == 4
+
+    def test_single_flight_propagates_errors_without_caching(self):
+        """Testa se um erro chega a todos os que aguardam e não fica no cache."""
+        cache = PredictionCache(maxsize=10)
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("falhou")
+
+        async def scenario():
+            return await asyncio.gather(*(cache.get_or_compute("a", failing) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in asyncio.run(scenario()))
+        assert cache.get("a") is None
+
+    def test_cancelled_leader_does_not_fail_followers(self):
+        """Testa se cancelar quem iniciou a avaliação não cancela as requisições deduplicadas."""
+        cache = PredictionCache(maxsize=10)
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(0.02)
+            return 9
+
+        async def scenario():
+            leader = asyncio.ensure_future(cache.get_or_compute("a", slow))
+            await started.wait()
+            follower = asyncio.ensure_future(cache.get_or_compute("a", slow))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        assert asyncio.run(scenario()) == 9
+        assert cache.get("a") == 9
+        assert cache.stats()["deduplicated"] == 1
+
+    def test_version_change_invalidates(self):
+        """Testa se trocar a versão do modelo limpa o cache."""
+        cache = PredictionCache(maxsize=10)
+        cache.put("a", 1, version="v1")
+        assert cache.get("a", version="v1") == 1
+        assert cache.get("a", version="v2") is None
+        assert cache.stats()["invalidations"] == 1
+
+    def test_computation_from_old_version_is_discarded(self):
+        """Testa se uma avaliação iniciada antes da troca do modelo não volta o cache à versão antiga."""
+        cache = PredictionCache(maxsize=10)
+        release = asyncio.Event()
+
+        async def old_model():
+            await release.wait()
+            return "v1"
+
+        async def new_model():
+            return "v2"
+
+        async def scenario():
+            old = asyncio.ensure_future(cache.get_or_compute("a", old_model, version="v1"))
+            await asyncio.sleep(0)
+            # A mesma chave com a nova versão não aguarda a avaliação da versão antiga
+            assert await cache.get_or_compute("a", new_model, version="v2") == "v2"
+            cache.put("b", 2, version="v2")
+            release.set()
+            return await old
+
+        assert asyncio.run(scenario()) == "v1"
+        assert cache.get("a", version="v2") == "v2"
+        assert cache.get("b", version="v2") == 2
+        stats = cache.stats()
+        assert stats["deduplicated"] == 0
+        assert stats["stale_discarded"] == 1
+
+    def test_canonical_key(self, valid_prediction_data):
+        """Testa se requisições equivalentes geram a mesma chave."""
+        as_text = {**valid_prediction_data, "age": "22", "cgpa": 7.5}
+        assert request_cache_key(PredictionRequest(**valid_prediction_data)) == request_cache_key(PredictionRequest(**as_text))
+
+
+class TestCachedRoute:
+    """Testes do cache na rota /model/predict."""
+
+    def test_repeated_request_hits_cache(self, valid_prediction_data):
+        """Testa se a mesma requisição repetida é servida do cache sem chamar o modelo."""
+        from src.model import model as model_module
+
+        model_module.prediction_cache.clear()
+        first = client.post("/model/predict", json=valid_prediction_data)
+        hits_before = model_module.prediction_cache.stats()["hits"]
+
+        with patch.object(model_module, 'score_requests', side_effect=AssertionError("não deveria chamar o modelo")):
+            with patch('src.model.micro_batcher.MICRO_BATCH_ENABLED', False):
+                second = client.post("/model/predict", json=valid_prediction_data)
+
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert model_module.prediction_cache.stats()["hits"] == hits_before + 1
+
+    def test_cache_can_be_disabled(self, valid_prediction_data):
+        """Testa se o cache pode ser desligado por configuração."""
+        from src.model import model as model_module
+
+        stats_before = model_module.prediction_cache.stats()
+        with patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            response = client.post("/model/predict", json=valid_prediction_data)
+        assert response.status_code == 200
+        stats_after = model_module.prediction_cache.stats()
+        assert stats_after["hits"] == stats_before["hits"]
+        assert stats_after["misses"] == stats_before["misses"]
+
+    def test_cache_stats_endpoint(self):
+        """Testa se os contadores do cache são expostos."""
+        data = client.get("/model/cache/stats").json()
+        for key in ("hits", "misses", "evictions", "size", "maxsize"):
+            assert key in data
@@ -0,0 +1,81 @@
+"""
+Testes para o perfil por amostragem das requisições (src/model/profiling.py).
+"""
+import pstats
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model.profiling import ProfileSession, session_label
+
+
+client = TestClient(app)
+
+
+def profiled_functions(path) -> set:
+    return {function for (_, _, function) in pstats.Stats(str(path)).stats}
+
+
+class TestProfileSession:
+    """Testes para a sessão de perfil."""
+
+    def test_merges_profiles(self, tmp_path):
+        """Perfis de várias chamadas viram um único arquivo do pstats."""
+        def first():
+            return sum(range(100))
+
+        def second():
+            return sorted(range(100))
+
+        session = ProfileSession("teste")
+        session.run(first)
+        session.run(second)
+        path = session.dump(tmp_path)
+
+        assert path.suffix == ".prof"
+        assert {"first", "second"} <= profiled_functions(path)
+
+    def test_empty_session_writes_nothing(self, tmp_path):
+        """Sem perfis coletados nenhum arquivo é gravado."""
+        assert ProfileSession("vazia").dump(tmp_path) is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_session_label(self):
+        """O caminho vira um nome de arquivo seguro."""
+        assert session_label("/model/predict") == "model_predict"
+        assert session_label("/") == "root"
+
+
+class TestProfilingMiddleware:
+    """Testes para o middleware de perfil."""
+
+    def test_disabled_by_default(self, tmp_path, valid_prediction_data):
+        """Sem PROFILING_ENABLED nenhum perfil é gravado."""
+        with patch('src.model.profiling.PROFILING_DIR', tmp_path), \
+                patch('src.model.profiling.PROFILING_SAMPLE_RATE', 1.0):
+            client.post("/model/predict", json=valid_prediction_data)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_sampled_request_is_profiled(self, tmp_path, valid_prediction_data):
+        """Uma requisição sorteada gera um .prof com o event loop e a thread de inferência."""
+        with patch('src.model.profiling.PROFILING_ENABLED', True), \
+                patch('src.model.profiling.PROFILING_DIR', tmp_path), \
+                patch('src.model.profiling.PROFILING_SAMPLE_RATE', 1.0), \
+                patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+            response = client.post("/model/predict", json=valid_prediction_data)
+
+        assert response.status_code == 200
+        files = list(tmp_path.glob("*.prof"))
+        assert len(files) == 1
+        assert "model_predict" in files[0].name
+        functions = profiled_functions(files[0])
+        # Event loop e thread de inferência
+        assert "parse_prediction_request" in functions
+        assert "decision_function" in functions
+
+    def test_sample_rate_zero(self, tmp_path, valid_prediction_data):
+        """Com taxa zero nenhuma requisição é perfilada."""
+        with patch('src.model.profiling.PROFILING_ENABLED', True), \
+                patch('src.model.profiling.PROFILING_DIR', tmp_path), \
+                patch('src.model.profiling.PROFILING_SAMPLE_RATE', 0.0):
+            client.post("/model/predict", json=valid_prediction_data)
+        assert list(tmp_path.iterdir()) == []
@@ -181,3 +181,123 @@ class TestQuestionsResponseHeaders:
         """Testa se o status é 200 OK."""
         response = client.get("/questions")
         assert response.status_code == 200
+
+
+class TestQuestionsHttpCaching:
+    """Testes para ETag, GET condicional e compressão de /questions."""
+
+    def test_etag_and_cache_control(self):
+        """Testa se a resposta traz ETag forte e Cache-Control."""
+        response = client.get("/questions")
+        assert response.headers["etag"].startswith('"')
+        assert "cache-control" in response.headers
+
+    def test_if_none_match_returns_304(self):
+        """Testa se um ETag conhecido recebe 304 sem corpo."""
+        etag = client.get("/questions").headers["etag"]
+        response = client.get("/questions", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_stale_etag_returns_200(self):
+        """Testa se um ETag diferente recebe o corpo completo."""
+        response = client.get("/questions", headers={"If-None-Match": '"outro"'})
+        assert response.status_code == 200
+        assert len(response.json()) > 0
+
+    def test_gzip_and_identity_bodies_match(self):
+        """Testa se as versões comprimida e sem compressão têm o mesmo conteúdo."""
+        gzipped = client.get("/questions", headers={"Accept-Encoding": "gzip"})
+        identity = client.get("/questions", headers={"Accept-Encoding": "identity"})
+        assert gzipped.headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in identity.headers
+        assert gzipped.json() == identity.json()
+
+    @pytest.mark.parametrize("accept_encoding", ["gzip;q=0", "x-gzip", "identity, *;q=0", "br", "gzip;q=0, *"])
+    def test_gzip_refused_or_not_offered(self, accept_encoding):
+        """Testa se gzip só é usado quando o Accept-Encoding o aceita com q > 0."""
+        response = client.get("/questions", headers={"Accept-Encoding": accept_encoding})
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.parametrize("accept_encoding", ["gzip", "GZIP;q=0.5", "br, gzip;q=0.1", "*"])
+    def test_gzip_accepted(self, accept_encoding):
+        """Testa codificações e q-values que aceitam gzip."""
+        response = client.get("/questions", headers={"Accept-Encoding": accept_encoding})
+        assert response.headers["content-encoding"] == "gzip"
+
+    def test_gzip_has_its_own_etag(self):
+        """Testa se as duas representações têm ETags diferentes e se cada uma só valida a sua."""
+        gzip_etag = client.get("/questions", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+        identity_etag = client.get("/questions", headers={"Accept-Encoding": "identity"}).headers["etag"]
+        assert gzip_etag == identity_etag[:-1] + '-gzip"'
+
+        assert client.get("/questions", headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag}).status_code == 304
+        stale = client.get("/questions", headers={"Accept-Encoding": "gzip", "If-None-Match": identity_etag})
+        assert stale.status_code == 200
+        assert stale.headers["content-encoding"] == "gzip"
+        assert client.get("/questions", headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag}).status_code == 200
+
+    def test_body_matches_file(self):
+        """Testa se o conteúdo servido é o do arquivo questions.json."""
+        from src.model.questions import QUESTIONS_PATH
+        with open(QUESTIONS_PATH, encoding="utf-8") as f:
+            assert client.get("/questions").json() == json.load(f)
+
+    def test_hot_path_does_not_touch_disk(self):
+        """Testa se, após carregado, o endpoint não lê o arquivo."""
+        client.get("/questions")
+        with patch('builtins.open', side_effect=IOError("disco não deveria ser acessado")):
+            response = client.get("/questions")
+        assert response.status_code == 200
+
+
+class TestQuestionsStore:
+    """Testes para o recarregamento de questions.json."""
+
+    def write_questions(self, path, title):
+        path.write_text(json.dumps([{"type": "number", "data": {"id": "age", "title": title}}]), encoding="utf-8")
+
+    def test_reloads_when_mtime_changes(self, tmp_path):
+        """Testa se editar o arquivo gera um novo snapshot e ETag."""
+        import os
+        from src.model.questions import QuestionsStore
+
+        path = tmp_path / "questions.json"
+        self.write_questions(path, "antes")
+        store = QuestionsStore(path, watch_interval=0)
+        first = store.current()
+
+        assert store.reload_if_changed() is False
+
+        self.write_questions(path, "depois")
+        os.utime(path, ns=(first.mtime_ns + 10**9, first.mtime_ns + 10**9))
+        assert store.reload_if_changed() is True
+        assert store.current().questions[0]["data"]["title"] == "depois"
+        assert store.current().etag != first.etag
+
+    def test_invalid_edit_keeps_previous_version(self, tmp_path, caplog):
+        """Testa se um arquivo inválido mantém a última versão válida e registra o erro no log."""
+        import os
+        from src.model.questions import QuestionsStore
+
+        path = tmp_path / "questions.json"
+        self.write_questions(path, "válida")
+        store = QuestionsStore(path, watch_interval=0)
+        first = store.current()
+
+        path.write_text("{ inválido", encoding="utf-8")
+        os.utime(path, ns=(first.mtime_ns + 10**9, first.mtime_ns + 10**9))
+        with caplog.at_level("WARNING", logger="src.model.questions"):
+            assert store.reload_if_changed() is False
+        assert store.current() is first
+        record = next(r for r in caplog.records if r.name == "src.model.questions")
+        assert "mantendo a versão anterior" in record.getMessage()
+        assert record.exc_info is not None
+
+    def test_missing_file_raises(self, tmp_path):
+        """Testa se a ausência do arquivo é reportada na primeira carga."""
+        from src.model.questions import QuestionsStore
+
+        with pytest.raises(FileNotFoundError):
+            QuestionsStore(tmp_path / "nao-existe.json", watch_interval=0).current()
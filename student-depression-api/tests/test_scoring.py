@@ -0,0 +1,61 @@
+"""
+Testes de paridade do modo de pontuação em passada única.
+"""
+import numpy as np
+from unittest.mock import MagicMock, patch
+from src.model.scoring import predict_with_proba, supports_single_pass
+
+
+class TestSinglePassParity:
+    """Compara a passada única com model.predict / model.predict_proba."""
+
+    def test_pipeline_supports_single_pass(self, svm_pipeline):
+        """Testa se o pipeline salvo é reconhecido."""
+        assert supports_single_pass(svm_pipeline)
+
+    def test_labels_match_predict(self, svm_pipeline, training_sample):
+        """Testa se os rótulos são idênticos aos de model.predict."""
+        labels, _ = predict_with_proba(svm_pipeline, training_sample)
+        np.testing.assert_array_equal(labels, svm_pipeline.predict(training_sample))
+
+    def test_probabilities_match_predict_proba(self, svm_pipeline, training_sample):
+        """Testa se as probabilidades são as mesmas de model.predict_proba."""
+        _, probabilities = predict_with_proba(svm_pipeline, training_sample)
+        np.testing.assert_allclose(probabilities, svm_pipeline.predict_proba(training_sample), rtol=0, atol=1e-12)
+
+    def test_predict_and_proba_disagreement_is_preserved(self, svm_pipeline, training_sample):
+        """
+        Testa a discordância documentada do sklearn: perto da fronteira o argmax
+        das probabilidades de Platt pode diferir de predict, e o rótulo deve
+        continuar sendo o de predict.
+        """
+        labels, probabilities = predict_with_proba(svm_pipeline, training_sample)
+        expected = svm_pipeline.predict(training_sample)
+        disagreement = probabilities.argmax(axis=1) != expected
+
+        assert disagreement.any()
+        np.testing.assert_array_equal(labels[disagreement], expected[disagreement])
+
+
+class TestScoringFallback:
+    """Testes para o caminho de compatibilidade."""
+
+    def test_unknown_model_uses_predict_and_predict_proba(self):
+        """Testa se modelos que não são Pipeline+SVC usam predict/predict_proba."""
+        model = MagicMock()
+        model.predict.return_value = np.array([1])
+        model.predict_proba.return_value = np.array([[0.2, 0.8]])
+
+        labels, probabilities = predict_with_proba(model, "X")
+
+        model.predict.assert_called_once_with("X")
+        model.predict_proba.assert_called_once_with("X")
+        assert labels[0] == 1
+
+    def test_pipeline_mode(self, svm_pipeline, training_sample):
+        """Testa se SCORING_MODE=pipeline mantém o comportamento antigo."""
+        sample = training_sample.head(5)
+        with patch('src.model.scoring.SCORING_MODE', 'pipeline'):
+            labels, probabilities = predict_with_proba(svm_pipeline, sample)
+        np.testing.assert_array_equal(labels, svm_pipeline.predict(sample))
+        np.testing.assert_array_equal(probabilities, svm_pipeline.predict_proba(sample))
@@ -0,0 +1,79 @@
+"""
+Testes para o header Server-Timing de /model/predict (src/model/server_timing.py).
+"""
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model.server_timing import RequestTimings
+
+
+client = TestClient(app)
+
+
+def parse_server_timing(value: str) -> dict:
+    entries = {}
+    for entry in value.split(","):
+        name, duration = entry.strip().split(";dur=")
+        entries[name] = float(duration)
+    return entries
+
+
+class TestRequestTimings:
+    """Testes para a formatação do header."""
+
+    def test_header_value(self):
+        """Durações em milissegundos, etapas repetidas somadas e total no fim."""
+        timings = RequestTimings()
+        timings.add("parse", 0.001)
+        timings.add("model", 0.002)
+        timings.add("model", 0.0005)
+
+        entries = parse_server_timing(timings.header_value())
+        assert list(entries) == ["parse", "model", "total"]
+        assert entries["parse"] == pytest.approx(1.0)
+        assert entries["model"] == pytest.approx(2.5)
+        assert entries["total"] >= 0
+
+    def test_merge(self):
+        """As etapas de um lote são somadas às da requisição."""
+        request, batch = RequestTimings(), RequestTimings()
+        request.add("parse", 0.001)
+        batch.add("model", 0.002)
+        request.merge(batch)
+        assert request.stages == {"parse": 0.001, "model": 0.002}
+
+
+class TestServerTimingHeader:
+    """Testes para o header na rota /model/predict."""
+
+    def test_disabled_by_default(self, valid_prediction_data):
+        """Sem SERVER_TIMING_ENABLED a resposta não leva o header."""
+        response = client.post("/model/predict", json=valid_prediction_data)
+        assert response.status_code == 200
+        assert "server-timing" not in response.headers
+
+    @pytest.mark.parametrize("micro_batch", [True, False])
+    def test_stages_in_header(self, valid_prediction_data, micro_batch):
+        """Com o header ligado, cada etapa da predição aparece, com ou sem micro-batching."""
+        with patch('src.model.server_timing.SERVER_TIMING_ENABLED', True), \
+                patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False), \
+                patch('src.model.micro_batcher.MICRO_BATCH_ENABLED', micro_batch):
+            response = client.post("/model/predict", json=valid_prediction_data)
+
+        assert response.status_code == 200
+        entries = parse_server_timing(response.headers["server-timing"])
+        for name in ("parse", "queue_wait", "model_input", "model", "user_data", "feedback", "response", "serialize", "total"):
+            assert name in entries, name
+            assert entries[name] >= 0
+        assert entries["total"] >= entries["model"]
+
+    def test_cache_hit_skips_model(self, valid_prediction_data):
+        """Numa resposta vinda do cache não há etapa de modelo."""
+        with patch('src.model.server_timing.SERVER_TIMING_ENABLED', True):
+            client.post("/model/predict", json=valid_prediction_data)
+            response = client.post("/model/predict", json=valid_prediction_data)
+
+        entries = parse_server_timing(response.headers["server-timing"])
+        assert "parse" in entries and "serialize" in entries
+        assert "model" not in entries
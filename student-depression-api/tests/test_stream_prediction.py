@@ -0,0 +1,200 @@
+"""
+Testes para o endpoint de predição em streaming (NDJSON/CSV).
+"""
+import asyncio
+import csv
+import io
+import json
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model.inference_executor import ExecutorSaturatedError
+from src.model.streaming import LineReader, LineTooLong, upload_format
+
+
+client = TestClient(app)
+
+NDJSON = {"content-type": "application/x-ndjson"}
+CSV = {"content-type": "text/csv"}
+
+
+def ndjson_body(items) -> bytes:
+    return "".join(json.dumps(item) + "\n" for item in items).encode()
+
+
+def csv_body(items) -> bytes:
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=list(items[0]))
+    writer.writeheader()
+    writer.writerows(items)
+    return output.getvalue().encode()
+
+
+def read_lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def split_lines(*chunks, max_line_bytes=16384):
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [line async for line in LineReader(source(), max_line_bytes)]
+
+    return asyncio.run(collect())
+
+
+class TestStreamPrediction:
+    """Testes para /model/predict/stream."""
+
+    def test_ndjson_matches_single_predictions(self, valid_prediction_data, high_risk_prediction_data, low_risk_prediction_data):
+        """Testa se cada linha do NDJSON tem o mesmo resultado de /model/predict."""
+        items = [valid_prediction_data, high_risk_prediction_data, low_risk_prediction_data]
+
+        response = client.post("/model/predict/stream", content=ndjson_body(items), headers=NDJSON)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = read_lines(response)
+        assert [r["index"] for r in results] == [0, 1, 2]
+
+        for item, result in zip(items, results):
+            single = client.post("/model/predict", json=item).json()
+            assert result["error"] is None
+            assert result["result"]["prediction"] == single["prediction"]
+            assert result["result"]["probability"] == pytest.approx(single["probability"])
+            assert result["result"]["feature_feedback"] == single["feature_feedback"]
+
+    def test_csv_matches_ndjson(self, valid_prediction_data, high_risk_prediction_data):
+        """Testa se o upload CSV produz o mesmo resultado do NDJSON."""
+        items = [valid_prediction_data, high_risk_prediction_data]
+
+        from_csv = client.post("/model/predict/stream", content=csv_body(items), headers=CSV)
+        from_ndjson = client.post("/model/predict/stream", content=ndjson_body(items), headers=NDJSON)
+        assert from_csv.status_code == 200
+        assert read_lines(from_csv) == read_lines(from_ndjson)
+
+    def test_csv_with_bom_and_crlf(self, valid_prediction_data):
+        """Testa CSV exportado por planilhas (BOM e CRLF)."""
+        body = b"\xef\xbb\xbf" + csv_body([valid_prediction_data]).replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+        response = client.post("/model/predict/stream", content=body, headers={"content-type": "text/csv; charset=utf-8"})
+        assert response.status_code == 200
+        assert read_lines(response)[0]["error"] is None
+
+    def test_invalid_lines_do_not_stop_stream(self, valid_prediction_data):
+        """Testa se linhas inválidas geram erro apenas na sua posição."""
+        invalid = dict(valid_prediction_data)
+        del invalid["cgpa"]
+        body = ndjson_body([valid_prediction_data, invalid]) + b"{nao e json\n\n" + ndjson_body([valid_prediction_data])
+
+        response = client.post("/model/predict/stream", content=body, headers=NDJSON)
+        assert response.status_code == 200
+        results = read_lines(response)
+
+        assert [r["index"] for r in results] == [0, 1, 2, 3]
+        assert results[0]["result"] is not None
+        assert "cgpa" in results[1]["error"]
+        assert results[2]["error"].startswith("Dados inválidos")
+        assert results[3]["result"] is not None
+
+    @pytest.mark.parametrize("value", ["nan", "inf"])
+    def test_non_finite_csv_value_rejected(self, valid_prediction_data, value):
+        """Testa se 'nan'/'inf' no CSV vira erro da linha, e não uma predição."""
+        response = client.post("/model/predict/stream", content=csv_body([valid_prediction_data, {**valid_prediction_data, "cgpa": value}]), headers=CSV)
+        results = read_lines(response)
+        assert results[0]["error"] is None
+        assert results[1]["result"] is None
+        assert "cgpa" in results[1]["error"]
+
+    def test_nan_ndjson_line_rejected(self, valid_prediction_data):
+        """Testa se um NaN em NDJSON vira erro da linha."""
+        response = client.post("/model/predict/stream", content=ndjson_body([{**valid_prediction_data, "cgpa": float("nan")}]), headers=NDJSON)
+        assert "cgpa" in read_lines(response)[0]["error"]
+
+    def test_csv_row_with_wrong_column_count(self, valid_prediction_data):
+        """Testa linha CSV com número de colunas diferente do cabeçalho."""
+        body = csv_body([valid_prediction_data]) + b"Masculino,22\n"
+        results = read_lines(client.post("/model/predict/stream", content=body, headers=CSV))
+        assert results[0]["error"] is None
+        assert "colunas" in results[1]["error"]
+
+    def test_chunk_boundaries_keep_order(self, valid_prediction_data, high_risk_prediction_data):
+        """Testa se a ordem e os resultados não dependem do tamanho do bloco."""
+        items = [valid_prediction_data, high_risk_prediction_data] * 5
+        body = ndjson_body(items)
+
+        expected = read_lines(client.post("/model/predict/stream", content=body, headers=NDJSON))
+        with patch('src.model.model.STREAM_CHUNK_SIZE', 3):
+            chunked = read_lines(client.post("/model/predict/stream", content=body, headers=NDJSON))
+
+        assert [r["index"] for r in chunked] == list(range(10))
+        for got, want in zip(chunked, expected):
+            assert got["result"]["prediction"] == want["result"]["prediction"]
+            assert got["result"]["probability"] == pytest.approx(want["result"]["probability"])
+            assert got["result"]["feature_feedback"] == want["result"]["feature_feedback"]
+
+    def test_line_too_long(self, valid_prediction_data):
+        """Testa se uma linha acima do limite vira erro sem derrubar o stream."""
+        body = b'{"x": "' + b"a" * 1024 + b'"}\n' + ndjson_body([valid_prediction_data])
+        with patch('src.model.model.STREAM_MAX_LINE_BYTES', 512):
+            results = read_lines(client.post("/model/predict/stream", content=body, headers=NDJSON))
+        assert "excede" in results[0]["error"]
+        assert results[1]["error"] is None
+
+    def test_saturated_executor_marks_chunk(self, valid_prediction_data):
+        """Testa se a fila cheia vira erro nas linhas do bloco."""
+        with patch('src.model.model.inference_executor.run', side_effect=ExecutorSaturatedError("cheia")):
+            response = client.post("/model/predict/stream", content=ndjson_body([valid_prediction_data] * 2), headers=NDJSON)
+        assert response.status_code == 200
+        results = read_lines(response)
+        assert [r["index"] for r in results] == [0, 1]
+        assert all("sobrecarregado" in r["error"] for r in results)
+
+    def test_empty_upload(self):
+        """Testa upload vazio."""
+        response = client.post("/model/predict/stream", content=b"", headers=NDJSON)
+        assert response.status_code == 200
+        assert response.text == ""
+
+    def test_unsupported_content_type(self, valid_prediction_data):
+        """Testa se formatos não suportados são rejeitados."""
+        response = client.post("/model/predict/stream", json=[valid_prediction_data])
+        assert response.status_code == 415
+
+    def test_csv_missing_columns(self, valid_prediction_data):
+        """Testa CSV sem alguma coluna obrigatória."""
+        partial = dict(valid_prediction_data)
+        del partial["cgpa"]
+        response = client.post("/model/predict/stream", content=csv_body([partial]), headers=CSV)
+        assert response.status_code == 400
+        assert "cgpa" in response.json()["detail"]
+
+    def test_stream_model_not_loaded(self, valid_prediction_data):
+        """Testa erro quando o modelo não foi carregado."""
+        with patch('src.model.model.model', None), patch('src.model.model.compiled_model', None):
+            response = client.post("/model/predict/stream", content=ndjson_body([valid_prediction_data]), headers=NDJSON)
+        assert response.status_code == 500
+
+
+class TestLineReader:
+    """Testes para a leitura do corpo linha a linha."""
+
+    def test_lines_split_across_chunks(self):
+        """Testa linhas quebradas entre pedaços do corpo e sem quebra final."""
+        assert split_lines(b"ab", b"c\nde", b"f\r\n", b"g") == [b"abc", b"def", b"g"]
+
+    def test_long_line_is_discarded(self):
+        """Testa se linhas longas viram LineTooLong sem ficar em memória."""
+        lines = split_lines(b"ok\n", b"x" * 10, b"x" * 10 + b"\nfim", max_line_bytes=8)
+        assert lines[0] == b"ok"
+        assert isinstance(lines[1], LineTooLong)
+        assert lines[1].size == 20
+        assert lines[2] == b"fim"
+
+    def test_upload_format(self):
+        """Testa a detecção do formato pelo Content-Type."""
+        assert upload_format("application/x-ndjson") == "ndjson"
+        assert upload_format("text/csv; charset=utf-8") == "csv"
+        assert upload_format("application/json") is None
+        assert upload_format(None) is None
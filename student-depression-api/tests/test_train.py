@@ -0,0 +1,193 @@
+"""
+Testes para o treinamento reprodutível (src/model/train.py), com um dataset
+sintético no formato do CSV do Kaggle.
+"""
+import json
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model import model as model_module
+from src.model import scoring
+from src.model.model import build_model_input
+from src.model.compiled_model import REQUEST_FIELDS
+from src.model.model_export import load_compiled_model, read_export_metadata
+from src.model.model_metadata import metadata_path
+from src.model.prediction_request import PredictionRequest
+from src.model.train import prepare_dataset, train
+
+
+client = TestClient(app)
+
+
+def kaggle_dataset(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Dataset no formato original (inglês, colunas extras, '?' em Financial Stress)."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'id': np.arange(rows),
+        'Gender': rng.choice(['Male', 'Female'], rows),
+        'Age': rng.integers(18, 35, rows).astype(float),
+        'City': rng.choice(['Kalyan', 'Srinagar'], rows),
+        'Profession': 'Student',
+        'Academic Pressure': rng.integers(0, 6, rows).astype(float),
+        'Work Pressure': 0.0,
+        'CGPA': rng.uniform(5, 10, rows).round(2),
+        'Study Satisfaction': rng.integers(0, 6, rows).astype(float),
+        'Job Satisfaction': 0.0,
+        'Sleep Duration': rng.choice(["'5-6 hours'", "'Less than 5 hours'", "'7-8 hours'", "'More than 8 hours'"], rows),
+        'Dietary Habits': rng.choice(['Healthy', 'Moderate', 'Unhealthy'], rows),
+        'Degree': 'BSc',
+        'Have you ever had suicidal thoughts ?': rng.choice(['Yes', 'No'], rows),
+        'Work/Study Hours': rng.integers(0, 13, rows).astype(float),
+        'Financial Stress': rng.choice(['1.0', '2.0', '3.0', '4.0', '5.0'], rows),
+        'Family History of Mental Illness': rng.choice(['Yes', 'No'], rows),
+    })
+    risk = (
+        df['Academic Pressure'] - 2.5
+        + 2.5 * (df['Have you ever had suicidal thoughts ?'] == 'Yes')
+        + 0.6 * (df['Financial Stress'].astype(float) - 3)
+        + rng.normal(0, 1, rows) - 1
+    )
+    df['Depression'] = (risk > 0).astype(int)
+    return df
+
+
+@pytest.fixture(scope="module")
+def trained(tmp_path_factory):
+    """Treina uma vez com uma grade pequena e devolve (diretório, metadados)."""
+    directory = tmp_path_factory.mktemp("train")
+    kaggle_dataset(400).to_csv(directory / "dataset.csv", index=False)
+    metadata = train(
+        directory / "dataset.csv", directory / "svm.joblib", directory / "svm",
+        c_grid=[0.3, 1.0, 3.0], gamma_grid=['scale', 0.1], jobs=1, folds=3,
+        approximate_components=60, max_accuracy_loss=1.0,
+    )
+    return directory, metadata
+
+
+class TestPrepareDataset:
+    """Testes para o tratamento de dados do notebook."""
+
+    def test_translates_and_drops(self, svm_pipeline):
+        """Testa tradução para o português, colunas removidas e linhas inválidas."""
+        df = kaggle_dataset(20)
+        df.loc[0, 'Financial Stress'] = '?'
+        df.loc[1, 'Gender'] = 'Other'
+        X, y = prepare_dataset(df)
+
+        assert len(X) == 18
+        assert list(X.columns) == list(svm_pipeline.feature_names_in_)
+        assert set(X['Gender']) <= {'Masculino', 'Feminino'}
+        assert set(X['Sleep Duration']) <= {'5-6 horas', 'Menos de 5 horas', '7-8 horas', 'Mais de 8 horas'}
+        assert set(X['Have you ever had suicidal thoughts ?']) <= {'Sim', 'Não'}
+        assert X['Financial Stress'].dtype == float
+        assert 'City' not in X.columns and 'id' not in X.columns
+        assert set(y) <= {0, 1}
+
+
+class TestTrain:
+    """Testes para o treinamento completo."""
+
+    def test_writes_artifacts(self, trained):
+        """Testa o .joblib, o artefato de serving e os metadados."""
+        directory, metadata = trained
+        assert (directory / "svm.joblib").exists()
+        assert metadata_path(directory / "svm.joblib") == directory / "svm.metadata.json"
+
+        saved = json.loads((directory / "svm.metadata.json").read_text(encoding="utf-8"))
+        assert saved == json.loads(json.dumps(metadata))
+        assert saved['search']['method'] == 'HalvingGridSearchCV'
+        assert saved['search']['candidates'] >= 6
+        assert saved['search']['best_params']['C'] in [0.3, 1.0, 3.0]
+        assert set(saved['metrics']) >= {'accuracy', 'recall', 'roc_auc', 'brier'}
+        assert saved['metrics']['accuracy'] > 0.7
+        assert saved['timings']['total_seconds'] >= saved['timings']['search_seconds'] > 0
+        assert read_export_metadata(directory / "svm")["source_fingerprint"] == saved['model_fingerprint']
+        assert saved['feature_importance']['model_fingerprint'] == saved['model_fingerprint']
+        assert len(saved['feature_importance']['importances']) == 11
+
+    def test_model_is_servable(self, trained, valid_prediction_data, high_risk_prediction_data):
+        """Testa se o modelo calibrado serve pelos mesmos caminhos da API."""
+        directory, metadata = trained
+        pipeline = joblib.numpy_pickle.load(directory / "svm.joblib")
+        classifier = pipeline.named_steps['classifier']
+        assert classifier.probability
+        assert classifier.C == metadata['model']['C']
+        assert pipeline.memory is None
+        assert scoring.supports_single_pass(pipeline)
+
+        requests = [PredictionRequest(**valid_prediction_data), PredictionRequest(**high_risk_prediction_data)]
+        expected = pipeline.predict_proba(build_model_input(requests))
+        compiled = load_compiled_model(directory / "svm")
+        _, probabilities = compiled.predict_with_proba(requests)
+        np.testing.assert_allclose(probabilities, expected, atol=1e-9)
+
+
+class TestApproximateModel:
+    """Testes para o modelo aproximado (Nyström + LinearSVC calibrado)."""
+
+    def test_writes_artifacts(self, trained):
+        """Testa o relatório contra o SVC exato e os arquivos do modelo aproximado."""
+        directory, metadata = trained
+        approximation = metadata['approximation']
+        assert approximation['accepted']
+        assert approximation['components'] == 60
+        assert approximation['exact_support_vectors'] == sum(metadata['model']['n_support'])
+        for metric in ('accuracy', 'recall'):
+            assert approximation['loss'][metric] == pytest.approx(metadata['metrics'][metric] - approximation['metrics'][metric])
+
+        assert approximation['model_path'] == str(directory / "svm-nystroem.joblib")
+        saved = json.loads((directory / "svm-nystroem.metadata.json").read_text(encoding="utf-8"))
+        assert saved['model_fingerprint'] == approximation['model_fingerprint']
+        assert saved['exact_model_fingerprint'] == metadata['model_fingerprint']
+        assert saved['feature_importance']['model_fingerprint'] == approximation['model_fingerprint']
+        assert read_export_metadata(directory / "svm-nystroem")["calibration"] == "sigmoid"
+
+    def test_compiled_parity(self, trained, svm_pipeline, training_sample):
+        """Testa o CompiledModel do modelo aproximado contra o pipeline."""
+        directory, _ = trained
+        pipeline = joblib.numpy_pickle.load(directory / "svm-nystroem.joblib")
+        assert scoring.is_approximate(pipeline) and not scoring.supports_single_pass(pipeline)
+
+        requests = [PredictionRequest(**row) for row in training_sample.rename(columns=REQUEST_FIELDS).to_dict(orient='records')[:300]]
+        model_input = build_model_input(requests)
+        compiled = load_compiled_model(directory / "svm-nystroem")
+        assert compiled.n_kernel_rows == 60
+        labels, probabilities = compiled.predict_with_proba(requests)
+        np.testing.assert_allclose(probabilities, pipeline.predict_proba(model_input), atol=1e-9)
+        np.testing.assert_array_equal(labels, pipeline.predict(model_input))
+
+    def test_refused_above_max_loss(self, tmp_path):
+        """Testa a recusa de exportar quando a perda passa do limite."""
+        kaggle_dataset(300, seed=1).to_csv(tmp_path / "dataset.csv", index=False)
+        metadata = train(
+            tmp_path / "dataset.csv", tmp_path / "svm.joblib", tmp_path / "svm",
+            c_grid=[1.0], gamma_grid=['scale'], jobs=1, folds=3, importance_repeats=0,
+            approximate_components=20, max_accuracy_loss=-1.0,
+        )
+        assert not metadata['approximation']['accepted']
+        assert metadata['approximation']['model_path'] is None
+        assert not (tmp_path / "svm-nystroem.joblib").exists()
+        assert not (tmp_path / "svm-nystroem").exists()
+        assert (tmp_path / "svm.joblib").exists()
+
+    def test_serving(self, trained, restore_serving_model, valid_prediction_data, high_risk_prediction_data):
+        """Testa se a API serve o modelo aproximado pelos mesmos caminhos do SVC."""
+        directory, _ = trained
+        pipeline = joblib.numpy_pickle.load(directory / "svm-nystroem.joblib")
+        model_module.install_model(pipeline)
+        assert model_module.startup_state["approximate_model"]
+        assert model_module.startup_state["kernel_rows"] == 60
+
+        expected = pipeline.predict_proba(build_model_input([PredictionRequest(**valid_prediction_data)]))[0]
+        for mode in ("compiled", "pipeline"):
+            with patch('src.model.scoring.SCORING_MODE', mode), patch('src.model.prediction_cache.PREDICTION_CACHE_ENABLED', False):
+                response = client.post("/model/predict", json=valid_prediction_data)
+            assert response.status_code == 200
+            np.testing.assert_allclose(response.json()["probability"], expected, atol=1e-9)
+
+        response = client.post("/model/what-if", json={"answers": high_risk_prediction_data, "features": ["sleep_duration"]})
+        assert response.status_code == 200
@@ -1,6 +1,7 @@
 """
 Testes de validação para dados de entrada.
 """
+import json
 import pytest
 from pydantic import ValidationError
 from src.model.prediction_request import PredictionRequest
@@ -247,3 +248,110 @@ class TestFieldTypeValidation:
         assert isinstance(request.dietary_habits, str)
         assert isinstance(request.suicidal_thoughts, str)
         assert isinstance(request.family_history, str)
+
+
+class TestFeatureFeedbackValidation:
+    """Testes de validação para o FeatureFeedback tipado."""
+
+    FEEDBACK_ITEM = {
+        "feature": "Idade",
+        "user_value": "22 anos",
+        "importance": 5.9,
+        "impact_level": "MODERADO",
+        "message": "Mensagem",
+        "context": "Contexto"
+    }
+
+    def test_valid_feedback_item(self):
+        """Testa criação de um item de feedback válido."""
+        from src.model.prediction_response import FeatureFeedback
+
+        item = FeatureFeedback(**self.FEEDBACK_ITEM)
+        assert item.model_dump() == self.FEEDBACK_ITEM
+
+    def test_extra_field_rejected(self):
+        """Testa que campos desconhecidos são rejeitados."""
+        from src.model.prediction_response import FeatureFeedback
+
+        with pytest.raises(ValidationError):
+            FeatureFeedback(**self.FEEDBACK_ITEM, extra="x")
+
+    def test_strict_types(self):
+        """Testa que o modelo não converte tipos (strict)."""
+        from src.model.prediction_response import FeatureFeedback
+
+        with pytest.raises(ValidationError):
+            FeatureFeedback(**{**self.FEEDBACK_ITEM, "user_value": 22})
+
+    def test_unknown_impact_level_rejected(self):
+        """Testa que apenas os níveis de impacto conhecidos são aceitos."""
+        from src.model.prediction_response import FeatureFeedback
+
+        with pytest.raises(ValidationError):
+            FeatureFeedback(**{**self.FEEDBACK_ITEM, "impact_level": "ENORME"})
+
+    def test_generated_feedback_is_valid(self, high_risk_prediction_data):
+        """Testa que todo feedback gerado passa pelo modelo tipado sem alterações."""
+        from src.model.feedback import generate_feature_feedback
+        from src.model.prediction_response import FeatureFeedback
+
+        for item in generate_feature_feedback(high_risk_prediction_data):
+            assert FeatureFeedback(**item).model_dump() == item
+
+
+class TestRawBodyValidation:
+    """Testes da validação do corpo de /model/predict direto dos bytes."""
+
+    def test_invalid_json_returns_422(self):
+        """Testa que JSON malformado retorna 422."""
+        from fastapi.testclient import TestClient
+        from main import app
+
+        response = TestClient(app).post("/model/predict", content=b"{invalido", headers={"Content-Type": "application/json"})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"][0] == "body"
+
+    def test_missing_field_returns_422_with_location(self, valid_prediction_data):
+        """Testa que campo faltante retorna 422 indicando o campo."""
+        from fastapi.testclient import TestClient
+        from main import app
+
+        data = dict(valid_prediction_data)
+        del data["cgpa"]
+        response = TestClient(app).post("/model/predict", json=data)
+        assert response.status_code == 422
+        assert ["body", "cgpa"] in [error["loc"] for error in response.json()["detail"]]
+
+    @pytest.mark.parametrize("value", ["NaN", "Infinity", "-Infinity"])
+    def test_non_finite_cgpa_returns_422(self, valid_prediction_data, value):
+        """Testa que NaN/infinito é rejeitado, e não pontuado como 'Não depressivo'."""
+        from fastapi.testclient import TestClient
+        from main import app
+
+        body = json.dumps({**valid_prediction_data, "cgpa": 0.0}).replace("0.0", value)
+        response = TestClient(app).post("/model/predict", content=body, headers={"Content-Type": "application/json"})
+        assert response.status_code == 422
+        assert ["body", "cgpa"] in [error["loc"] for error in response.json()["detail"]]
+
+    def test_response_encoded_with_orjson(self, valid_prediction_data):
+        """Testa que a resposta de /model/predict é codificada com orjson."""
+        from unittest.mock import patch
+        from fastapi.testclient import TestClient
+        from main import app
+        from src.model import model as model_module
+
+        with patch.object(model_module.orjson, 'dumps', wraps=model_module.orjson.dumps) as dumps:
+            response = TestClient(app).post("/model/predict", json=valid_prediction_data)
+        assert dumps.called
+        assert response.content == model_module.orjson.dumps(dumps.call_args_list[0].args[0])
+
+    def test_response_shape_unchanged(self, valid_prediction_data):
+        """Testa que o JSON da resposta mantém o mesmo formato."""
+        from fastapi.testclient import TestClient
+        from main import app
+
+        data = TestClient(app).post("/model/predict", json=valid_prediction_data).json()
+        assert list(data) == ["prediction", "probability", "depression_risk", "feature_feedback"]
+        assert len(data["feature_feedback"]) == 11
+        for item in data["feature_feedback"]:
+            assert list(item) == ["feature", "user_value", "importance", "impact_level", "message", "context"]
@@ -0,0 +1,131 @@
+"""
+Testes para os cenários "e se" (src/model/what_if.py e POST /model/what-if).
+"""
+import itertools
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.model.compiled_model import CompiledModel
+from src.model.model import build_model_input
+from src.model.prediction_request import PredictionRequest
+from src.model.questions import questions_store
+from src.model.what_if import MODIFIABLE_FEATURES, best_changes, candidate_values, score_grid
+
+
+client = TestClient(app)
+
+
+class TestGrid:
+    """Testes para a avaliação da grade de candidatos."""
+
+    def test_candidate_values_from_questions(self, svm_pipeline, high_risk_prediction_data):
+        """Testa as opções tiradas de questions.json."""
+        request = PredictionRequest(**{**high_risk_prediction_data, "work_study_hours": 0})
+        compiled = CompiledModel.from_pipeline(svm_pipeline)
+        values = candidate_values(questions_store.current().questions, compiled, request, MODIFIABLE_FEATURES)
+
+        assert values["academic_pressure"] == [1, 2, 3, 4, 5]
+        assert values["sleep_duration"] == ["Menos de 5 horas", "5-6 horas", "7-8 horas", "Mais de 8 horas"]
+        # Resposta atual fora do intervalo do questionário entra na grade
+        assert values["work_study_hours"] == [0, *range(1, 24)]
+        # "Não muito saudáveis" não existe no treinamento; a resposta atual sempre entra
+        assert values["dietary_habits"] == ["Muito pouco saudáveis", "Muito saudáveis", "Moderadamente saudáveis", "Pouco saudáveis"]
+
+    @pytest.mark.parametrize("fields", [
+        ("sleep_duration",),
+        ("academic_pressure", "financial_stress"),
+        ("sleep_duration", "work_study_hours", "dietary_habits"),
+    ])
+    def test_grid_matches_row_scoring(self, svm_pipeline, high_risk_prediction_data, fields):
+        """Testa a grade fatorada contra uma linha por candidato."""
+        request = PredictionRequest(**high_risk_prediction_data)
+        compiled = CompiledModel.from_pipeline(svm_pipeline)
+        values = candidate_values(questions_store.current().questions, compiled, request, fields)
+
+        predictions, probabilities = score_grid(compiled, request, values)
+        rows = [request.model_copy(update=dict(zip(fields, combination))) for combination in itertools.product(*values.values())]
+        expected = svm_pipeline.predict_proba(build_model_input(rows))[:, 1]
+
+        assert probabilities.shape == tuple(len(options) for options in values.values())
+        np.testing.assert_allclose(probabilities.ravel(), expected, atol=1e-9)
+        np.testing.assert_array_equal(predictions.ravel(), svm_pipeline.predict(build_model_input(rows)))
+
+    def test_chunked_grid(self, svm_pipeline, high_risk_prediction_data):
+        """Testa se a avaliação em blocos dá o mesmo resultado."""
+        request = PredictionRequest(**high_risk_prediction_data)
+        compiled = CompiledModel.from_pipeline(svm_pipeline)
+        values = candidate_values(questions_store.current().questions, compiled, request, MODIFIABLE_FEATURES)
+
+        _, whole = score_grid(compiled, request, values)
+        with patch('src.model.what_if.WHAT_IF_CHUNK_ROWS', 7):
+            _, chunked = score_grid(compiled, request, values)
+        np.testing.assert_allclose(chunked, whole, atol=1e-12)
+
+
+class TestBestChanges:
+    """Testes para a escolha das melhores combinações."""
+
+    def test_minimal_changes(self):
+        """Testa o limite de mudanças e a exclusão de mudanças que não ajudam."""
+        probabilities = np.array([
+            [0.9, 0.5, 0.8],
+            [0.7, 0.3, 0.95],
+        ])
+        # Atual: (0, 0) = 0.9
+        assert best_changes(probabilities, (0, 0), max_changes=1, top_k=5) == [(0, 1), (1, 0), (0, 2)]
+        # (1, 2) não entra: a mudança da segunda feature piora o resultado
+        assert best_changes(probabilities, (0, 0), max_changes=2, top_k=5) == [(1, 1), (0, 1), (1, 0), (0, 2)]
+        assert best_changes(probabilities, (0, 0), max_changes=2, top_k=2) == [(1, 1), (0, 1)]
+
+    def test_nothing_lowers(self):
+        """Testa a resposta sem cenários quando nada reduz a probabilidade."""
+        probabilities = np.array([[0.1, 0.2], [0.3, 0.4]])
+        assert best_changes(probabilities, (0, 0), max_changes=2, top_k=5) == []
+
+
+class TestWhatIfRoute:
+    """Testes para o endpoint /model/what-if."""
+
+    def test_scenarios(self, svm_pipeline, high_risk_prediction_data):
+        """Testa se os cenários reduzem a probabilidade e batem com o pipeline."""
+        response = client.post("/model/what-if", json={"answers": high_risk_prediction_data, "max_changes": 2, "top_k": 3})
+        assert response.status_code == 200
+        data = response.json()
+
+        request = PredictionRequest(**high_risk_prediction_data)
+        assert data["probability"] == pytest.approx(svm_pipeline.predict_proba(build_model_input([request]))[0, 1])
+        assert data["candidates_evaluated"] == 4 * 5 * 23 * 4 * 5
+        assert 0 < len(data["scenarios"]) <= 3
+        for scenario in data["scenarios"]:
+            assert 1 <= len(scenario["changes"]) <= 2
+            assert scenario["reduction"] > 0
+            changed = request.model_copy(update={change["field"]: change["suggested"] for change in scenario["changes"]})
+            assert scenario["probability"] == pytest.approx(svm_pipeline.predict_proba(build_model_input([changed]))[0, 1])
+            assert all(change["current"] == getattr(request, change["field"]) for change in scenario["changes"])
+
+    def test_restricted_features(self, high_risk_prediction_data):
+        """Testa a restrição às features escolhidas."""
+        response = client.post("/model/what-if", json={"answers": high_risk_prediction_data, "features": ["sleep_duration"]})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["candidates_evaluated"] == 4
+        assert all(change["field"] == "sleep_duration" for scenario in data["scenarios"] for change in scenario["changes"])
+
+    def test_non_modifiable_feature(self, high_risk_prediction_data):
+        """Testa a recusa de features que não podem mudar."""
+        response = client.post("/model/what-if", json={"answers": high_risk_prediction_data, "features": ["suicidal_thoughts"]})
+        assert response.status_code == 422
+
+    def test_invalid_answers(self, high_risk_prediction_data):
+        """Testa respostas inválidas."""
+        response = client.post("/model/what-if", json={"answers": {**high_risk_prediction_data, "age": "vinte"}})
+        assert response.status_code == 422
+
+    def test_model_without_compiled_version(self, high_risk_prediction_data):
+        """Testa erro quando o modelo carregado não é o pipeline SVC esperado."""
+        with patch('src.model.model.compiled_model', None):
+            response = client.post("/model/what-if", json={"answers": high_risk_prediction_data})
+        assert response.status_code == 400
+        assert "cenários" in response.json()["detail"]